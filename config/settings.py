@@ -28,14 +28,93 @@ class Settings:
     # Banco SQLite
     SQLITE_PATH = DATA_DIR / "analytics.db"
 
+    # Pool de conexões SQLite (1 escritor + N leitores, modo WAL)
+    SQLITE_READERS = 4
+    SQLITE_MMAP_MB = 256
+    SQLITE_CACHE_MB = 64
+    SQLITE_BUSY_TIMEOUT_MS = 5000
+
+    # Linhas por executemany na carga rápida (df_to_sql com bulk=True)
+    SQLITE_BULK_BATCH_SIZE = 50_000
+
+    # Linhas por chunk na leitura em streaming (iter_sql_chunks)
+    SQLITE_FETCH_CHUNK_SIZE = 50_000
+
+    # Memória máxima do cache de resultados de queries
+    QUERY_CACHE_MB = 128
+
+    # Execução concorrente de queries no dashboard (threads e prazo por query)
+    QUERY_EXECUTOR_WORKERS = SQLITE_READERS
+    QUERY_TIMEOUT_SECONDS = 30
+
+    # Linhas carregadas no dashboard ao analisar uma tabela do SQLite
+    # (agregações e contagens rodam no banco, sobre a tabela inteira)
+    DB_ANALYSIS_SAMPLE_ROWS = 10_000
+
+    # Usos mínimos de uma coluna em filtros/ordenações para sugerir índice
+    INDEX_ADVISOR_MIN_USES = 3
+
+    # Backups online (API de backup do SQLite, páginas por passo e pausa entre passos)
+    BACKUP_DIR = DATA_DIR / "backups"
+    BACKUP_PAGES_PER_STEP = 1024
+    BACKUP_SLEEP_SECONDS = 0.01
+    BACKUP_RETENTION_DAYS = 30
+    # Tentativas de aplicar o WAL ao arquivo antes do backup incremental
+    BACKUP_SNAPSHOT_ATTEMPTS = 10
+
+    # Leitura de arquivos grandes (linhas por chunk no modo streaming)
+    CSV_CHUNK_SIZE = 100_000
+
+    # Cache colunar de ingestão (cópias Parquet dos arquivos lidos)
+    INGEST_CACHE_DIR = PROCESSED_DATA_DIR / "cache"
+    INGEST_CACHE_MAX_MB = 2048
+
+    # Processos usados na extração paralela de vários arquivos
+    EXTRACT_WORKERS = os.cpu_count() or 1
+    # Tempo máximo de leitura de cada arquivo na extração paralela (segundos)
+    EXTRACT_FILE_TIMEOUT_SECONDS = 300
+
+    # Threads usadas por DataTransformer.convert_dtypes (uma coluna por thread)
+    TRANSFORM_WORKERS = os.cpu_count() or 1
+
+    # Resumos usados por DataTransformer.transform_stream (mediana e moda globais)
+    STREAM_QUANTILE_K = 200
+    STREAM_MODE_CAPACITY = 10_000
+
+    # Detecção de duplicatas: memória dos hashes de linha em cache e do
+    # índice de hashes em streaming (acima disso o índice vai para disco)
+    DUPLICATE_CACHE_MB = 64
+    DUPLICATE_INDEX_MEMORY_MB = 256
+
+    # Perfil em streaming (ExploratoryAnalyzer.analyze_chunks): threads que
+    # resumem chunks em paralelo e valores frequentes guardados por coluna
+    PROFILE_WORKERS = os.cpu_count() or 1
+    PROFILE_TOP_CAPACITY = 1000
+
+    # Processos de ExploratoryAnalyzer.analyze_dataframe (1: sem pool; -1: todos os núcleos)
+    ANALYSIS_JOBS = 1
+
+    # Perfis mergeáveis salvos para re-análise incremental (só as linhas novas)
+    PROFILE_DIR = REPORTS_DIR / "profiles"
+
+    # Cache de resultados de analyze_dataframe com use_cache=True (chave:
+    # impressão digital do conteúdo): entradas em memória e tamanho máximo em disco
+    ANALYSIS_CACHE_DIR = REPORTS_DIR / "analysis_cache"
+    ANALYSIS_CACHE_ENTRIES = 32
+    ANALYSIS_CACHE_MAX_MB = 256
+    # Linhas amostradas na assinatura do prefixo já perfilado (analyze_dataframe incremental)
+    ANALYSIS_FINGERPRINT_SAMPLE = 1000
+
     @classmethod
     def create_directories(cls):
         """Cria todos os diretórios necessários se não existirem"""
         directories = [
             cls.RAW_DATA_DIR,
             cls.PROCESSED_DATA_DIR,
+            cls.INGEST_CACHE_DIR,
             cls.EXTERNAL_DATA_DIR,
             cls.REPORTS_DIR,
+            cls.PROFILE_DIR,
             cls.FIGURES_DIR,
             cls.MODELS_DIR,
         ]
@@ -13,12 +13,18 @@ from plotly.subplots import make_subplots
 from pathlib import Path
 import sys
 import os
+import time
 from datetime import datetime
 
 # Adiciona o diretório raiz ao path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.data.sqlite_manager import SQLiteManager
+from src.data.csv_sniffer import read_csv_auto
+from src.data.dtype_optimizer import optimize_dtypes
+from src.data.query_executor import QueryExecutor
+from src.data.duplicates import get_detector
+from src.analysis.exploratory import ExploratoryAnalyzer
 from config.settings import Settings
 
 # Tentar importar scipy (opcional)
@@ -138,6 +144,8 @@ if 'data_name' not in st.session_state:
     st.session_state.data_name = None
 if 'data_source' not in st.session_state:
     st.session_state.data_source = None
+if 'data_table' not in st.session_state:
+    st.session_state.data_table = None
 if 'analysis_history' not in st.session_state:
     st.session_state.analysis_history = []
 
@@ -150,6 +158,61 @@ def init_db():
 
 db = init_db()
 
+
+# Executor de queries compartilhado (leituras concorrentes com prazo)
+@st.cache_resource
+def init_executor():
+    return QueryExecutor()
+
+
+executor = init_executor()
+
+
+# Relatórios de análise reaproveitados entre execuções pelo conteúdo do DataFrame
+@st.cache_resource
+def init_analyzer():
+    return ExploratoryAnalyzer()
+
+
+analyzer = init_analyzer()
+
+# Queries de uma execução anterior desta sessão (ex.: usuário mudou de página) são canceladas
+if st.session_state.get('query_batch') is not None:
+    st.session_state.query_batch.cancel()
+    st.session_state.query_batch = None
+
+
+def wait_batch(batch, step=0.1):
+    """
+    Espera um lote de queries em passos curtos
+
+    O Streamlit só interrompe o script num rerun quando ele atualiza a
+    tela; por isso cada passo atualiza um aviso de progresso. Se o usuário
+    mudar algo no meio da espera, o script para ali e o lote, guardado em
+    st.session_state.query_batch, é cancelado no início da próxima execução.
+    """
+    st.session_state.query_batch = batch
+    status = st.empty()
+    start = time.monotonic()
+    deadline = start + batch.timeout if batch.timeout else None
+    while not batch.done() and (deadline is None or time.monotonic() < deadline):
+        status.caption(f"⏳ Carregando... {time.monotonic() - start:.1f}s")
+        time.sleep(step)
+    status.empty()
+
+    remaining = deadline - time.monotonic() if deadline else None
+    results = batch.results(timeout=max(remaining, 0.001) if deadline else None)
+    st.session_state.query_batch = None
+    return results
+
+
+def sqlite_table():
+    """Tabela de origem quando os dados vêm do SQLite (agregações rodam no banco)"""
+    if st.session_state.data_source == "sqlite":
+        return st.session_state.data_table
+    return None
+
+
 # Sidebar
 with st.sidebar:
     # Logo em texto (sem imagens externas)
@@ -386,36 +449,31 @@ elif page == "📤 Upload de Dados":
             "Encoding (se CSV)",
             ["auto", "utf-8", "latin-1", "cp1252", "iso-8859-1"]
         )
-        sep_option = st.text_input("Separador (se CSV)", ",")
+        sep_option = st.text_input("Separador (se CSV)", "auto",
+                                   help="Use 'auto' para detectar o separador automaticamente")
         sheet_option = st.text_input("Planilha (se Excel)", "0")
+        optimize_option = st.checkbox(
+            "Otimizar tipos de dados (reduz memória)", value=True,
+            help="Reduz inteiros/floats, converte textos repetidos em category e datas em datetime"
+        )
 
     # Se arquivo foi enviado
     if uploaded_file is not None:
         try:
             with st.spinner(f"🔄 Carregando {uploaded_file.name}..."):
 
-                # Detectar encoding se necessário
+                used_encoding = None
+
+                # Detectar encoding/separador por amostra e ler o arquivo uma única vez
                 if uploaded_file.name.endswith('.csv'):
+                    try:
+                        df, csv_format = read_csv_auto(uploaded_file, encoding=encoding_option, sep=sep_option)
+                    except UnicodeDecodeError:
+                        st.error(f"❌ Não foi possível ler o arquivo com o encoding {encoding_option}")
+                        st.stop()
+
                     if encoding_option == "auto":
-                        # Tentar diferentes encodings
-                        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-                        df = None
-                        used_encoding = None
-
-                        for enc in encodings:
-                            try:
-                                uploaded_file.seek(0)
-                                df = pd.read_csv(uploaded_file, encoding=enc, sep=sep_option)
-                                used_encoding = enc
-                                break
-                            except UnicodeDecodeError:
-                                continue
-
-                        if df is None:
-                            st.error("❌ Não foi possível ler o arquivo com nenhum encoding")
-                            st.stop()
-                    else:
-                        df = pd.read_csv(uploaded_file, encoding=encoding_option, sep=sep_option)
+                        used_encoding = csv_format['encoding']
                 else:
                     # Excel
                     if sheet_option.isdigit():
@@ -423,16 +481,25 @@ elif page == "📤 Upload de Dados":
                     else:
                         df = pd.read_excel(uploaded_file, sheet_name=sheet_option)
 
+                # Reduzir tipos logo após o parse
+                memory_report = None
+                if optimize_option:
+                    df, memory_report = optimize_dtypes(df)
+
                 # Salvar no session state
                 st.session_state.data = df
                 st.session_state.data_name = uploaded_file.name
                 st.session_state.data_source = "upload"
+                st.session_state.data_table = None
 
                 # Mostrar preview
                 st.markdown('<div class="success-box">', unsafe_allow_html=True)
                 st.success(f"✅ Arquivo '{uploaded_file.name}' carregado com sucesso!")
                 if used_encoding:
-                    st.info(f"📝 Encoding detectado: {used_encoding}")
+                    st.info(f"📝 Encoding detectado: {used_encoding} | Separador: {csv_format['sep']!r}")
+                if memory_report and memory_report['changes']:
+                    st.info(f"🗜️ Memória otimizada: {memory_report['before_mb']:.2f} MB → "
+                            f"{memory_report['after_mb']:.2f} MB (-{memory_report['reduction_pct']:.1f}%)")
                 st.markdown('</div>', unsafe_allow_html=True)
 
                 # Métricas em colunas
@@ -444,7 +511,7 @@ elif page == "📤 Upload de Dados":
                 with col3:
                     st.metric("Memória", f"{df.memory_usage(deep=True).sum() / 1024 ** 2:.2f} MB")
                 with col4:
-                    st.metric("Duplicatas", df.duplicated().sum())
+                    st.metric("Duplicatas", get_detector().count(df))
 
                 # Preview dos dados
                 st.subheader("🔍 Preview dos Dados (primeiras 100 linhas)")
@@ -601,12 +668,15 @@ elif page == "📈 Análise Exploratória":
         # Estatísticas descritivas
         if col_types['numeric']:
             st.subheader("📊 Estatísticas Descritivas - Variáveis Numéricas")
-            stats_df = df[col_types['numeric']].describe().T
-            # Adicionar skewness e kurtosis
-            for col in col_types['numeric']:
-                stats_df.loc[col, 'skew'] = df[col].skew()
-                stats_df.loc[col, 'kurtosis'] = df[col].kurtosis()
-            st.dataframe(stats_df, use_container_width=True)
+            # describe + skewness e kurtosis, do cache enquanto o conteúdo não mudar
+            analysis = analyzer.analyze_dataframe(df, st.session_state.data_name or "dataset", use_cache=True)
+            descriptive = analysis.get('descriptive_stats', {})
+            if 'message' in descriptive:
+                st.info(descriptive['message'])
+            else:
+                stats_df = pd.DataFrame(descriptive).T.rename(columns={'skewness': 'skew'})
+                stats_df = stats_df.loc[[col for col in col_types['numeric'] if col in stats_df.index]]
+                st.dataframe(stats_df, use_container_width=True)
 
         # Análise de valores únicos para categóricas
         if col_types['categorical']:
@@ -674,7 +744,7 @@ elif page == "📈 Análise Exploratória":
             insights.append("✅ **Sem valores faltantes**")
 
         # Duplicatas
-        duplicates = df.duplicated().sum()
+        duplicates = get_detector().count(df)
         if duplicates > 0:
             dup_pct = (duplicates / df.shape[0]) * 100
             insights.append(f"🔄 **Linhas duplicadas**: {duplicates} ({dup_pct:.1f}%)")
@@ -773,7 +843,15 @@ elif page == "📊 Visualizações Completas":
 
                 if chart_type == "Histograma":
                     bins = st.slider("Número de bins", 5, 100, 30)
-                    fig = px.histogram(df, x=col, nbins=bins, title=f"Histograma - {col}", marginal="box")
+                    if sqlite_table():
+                        # Contagem por intervalo calculada no SQLite, sobre a tabela inteira
+                        hist = db.histogram(sqlite_table(), col, bins=bins)
+                        hist['centro'] = (hist['bin_start'] + hist['bin_end']) / 2
+                        fig = px.bar(hist, x='centro', y='count', title=f"Histograma - {col}",
+                                     labels={'centro': col, 'count': 'Contagem'})
+                        fig.update_layout(bargap=0)
+                    else:
+                        fig = px.histogram(df, x=col, nbins=bins, title=f"Histograma - {col}", marginal="box")
                     st.plotly_chart(fig, use_container_width=True)
 
                 elif chart_type == "Boxplot":
@@ -843,9 +921,13 @@ elif page == "📊 Visualizações Completas":
                 )
 
                 if chart_type == "Barras":
-                    # Agregar
-                    agg_df = df.groupby(cat_col)[num_col].mean().reset_index().sort_values(num_col,
-                                                                                           ascending=False).head(20)
+                    # Agregar (no SQLite quando os dados vêm do banco)
+                    if sqlite_table():
+                        agg_df = db.aggregate(sqlite_table(), group_by=cat_col, metrics={num_col: 'mean'},
+                                              order_by=num_col, descending=True, limit=20)
+                    else:
+                        agg_df = df.groupby(cat_col)[num_col].mean().reset_index().sort_values(num_col,
+                                                                                               ascending=False).head(20)
                     fig = px.bar(agg_df, x=cat_col, y=num_col, title=f"Média de {num_col} por {cat_col}")
                     st.plotly_chart(fig, use_container_width=True)
 
@@ -911,10 +993,12 @@ elif page == "📊 Visualizações Completas":
             if col_types['categorical']:
                 cat_col = st.selectbox("Coluna categórica", col_types['categorical'])
 
-                # Contagens
-                value_counts = df[cat_col].value_counts().reset_index()
+                # Contagens (no SQLite quando os dados vêm do banco)
+                if sqlite_table():
+                    value_counts = db.value_counts(sqlite_table(), cat_col, limit=20)
+                else:
+                    value_counts = df[cat_col].value_counts().reset_index().head(20)
                 value_counts.columns = [cat_col, 'Contagem']
-                value_counts = value_counts.head(20)
 
                 chart_type = st.radio(
                     "Tipo de Gráfico",
@@ -1227,7 +1311,26 @@ elif page == "📉 Séries Temporais":
                         ["Dia", "Semana", "Mês", "Trimestre", "Ano"]
                     )
 
-                    if period == "Dia":
+                    # Tabela do SQLite: lê os rollups já agregados em vez de agrupar as linhas
+                    rollup_info = None
+                    if sqlite_table():
+                        rollup_info = db.get_rollup_info(sqlite_table())
+                        if rollup_info is None or rollup_info['date_column'] != date_col:
+                            with st.spinner("Criando agregações por período no banco (uma única vez)..."):
+                                db.create_rollups(sqlite_table(), date_col)
+                            rollup_info = db.get_rollup_info(sqlite_table())
+                        if rollup_info and value_col not in rollup_info['value_columns']:
+                            rollup_info = None
+
+                    if rollup_info:
+                        grain, label = {"Dia": ("day", date_col), "Semana": ("week", "Semana"),
+                                        "Mês": ("month", date_col), "Trimestre": ("quarter", date_col),
+                                        "Ano": ("year", "Ano")}[period]
+                        df_agg = db.get_rollup(sqlite_table(), grain, value_col, 'sum')
+                        if not df_agg.empty:
+                            df_agg.columns = [label, value_col]
+                        titulo = f"{value_col} por {period}"
+                    elif period == "Dia":
                         df_agg = df_time.groupby(df_time[date_col].dt.date)[value_col].sum().reset_index()
                         df_agg.columns = [date_col, value_col]
                         titulo = f"{value_col} por Dia"
@@ -1248,16 +1351,20 @@ elif page == "📉 Séries Temporais":
                         df_agg.columns = ['Ano', value_col]
                         titulo = f"{value_col} por Ano"
 
-                    fig = px.bar(
-                        df_agg,
-                        x=df_agg.columns[0],
-                        y=value_col,
-                        title=titulo,
-                        color=value_col,
-                        color_continuous_scale='Viridis'
-                    )
+                    if df_agg.empty:
+                        # Tabela vazia ou filtro sem linhas: não há períodos para mostrar
+                        st.info(f"📭 Nenhum período com dados para agregar {value_col}")
+                    else:
+                        fig = px.bar(
+                            df_agg,
+                            x=df_agg.columns[0],
+                            y=value_col,
+                            title=titulo,
+                            color=value_col,
+                            color_continuous_scale='Viridis'
+                        )
 
-                    st.plotly_chart(fig, use_container_width=True)
+                        st.plotly_chart(fig, use_container_width=True)
 
                 elif chart_type == "📊 Sazonalidade":
                     st.markdown("""
@@ -1515,9 +1622,10 @@ elif page == "📋 Relatórios Automáticos":
         st.subheader("📊 Resumo Executivo")
 
         # Métricas principais
+        total_rows = db.get_row_count(sqlite_table()) if sqlite_table() else df.shape[0]
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Registros", f"{df.shape[0]:,}")
+            st.metric("Total Registros", f"{total_rows:,}")
         with col2:
             st.metric("Total Colunas", df.shape[1])
         with col3:
@@ -1542,9 +1650,12 @@ elif page == "📋 Relatórios Automáticos":
         if col_types['categorical']:
             st.subheader("📝 Top Categorias")
             for col in col_types['categorical'][:3]:
-                top = df[col].value_counts().head(5)
+                if sqlite_table():
+                    top = db.value_counts(sqlite_table(), col, limit=5)
+                else:
+                    top = df[col].value_counts().head(5).reset_index()
                 st.write(f"**{col}:**")
-                st.dataframe(top.reset_index(), use_container_width=True)
+                st.dataframe(top, use_container_width=True)
 
         # Botão para gerar relatório
         if st.button("📥 Gerar Relatório Completo"):
@@ -1585,41 +1696,139 @@ elif page == "💾 Banco de Dados":
         selected_table = st.selectbox("Selecione uma tabela:", tables)
 
         if selected_table:
-            # Carregar dados da tabela
-            df = db.sql_to_df(f"SELECT * FROM {selected_table} LIMIT 1000")
+            table_columns = db.get_columns(selected_table)
 
-            # Mostrar informações
+            # Opções de navegação (projeção e ordenação executadas no SQLite)
+            with st.expander("⚙️ Colunas e ordenação", expanded=False):
+                visible_cols = st.multiselect("Colunas exibidas", table_columns,
+                                              default=table_columns[:min(10, len(table_columns))])
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    sort_option = st.selectbox("Ordenar por", ["Ordem de inserção"] + table_columns)
+                with col2:
+                    sort_desc = st.radio("Ordem", ["Crescente", "Decrescente"], horizontal=True,
+                                         key="db_sort_order") == "Decrescente"
+                with col3:
+                    page_size = st.selectbox("Linhas por página", [50, 100, 500, 1000], index=1)
+
+            visible_cols = visible_cols or table_columns
+            order_by = None if sort_option == "Ordem de inserção" else sort_option
+
+            # Pilha de cursores: só a página atual fica na sessão
+            page_key = (selected_table, tuple(visible_cols), order_by, sort_desc, page_size)
+            if st.session_state.get('db_page_key') != page_key:
+                st.session_state.db_page_key = page_key
+                st.session_state.db_page_cursors = [None]
+            cursors = st.session_state.db_page_cursors
+
+            # Página, estatísticas e índices em paralelo, cada um com prazo próprio
+            batch = executor.batch()
+            batch.submit('page', db.fetch_page, selected_table, columns=visible_cols, order_by=order_by,
+                         descending=sort_desc, after=cursors[-1], page_size=page_size)
+            batch.submit('stats', db.get_table_stats, selected_table)
+            batch.submit('indexes', db.list_indexes, selected_table)
+            batch.submit('suggestions', db.suggest_indexes, selected_table)
+            results = wait_batch(batch)
+
+            if results['page'] is None:
+                st.error(f"⏱️ A leitura da página não terminou em {Settings.QUERY_TIMEOUT_SECONDS}s")
+                df, next_cursor = pd.DataFrame(columns=visible_cols), None
+            else:
+                df, next_cursor = results['page']
+            table_stats = results['stats'] or {}
+
+            # Mostrar informações (contagem lida do catálogo, sem COUNT(*))
             col1, col2, col3 = st.columns(3)
             with col1:
-                result = db.execute_query(f"SELECT COUNT(*) FROM {selected_table}")
-                if isinstance(result, list) and len(result) > 0:
-                    if isinstance(result[0], (list, tuple)) and len(result[0]) > 0:
-                        count = result[0][0]
-                    else:
-                        count = 0
-                else:
-                    count = 0
+                count = table_stats.get('row_count') or 0
                 st.metric("Total Registros", f"{count:,}")
             with col2:
-                st.metric("Colunas", df.shape[1])
+                st.metric("Colunas", len(table_columns))
             with col3:
-                st.metric("Visualizando", f"{df.shape[0]:,} registros")
+                st.metric("Página", f"{len(cursors)} ({df.shape[0]:,} registros)")
 
             # Mostrar dados
             st.dataframe(df, use_container_width=True)
 
-            # Botões de ação
+            if table_stats.get('column_stats'):
+                with st.expander("📊 Estatísticas das colunas", expanded=False):
+                    st.caption(f"Atualizadas em {table_stats['last_modified']}")
+                    st.dataframe(pd.DataFrame([
+                        {'Coluna': col, 'Mínimo': str(stats['min']), 'Máximo': str(stats['max']),
+                         'Nulos': stats['nulls']}
+                        for col, stats in table_stats['column_stats'].items()
+                    ]), use_container_width=True)
+
+            # Navegação entre páginas
             col1, col2 = st.columns(2)
             with col1:
-                if st.button("📥 Download CSV"):
+                if st.button("⬅️ Página anterior", disabled=len(cursors) == 1):
+                    cursors.pop()
+                    st.rerun()
+            with col2:
+                if st.button("Próxima página ➡️", disabled=next_cursor is None):
+                    cursors.append(next_cursor)
+                    st.rerun()
+
+            # Índices: existentes e sugeridos pelo uso de filtros/ordenações
+            with st.expander("⚡ Índices", expanded=False):
+                indexes = results['indexes'] or []
+                if indexes:
+                    st.dataframe(pd.DataFrame([
+                        {'Índice': idx['name'], 'Colunas': ", ".join(c for c in idx['columns'] if c),
+                         'Único': idx['unique']}
+                        for idx in indexes
+                    ]), use_container_width=True)
+                    drop_name = st.selectbox("Remover índice", [idx['name'] for idx in indexes
+                                                                if idx['origin'] == 'c'] or ["-"])
+                    if st.button("🗑️ Remover índice", disabled=drop_name == "-"):
+                        if db.drop_index(drop_name):
+                            st.success(f"✅ Índice {drop_name} removido")
+                            st.rerun()
+                else:
+                    st.info("ℹ️ Tabela sem índices")
+
+                suggestions = results['suggestions'] or []
+                if suggestions:
+                    st.write("**Sugestões** (colunas usadas com frequência em filtros, agrupamentos e ordenações):")
+                    st.dataframe(pd.DataFrame(suggestions)[['column', 'uses', 'reason']].rename(
+                        columns={'column': 'Coluna', 'uses': 'Usos', 'reason': 'Uso'}), use_container_width=True)
+                    if st.button("⚡ Criar índices sugeridos"):
+                        created = db.apply_index_suggestions(selected_table)
+                        st.success(f"✅ Índices criados: {', '.join(created)}")
+                        st.rerun()
+
+                new_index_cols = st.multiselect("Criar índice nas colunas", table_columns, key="db_new_index")
+                if st.button("➕ Criar índice", disabled=not new_index_cols):
+                    name = db.create_index(selected_table, new_index_cols)
+                    if name:
+                        st.success(f"✅ Índice {name} criado")
+                        st.rerun()
+                    else:
+                        st.error("❌ Erro ao criar índice")
+
+            # Botões de ação
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.button("📊 Analisar esta tabela"):
+                    # Amostra para os gráficos linha a linha; agregações rodam no SQLite
+                    sample, _ = db.fetch_page(selected_table, page_size=Settings.DB_ANALYSIS_SAMPLE_ROWS)
+                    st.session_state.data = sample
+                    st.session_state.data_name = selected_table
+                    st.session_state.data_source = "sqlite"
+                    st.session_state.data_table = selected_table
+                    st.success(f"✅ Tabela '{selected_table}' carregada para análise "
+                               f"(amostra de {len(sample):,} linhas; agregações usam a tabela inteira)")
+            with col2:
+                if st.button("📥 Download CSV (página atual)"):
                     csv = df.to_csv(index=False)
                     st.download_button(
                         label="Clique para baixar",
                         data=csv,
-                        file_name=f"{selected_table}.csv",
+                        file_name=f"{selected_table}_pagina_{len(cursors)}.csv",
                         mime="text/csv"
                     )
-            with col2:
+            with col3:
                 if st.button("🗑️ Limpar tabela", type="primary"):
                     if st.checkbox("Confirmar exclusão de todos os dados?"):
                         db.execute_query(f"DELETE FROM {selected_table}")
@@ -1648,14 +1857,19 @@ elif page == "⚙️ Configurações":
 
     col1, col2 = st.columns(2)
     with col1:
+        incremental_backup = st.checkbox("Backup incremental (só páginas alteradas, comprimidas)", value=False)
         if st.button("📥 Criar Backup do Banco"):
-            backup_path = db.backup_database()
-            if backup_path:
-                st.success(f"✅ Backup criado: {backup_path}")
+            with st.spinner("Copiando banco (leituras e escritas continuam liberadas)..."):
+                backup = db.backup_database(incremental=incremental_backup)
+            if backup and incremental_backup:
+                st.success(f"✅ Snapshot {backup['id']} criado: {backup['new_pages']:,} de "
+                           f"{backup['page_count']:,} páginas novas ({backup['stored_bytes'] / 1024 ** 2:.2f} MB)")
+            elif backup:
+                st.success(f"✅ Backup criado: {backup}")
 
     with col2:
         if st.button("🔄 Resetar Sessão"):
-            for key in ['data', 'data_name', 'data_source', 'analysis_history']:
+            for key in ['data', 'data_name', 'data_source', 'data_table', 'analysis_history']:
                 if key in st.session_state:
                     st.session_state[key] = None if key != 'analysis_history' else []
             st.success("✅ Sessão resetada!")
@@ -14,6 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from loguru import logger
 from src.data.sqlite_manager import SQLiteManager
+from src.data.backup_store import PageBackupStore
 from src.analysis.exploratory import ExploratoryAnalyzer
 from config.settings import Settings
 
@@ -42,10 +43,19 @@ class TaskAutomation:
         ]
 
         for table in tables:
-            df = self.db.sql_to_df(f"SELECT * FROM {table} LIMIT 100")
+            # Contagens e estatísticas vêm do catálogo: nenhuma tabela é varrida
+            stats = self.db.get_table_stats(table)
+            if stats is None:
+                continue
+
             report_lines.append(f"📋 Tabela: {table}")
-            report_lines.append(f"   Registros: {len(df)}")
-            report_lines.append(f"   Colunas: {list(df.columns)}")
+            report_lines.append(f"   Registros: {stats['row_count']}")
+            report_lines.append(f"   Colunas: {stats['columns']}")
+            report_lines.append(f"   Atualizada em: {stats['last_modified']}")
+            for col, col_stats in stats['column_stats'].items():
+                non_null = stats['row_count'] - col_stats['nulls']
+                if 'sum' in col_stats and non_null:
+                    report_lines.append(f"   Média {col}: {col_stats['sum'] / non_null:,.2f}")
             report_lines.append("")
 
         # Salva relatório
@@ -55,12 +65,29 @@ class TaskAutomation:
 
         logger.success(f"Relatório salvo: {report_path}")
 
+    def nightly_profile(self):
+        """Perfil noturno das tabelas (incremental: só as linhas novas são lidas)"""
+        logger.info("🔬 Iniciando perfil noturno das tabelas")
+
+        for table in self.db.list_tables():
+            try:
+                analysis = self.analyzer.analyze_sql(self.db, table, incremental=True)
+            except Exception as e:
+                # Leitura interrompida: o perfil salvo anterior fica como está
+                logger.error(f"Perfil de '{table}' não atualizado: {e}")
+                continue
+            if analysis:
+                self.analyzer.save_report(table, format='json')
+
+        logger.success("Perfil noturno concluído")
+
     def weekly_backup(self):
-        """Backup semanal do banco"""
+        """Backup semanal do banco (incremental: só páginas alteradas são gravadas)"""
         logger.info("💾 Iniciando backup semanal")
-        backup_path = self.db.backup_database()
-        if backup_path:
-            logger.success(f"Backup concluído: {backup_path}")
+        snapshot = self.db.backup_database(incremental=True)
+        if snapshot:
+            logger.success(f"Backup concluído: snapshot {snapshot['id']} "
+                           f"({snapshot['new_pages']}/{snapshot['page_count']} páginas novas)")
 
     def clean_old_files(self):
         """Remove arquivos antigos"""
@@ -70,9 +97,9 @@ class TaskAutomation:
         from datetime import timedelta
 
         # Remove backups com mais de 30 dias
-        backup_dir = Settings.DATA_DIR / "backups"
+        backup_dir = Settings.BACKUP_DIR
         if backup_dir.exists():
-            cutoff = datetime.now() - timedelta(days=30)
+            cutoff = datetime.now() - timedelta(days=Settings.BACKUP_RETENTION_DAYS)
             for backup in backup_dir.glob("*.db"):
                 try:
                     file_date = datetime.strptime(backup.stem.split('_')[-2], '%Y%m%d')
@@ -82,6 +109,10 @@ class TaskAutomation:
                 except:
                     pass
 
+            # Snapshots incrementais antigos e as páginas que só eles usavam
+            if (backup_dir / "page_store.db").exists():
+                PageBackupStore().prune()
+
         # Remove relatórios com mais de 7 dias
         if Settings.REPORTS_DIR.exists():
             cutoff = datetime.now() - timedelta(days=7)
@@ -94,17 +125,25 @@ class TaskAutomation:
                 except:
                     pass
 
+            # Relatórios JSON do perfil noturno
+            for report in Settings.REPORTS_DIR.glob("analysis_*.json"):
+                if datetime.fromtimestamp(report.stat().st_mtime) < cutoff:
+                    report.unlink()
+                    logger.info(f"Relatório removido: {report}")
+
     def run(self):
         """Configura e executa agendamentos"""
 
         # Agenda tarefas
         schedule.every().day.at("18:00").do(self.daily_report)
+        schedule.every().day.at("01:00").do(self.nightly_profile)
         schedule.every().monday.at("02:00").do(self.weekly_backup)
         schedule.every().sunday.at("03:00").do(self.clean_old_files)
 
         logger.info("🚀 Automações iniciadas")
         logger.info("Agendamentos:")
         logger.info("  - Relatório diário: 18:00")
+        logger.info("  - Perfil das tabelas: 01:00")
         logger.info("  - Backup semanal: segunda 02:00")
         logger.info("  - Limpeza: domingo 03:00")
 
@@ -139,9 +139,9 @@ def main():
     logger.info("\n📋 Tabelas no SQLite:")
     tables = db.list_tables()
     for table in tables:
-        count = db.execute_query(f"SELECT COUNT(*) FROM {table}")
-        if count:
-            logger.info(f"   - {table}: {count[0][0]:,} registros")
+        count = db.get_row_count(table)
+        if count is not None:
+            logger.info(f"   - {table}: {count:,} registros")
 
     logger.info("\n" + "=" * 50)
     logger.info("✅ Dados gerados com sucesso!")
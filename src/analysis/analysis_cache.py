@@ -0,0 +1,198 @@
+# src/analysis/analysis_cache.py
+"""
+Cache de resultados do ExploratoryAnalyzer por impressão digital do conteúdo
+"""
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from loguru import logger
+from config.settings import Settings
+
+# Muda quando a estrutura do relatório muda (invalida entradas antigas)
+CACHE_VERSION = 1
+
+
+def _column_checksums(values):
+    """Soma simples e soma ponderada pela posição dos bits de uma coluna de largura fixa"""
+    values = np.ascontiguousarray(values)
+    words = values.view(f'uint{values.dtype.itemsize * 8}').astype('uint64', copy=False)
+    positions = np.arange(1, len(words) + 1, dtype='uint64')
+    # Overflow em uint64 é aritmética módulo 2^64, que é o desejado aqui
+    return int(words.sum(dtype='uint64')), int((words * positions).sum(dtype='uint64'))
+
+
+def dataframe_fingerprint(df):
+    """
+    Impressão digital do conteúdo de um DataFrame
+
+    Combina formato, nomes e tipos das colunas e checksums completos de
+    cada coluna: as de largura fixa (números, datas, bool) entram pelos
+    próprios bits; as demais (texto, category, tipos do pandas) pelo hash
+    de cada valor. Qualquer valor alterado ou linha trocada de posição
+    muda a impressão digital; o custo é uma passada vetorizada por coluna.
+
+    Args:
+        df: DataFrame
+
+    Returns:
+        str: hash hexadecimal
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([CACHE_VERSION, list(df.shape), [str(c) for c in df.columns],
+                              df.dtypes.astype(str).tolist()]).encode())
+
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufmM':
+            values = series.to_numpy()
+        else:
+            try:
+                values = pd.util.hash_pandas_object(series, index=False).to_numpy()
+            except TypeError:
+                # Células não hashable (ex: listas)
+                values = pd.util.hash_pandas_object(series.astype(str), index=False).to_numpy()
+        digest.update(json.dumps(_column_checksums(values)).encode())
+
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Cache de relatórios de análise: LRU em memória e pickles em disco
+
+    Entradas em disco são compartilhadas entre processos (sessões do
+    dashboard, automações); o tamanho total em disco é limitado com
+    descarte LRU pelo mtime, como no IngestCache.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=None, max_size_mb=None):
+        """
+        Inicializa o cache
+
+        Args:
+            cache_dir: Diretório do cache (padrão: Settings.ANALYSIS_CACHE_DIR)
+            max_entries: Relatórios em memória (padrão: Settings.ANALYSIS_CACHE_ENTRIES)
+            max_size_mb: Tamanho máximo em disco (padrão: Settings.ANALYSIS_CACHE_MAX_MB)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Settings.ANALYSIS_CACHE_DIR
+        self.max_entries = max_entries or Settings.ANALYSIS_CACHE_ENTRIES
+        self.max_size_mb = max_size_mb or Settings.ANALYSIS_CACHE_MAX_MB
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key):
+        """
+        Busca um relatório pela impressão digital
+
+        Returns:
+            Cópia do relatório em cache ou None
+        """
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(analysis)
+
+        cache_file = self._cache_file(key)
+        try:
+            if cache_file.exists():
+                with open(cache_file, 'rb') as f:
+                    analysis = pickle.load(f)
+                # Atualiza o mtime para o descarte LRU
+                os.utime(cache_file)
+                self._remember(key, analysis)
+                with self._lock:
+                    self.hits += 1
+                return copy.deepcopy(analysis)
+        except Exception as e:
+            logger.warning(f"Erro ao ler cache de análise {key}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, analysis):
+        """
+        Guarda um relatório em memória e em disco
+
+        Returns:
+            bool: True se gravou em disco
+        """
+        analysis = copy.deepcopy(analysis)
+        self._remember(key, analysis)
+
+        try:
+            cache_file = self._cache_file(key)
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(analysis, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"Erro ao gravar cache de análise {key}: {e}")
+            return False
+
+        self._evict()
+        return True
+
+    def clear(self):
+        """Remove todas as entradas (memória e disco)"""
+        with self._lock:
+            self._entries.clear()
+        for cache_file in self.cache_dir.glob("*.pkl"):
+            cache_file.unlink(missing_ok=True)
+        logger.info("Cache de análises limpo")
+
+    def _remember(self, key, analysis):
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _cache_file(self, key):
+        return self.cache_dir / f"{key}.pkl"
+
+    def _evict(self):
+        """Remove as entradas em disco menos usadas até caber no limite"""
+        entries = []
+        for cache_file in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = cache_file.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, cache_file))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        limit = self.max_size_mb * 1024 ** 2
+
+        for _, size, cache_file in entries:
+            if total <= limit:
+                break
+            cache_file.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Análise descartada do cache (LRU): {cache_file.name}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache():
+    """AnalysisCache compartilhado pelo processo"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnalysisCache()
+        return _cache
@@ -0,0 +1,265 @@
+# src/analysis/column_stats.py
+"""
+Estatísticas por coluna calculadas numa única passada
+
+As colunas numéricas são copiadas para um bloco 2-D float64 e todas as
+estatísticas (contagem, nulos, momentos, mínimo/máximo, quantis, valores
+distintos e correlações) saem de operações vetorizadas sobre esse bloco:
+uma ordenação por coluna dá mínimo, máximo, quantis e distintos; somas
+dos desvios centrados dão média, variância, assimetria e curtose.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from src.utils.sketches import CoMoments
+
+PERCENTILES = (.25, .5, .75)
+
+
+def percentile_label(q):
+    return f"{q * 100:g}%"
+
+
+class ColumnStats:
+    """
+    Resultado de compute_column_stats
+
+    Attributes:
+        rows: Número de linhas
+        nulls: Series com nulos por coluna (todas as colunas)
+        n_unique: Series com valores distintos não nulos por coluna
+        numeric: DataFrame (estatística x coluna numérica) com count, mean,
+            std, min, percentis, max, skewness e kurtosis, nas mesmas
+            convenções do pandas (describe, skew, kurtosis)
+        corr: Matriz de correlação de Pearson das colunas numéricas (ou None)
+        dtypes, memory_bytes, samples, duplicates: Preenchidos quando não há
+            DataFrame inteiro para consultar (perfil em streaming); None no
+            caso em memória, em que as seções do relatório usam o próprio df
+    """
+
+    def __init__(self, rows, nulls, n_unique, numeric, corr=None,
+                 dtypes=None, memory_bytes=None, samples=None, duplicates=None):
+        self.rows = rows
+        self.nulls = nulls
+        self.n_unique = n_unique
+        self.numeric = numeric
+        self.corr = corr
+        self.dtypes = dtypes
+        self.memory_bytes = memory_bytes
+        self.samples = samples
+        self.duplicates = duplicates
+
+    @property
+    def total_nulls(self):
+        return int(self.nulls.sum())
+
+    @property
+    def numeric_columns(self):
+        return list(self.numeric.columns)
+
+
+def _moments(block, missing, counts):
+    """Média, variância amostral, assimetria e curtose (fórmulas do pandas)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Nulos viram desvio 0: não contam nas somas
+        mean = np.where(missing, 0, block).sum(axis=0) / counts
+        centered = np.where(missing, 0, block - mean)
+        squared = centered * centered
+        m2 = squared.sum(axis=0)
+        m3 = (squared * centered).sum(axis=0)
+        m4 = (squared * squared).sum(axis=0)
+
+    var, skew, kurt = finalize_moments(counts, mean, m2, m3, m4)
+    return mean, var, skew, kurt
+
+
+def finalize_moments(counts, mean, m2, m3, m4):
+    """
+    Variância amostral, assimetria e curtose a partir dos momentos centrais
+
+    Args:
+        counts, mean: Contagem e média por coluna
+        m2, m3, m4: Somas dos desvios à média elevados a 2, 3 e 4
+
+    Returns:
+        tuple: (var, skew, kurt) com as fórmulas do pandas
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = m2 / (counts - 1)
+
+        # Assimetria e curtose ajustadas (G1 e G2, como Series.skew/kurtosis)
+        skew = (counts * (counts - 1) ** 0.5 / (counts - 2)) * (m3 / m2 ** 1.5)
+        kurt = (counts * (counts + 1) * (counts - 1) * m4 / ((counts - 2) * (counts - 3) * m2 ** 2)
+                - 3 * (counts - 1) ** 2 / ((counts - 2) * (counts - 3)))
+
+    # Coluna constante: o pandas devolve 0 em vez de NaN
+    constant = m2 <= 1e-14 * np.maximum(np.abs(mean), 1) ** 2 * counts
+    skew = np.where(constant & (counts >= 3), 0.0, skew)
+    kurt = np.where(constant & (counts >= 4), 0.0, kurt)
+    var = np.where(counts < 2, np.nan, var)
+    skew = np.where(counts < 3, np.nan, skew)
+    kurt = np.where(counts < 4, np.nan, kurt)
+    return var, skew, kurt
+
+
+def _sorted_stats(block, counts, percentiles):
+    """Mínimo, máximo, quantis (interpolação linear) e distintos a partir do bloco ordenado"""
+    ordered = np.sort(block, axis=0)  # NaN vão para o fim de cada coluna
+    last = np.maximum(counts - 1, 0).astype('int64')
+    empty = counts == 0
+
+    def at(positions):
+        if len(ordered) == 0:
+            return np.full(len(counts), np.nan)
+        values = np.take_along_axis(ordered, positions[None, :], axis=0)[0]
+        return np.where(empty, np.nan, values)
+
+    minimum = at(np.zeros(len(counts), dtype='int64'))
+    maximum = at(last)
+
+    quantiles = []
+    for q in percentiles:
+        position = q * last
+        low = np.floor(position).astype('int64')
+        high = np.ceil(position).astype('int64')
+        low_value, high_value = at(low), at(high)
+        quantiles.append(low_value + (high_value - low_value) * (position - low))
+
+    # Distintos: 1 + número de mudanças entre valores vizinhos não nulos
+    rows = np.arange(1, len(ordered))[:, None]
+    changes = (ordered[1:] != ordered[:-1]) & (rows < counts[None, :])
+    distinct = np.where(empty, 0, 1 + changes.sum(axis=0))
+    return minimum, maximum, quantiles, distinct
+
+
+def _block_stats(block, percentiles):
+    """
+    Estatísticas das colunas de um bloco 2-D float64
+
+    Returns:
+        tuple: (matriz estatística x coluna na ordem de STAT_ROWS, distintos)
+    """
+    missing = np.isnan(block)
+    counts = (~missing).sum(axis=0).astype('float64')
+    mean, var, skew, kurt = _moments(block, missing, counts)
+    minimum, maximum, quantiles, distinct = _sorted_stats(block, counts, percentiles)
+    return np.vstack([counts, mean, np.sqrt(var), minimum, *quantiles, maximum, skew, kurt]), distinct
+
+
+def _stat_rows(percentiles):
+    return ['count', 'mean', 'std', 'min', *map(percentile_label, percentiles), 'max', 'skewness', 'kurtosis']
+
+
+def _shard_stats(shm_name, shape, start, stop, percentiles):
+    """Estatísticas das colunas start:stop do bloco em memória compartilhada (roda no pool)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        block = np.ndarray(shape, dtype='float64', buffer=shm.buf, order='F')
+        result = _block_stats(block[:, start:stop], percentiles)
+        del block
+        return result
+    finally:
+        shm.close()
+
+
+def _fill_block(df, columns, block):
+    """Copia as colunas para o bloco (ordem Fortran: cada coluna contígua)"""
+    for i, col in enumerate(columns):
+        block[:, i] = df[col].to_numpy(dtype='float64', na_value=np.nan)
+    return block
+
+
+def _correlation(block):
+    """Correlação de Pearson com pares de observações completas (como DataFrame.corr)"""
+    if len(block) == 0:
+        return np.full((block.shape[1], block.shape[1]), np.nan)
+    if np.isnan(block).any():
+        return CoMoments(block.shape[1]).update(block).corr()
+    centered = block - block.mean(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scaled = centered / np.sqrt(np.sum(centered * centered, axis=0))
+        return np.clip(scaled.T @ scaled, -1, 1)
+
+
+def _non_numeric_stats(df, columns):
+    nulls = {col: int(df[col].isna().sum()) for col in columns}
+    n_unique = {col: int(df[col].nunique()) for col in columns}
+    return nulls, n_unique
+
+
+def compute_column_stats(df, percentiles=PERCENTILES, correlation=True, n_jobs=None):
+    """
+    Calcula as estatísticas de todas as colunas do DataFrame
+
+    Colunas numéricas (sem bool) passam pelo kernel vetorizado; nas demais
+    só nulos e distintos são calculados, coluna a coluna.
+
+    Com n_jobs > 1 as colunas numéricas vão para um bloco em memória
+    compartilhada e grupos de colunas são processados num pool de
+    processos (o DataFrame não é serializado); enquanto isso o processo
+    principal trata as colunas não numéricas e as correlações.
+
+    Args:
+        df: DataFrame
+        percentiles: Quantis do describe
+        correlation: Se True, calcula a matriz de correlação
+        n_jobs: Processos (None ou 1: sequencial; -1: todos os núcleos)
+
+    Returns:
+        ColumnStats
+    """
+    numeric_cols = list(df.select_dtypes(include=[np.number]).columns)
+    numeric_set = set(numeric_cols)
+    other_cols = [col for col in df.columns if col not in numeric_set]
+    rows = _stat_rows(percentiles)
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else (n_jobs or 1)
+    workers = min(n_jobs, len(numeric_cols))
+    shape = (len(df), len(numeric_cols))
+
+    corr = None
+    if workers > 1 and len(df) > 0:
+        shm = shared_memory.SharedMemory(create=True, size=max(shape[0] * shape[1] * 8, 1))
+        try:
+            block = _fill_block(df, numeric_cols, np.ndarray(shape, dtype='float64', buffer=shm.buf, order='F'))
+            bounds = np.linspace(0, len(numeric_cols), workers + 1).astype(int)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_shard_stats, shm.name, shape, start, stop, percentiles)
+                           for start, stop in zip(bounds[:-1], bounds[1:])]
+                nulls, n_unique = _non_numeric_stats(df, other_cols)
+                if correlation and len(numeric_cols) > 1:
+                    corr = _correlation(block)
+                shards = [future.result() for future in futures]
+            del block
+        finally:
+            shm.close()
+            shm.unlink()
+        values = np.hstack([values for values, _ in shards])
+        distinct = np.concatenate([distinct for _, distinct in shards])
+    else:
+        nulls, n_unique = _non_numeric_stats(df, other_cols)
+        if numeric_cols:
+            block = _fill_block(df, numeric_cols, np.empty(shape, dtype='float64', order='F'))
+            values, distinct = _block_stats(block, percentiles)
+            if correlation and len(numeric_cols) > 1:
+                corr = _correlation(block)
+
+    if numeric_cols:
+        numeric = pd.DataFrame(values, index=rows, columns=numeric_cols)
+        if corr is not None:
+            corr = pd.DataFrame(corr, index=numeric_cols, columns=numeric_cols)
+        for i, col in enumerate(numeric_cols):
+            nulls[col] = len(df) - int(values[0, i])
+            n_unique[col] = int(distinct[i])
+    else:
+        numeric = pd.DataFrame()
+
+    return ColumnStats(
+        rows=len(df),
+        nulls=pd.Series(nulls, dtype='int64').reindex(df.columns),
+        n_unique=pd.Series(n_unique, dtype='int64').reindex(df.columns),
+        numeric=numeric,
+        corr=corr
+    )
@@ -6,8 +6,41 @@ Análise exploratória de dados automatizada
 import pandas as pd
 import numpy as np
 from loguru import logger
+import hashlib
 import json
+import pickle
+import re
+import shutil
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import Settings
+from src.data.duplicates import get_detector, row_hashes
+from src.analysis.column_stats import compute_column_stats
+from src.analysis.streaming_profile import StreamingProfile
+from src.analysis.analysis_cache import dataframe_fingerprint, get_analysis_cache
+from src.utils.sql import quote_identifier
+
+
+def _prefix_signature(df, rows):
+    """
+    Hash de uma amostra das primeiras rows linhas de df
+
+    Linhas espaçadas (Settings.ANALYSIS_FINGERPRINT_SAMPLE), incluindo a
+    primeira e a última do trecho: o custo não cresce com o dataset.
+    """
+    if rows == 0:
+        return None
+    sample = min(rows, Settings.ANALYSIS_FINGERPRINT_SAMPLE)
+    positions = np.unique(np.linspace(0, rows - 1, sample).astype('int64'))
+    return hashlib.blake2b(row_hashes(df.iloc[positions]).tobytes(), digest_size=16).hexdigest()
+
+
+def _slices(df, size=None):
+    """Fatias de linhas de um DataFrame, para perfilar em chunks"""
+    size = size or Settings.SQLITE_FETCH_CHUNK_SIZE
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
 
 
 class ExploratoryAnalyzer:
@@ -17,58 +50,306 @@ class ExploratoryAnalyzer:
 
     def __init__(self):
         self.results = {}
+        self.profiles = {}
+        self.duplicates = get_detector()
+        # AnalysisCache compartilhado, obtido só quando use_cache=True
+        self.cache = None
         logger.info("ExploratoryAnalyzer inicializado")
 
-    def analyze_dataframe(self, df, df_name="dataset"):
+    def analyze_dataframe(self, df, df_name="dataset", n_jobs=None, incremental=False, use_cache=False):
         """
         Análise completa do DataFrame
 
         Args:
             df: DataFrame para análise
             df_name: Nome do dataset
+            n_jobs: Processos para as estatísticas das colunas numéricas
+                (padrão: Settings.ANALYSIS_JOBS; -1 usa todos os núcleos)
+            incremental: Se True, o resultado vem de um perfil mergeável
+                salvo em Settings.PROFILE_DIR; se as primeiras linhas de df
+                são as já perfiladas (mesmas colunas e mesma amostra de
+                linhas, incluindo a última perfilada), só as linhas novas
+                são processadas. Alterações em linhas antigas fora da
+                amostra não são detectadas: use forget_profile após
+                alterações assim. As estatísticas seguem as regras de
+                analyze_chunks.
+            use_cache: Se True, um DataFrame com a mesma impressão digital
+                (ver dataframe_fingerprint) reaproveita o relatório do
+                AnalysisCache, em memória ou em disco (a impressão digital
+                custa uma passada de hash por coluna, bem menos que o relatório)
 
         Returns:
             Dicionário com resultados
         """
         logger.info(f"Iniciando análise de {df_name}")
 
-        analysis = {
-            'basic_info': self._basic_info(df),
-            'data_types': self._data_types(df),
-            'missing_values': self._missing_values(df),
-            'descriptive_stats': self._descriptive_stats(df),
-            'unique_values': self._unique_values(df),
-            'insights': self._generate_insights(df)
-        }
+        if incremental:
+            profile = self.load_profile(df_name)
+            if profile is not None and self._is_profiled_prefix(profile, df):
+                delta = df.iloc[profile.rows:]
+                logger.info(f"Perfil de {df_name} atualizado com {len(delta)} linhas novas")
+                if len(delta):
+                    profile.merge(self._profile_chunks(_slices(delta)))
+            else:
+                profile = self._profile_chunks(_slices(df))
+                profile.source = ('dataframe',)
+            profile.signature = _prefix_signature(df, profile.rows)
+            return self._finish_profile(profile, df_name, save=True)
+
+        if use_cache and self.cache is None:
+            self.cache = get_analysis_cache()
+        key = dataframe_fingerprint(df) if use_cache else None
+        analysis = self.cache.get(key) if use_cache else None
+        if analysis is not None:
+            self.results[df_name] = analysis
+            logger.success(f"Análise de {df_name} reaproveitada do cache")
+            return analysis
+
+        # Estatísticas de todas as colunas numa passada, compartilhadas pelas seções
+        stats = compute_column_stats(df, n_jobs=n_jobs or Settings.ANALYSIS_JOBS)
+
+        analysis = self._build_report(df, stats)
+        if use_cache:
+            self.cache.put(key, analysis)
 
         self.results[df_name] = analysis
         logger.success(f"Análise concluída para {df_name}")
 
         return analysis
 
-    def _basic_info(self, df):
+    def analyze_chunks(self, chunks, df_name="dataset", workers=None):
+        """
+        Análise de um dataset lido em chunks, sem carregá-lo inteiro
+
+        Cada chunk vira um StreamingProfile (em threads) e os perfis são
+        somados na ordem dos chunks; no máximo 2 chunks por thread ficam
+        em memória. O relatório tem a mesma estrutura de analyze_dataframe:
+        contagens, nulos, média, desvio, assimetria, curtose, mínimo,
+        máximo, correlações e duplicatas são exatos; quantis e valores
+        distintos são exatos até 100 mil valores por coluna e aproximados
+        acima disso (KLL e HyperLogLog, erro ~1%). A memória informada é a
+        soma dos chunks, uma estimativa do DataFrame inteiro.
+
+        Args:
+            chunks: Iterável de DataFrames (ex: FileExtractor.iter_csv_chunks)
+            df_name: Nome do dataset
+            workers: Threads (padrão: Settings.PROFILE_WORKERS)
+
+        Returns:
+            Dicionário com resultados (o perfil fica em self.profiles[df_name])
+        """
+        logger.info(f"Iniciando análise em streaming de {df_name}")
+        return self._finish_profile(self._profile_chunks(chunks, workers), df_name)
+
+    def analyze_sql(self, db, source, df_name=None, params=None, chunksize=None, workers=None,
+                    incremental=False):
+        """
+        Análise em streaming de uma tabela ou query do SQLite
+
+        Args:
+            db: SQLiteManager
+            source: Nome da tabela ou query SELECT
+            df_name: Nome do dataset (padrão: source)
+            params: Parâmetros da query
+            chunksize: Linhas por chunk (padrão: Settings.SQLITE_FETCH_CHUNK_SIZE)
+            workers: Threads (padrão: Settings.PROFILE_WORKERS)
+            incremental: Só para tabelas: reaproveita o perfil salvo e lê só
+                as linhas com rowid maior que o último perfilado. Se o total
+                de linhas não bate (linhas removidas ou tabela recriada), a
+                tabela é perfilada de novo. UPDATEs em linhas antigas não
+                são detectados: use forget_profile após alterações assim.
+
+        Returns:
+            Dicionário com resultados
+
+        Raises:
+            Exception: Erro na leitura dos chunks (nenhum perfil é salvo)
+        """
+        df_name = df_name or source
+        if ' ' not in source.strip():
+            return self._analyze_table(db, source, df_name, chunksize, workers, incremental)
+
+        if incremental:
+            logger.warning("Análise incremental só vale para tabelas; analisando a query inteira")
+        chunks = db.iter_sql_chunks(source, params=params, chunksize=chunksize)
+        return self.analyze_chunks(chunks, df_name, workers=workers)
+
+    def _analyze_table(self, db, table, df_name, chunksize, workers, incremental):
+        """Perfil de uma tabela até o maior rowid atual, incremental se houver perfil salvo"""
+        logger.info(f"Iniciando análise em streaming de {df_name}")
+        max_rowid = db.max_rowid(table)
+        if max_rowid is None:
+            return {}
+        quoted = quote_identifier(table)
+        source = ('sqlite', str(db.db_path), table)
+
+        profile = self.load_profile(df_name) if incremental else None
+        if profile is not None and profile.source == source and profile.max_rowid <= max_rowid \
+                and profile.columns == db.get_columns(table):
+            delta = self._profile_chunks(db.iter_sql_chunks(
+                f"SELECT * FROM {quoted} WHERE rowid > ? AND rowid <= ?",
+                params=(profile.max_rowid, max_rowid), chunksize=chunksize), workers)
+            if profile.rows + delta.rows == db.get_row_count(table):
+                logger.info(f"Perfil de {df_name} atualizado com {delta.rows} linhas novas")
+                profile.merge(delta)
+            else:
+                logger.info(f"Linhas de {table} mudaram desde o último perfil; perfilando de novo")
+                delta.close()
+                profile = None
+        else:
+            profile = None
+
+        if profile is None:
+            profile = self._profile_chunks(db.iter_sql_chunks(
+                f"SELECT * FROM {quoted} WHERE rowid <= ?", params=(max_rowid,), chunksize=chunksize), workers)
+        profile.source = source
+        profile.max_rowid = max_rowid
+        return self._finish_profile(profile, df_name, save=incremental)
+
+    def _profile_chunks(self, chunks, workers=None):
+        """StreamingProfile de um iterável de chunks, resumidos em threads e somados em ordem"""
+        workers = workers or Settings.PROFILE_WORKERS
+
+        profile = StreamingProfile()
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(StreamingProfile().update, chunk))
+                    if len(pending) >= 2 * workers:
+                        profile.merge(pending.popleft().result())
+                while pending:
+                    profile.merge(pending.popleft().result())
+        else:
+            for chunk in chunks:
+                profile.update(chunk)
+        return profile
+
+    def _finish_profile(self, profile, df_name, save=False):
+        """Relatório a partir do perfil, guardado em self.results/self.profiles (e em disco)"""
+        if profile.rows == 0:
+            logger.warning(f"Nenhuma linha lida para {df_name}")
+            return {}
+
+        analysis = self._build_report(None, profile.column_stats())
+
+        old = self.profiles.get(df_name)
+        if old is not None and old is not profile:
+            old.close()
+        self.profiles[df_name] = profile
+        self.results[df_name] = analysis
+        if save:
+            self.save_profile(df_name)
+        logger.success(f"Análise em streaming concluída para {df_name} ({profile.rows:,} linhas)")
+
+        return analysis
+
+    @staticmethod
+    def _is_profiled_prefix(profile, df):
+        """True se as primeiras profile.rows linhas de df são as já perfiladas (pela amostra)"""
+        if profile.source != ('dataframe',) or profile.rows > len(df) or list(df.columns) != profile.columns:
+            return False
+        signature = getattr(profile, 'signature', None)
+        return signature is not None and _prefix_signature(df, profile.rows) == signature
+
+    def _profile_path(self, df_name):
+        safe_name = re.sub(r'[^\w.-]', '_', str(df_name))
+        return Settings.PROFILE_DIR / f"{safe_name}.pkl"
+
+    def _index_dir(self, df_name):
+        """Diretório dos hashes de linha do perfil (o pickle guarda só os caminhos)"""
+        return self._profile_path(df_name).with_suffix('.index')
+
+    def save_profile(self, df_name):
+        """Salva o perfil mergeável em Settings.PROFILE_DIR (hashes de linha num diretório ao lado)"""
+        profile = self.profiles.get(df_name)
+        if profile is None:
+            logger.error(f"Perfil não encontrado para {df_name}")
+            return None
+
+        file_path = self._profile_path(df_name)
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            profile.row_index.persist(self._index_dir(df_name))
+            with open(file_path, 'wb') as f:
+                pickle.dump(profile, f, protocol=pickle.HIGHEST_PROTOCOL)
+            logger.debug(f"Perfil salvo: {file_path}")
+            return file_path
+        except Exception as e:
+            logger.error(f"Erro ao salvar perfil de {df_name}: {e}")
+            return None
+
+    def load_profile(self, df_name):
+        """Perfil mergeável em memória ou salvo em disco (None se não houver)"""
+        if df_name in self.profiles:
+            return self.profiles[df_name]
+
+        file_path = self._profile_path(df_name)
+        if not file_path.exists():
+            return None
+        try:
+            with open(file_path, 'rb') as f:
+                profile = pickle.load(f)
+            self.profiles[df_name] = profile
+            return profile
+        except Exception as e:
+            logger.warning(f"Perfil de {df_name} ilegível, será recalculado: {e}")
+            return None
+
+    def forget_profile(self, df_name):
+        """Descarta o perfil salvo (a próxima análise incremental começa do zero)"""
+        profile = self.profiles.pop(df_name, None)
+        if profile is not None:
+            profile.close()
+        self._profile_path(df_name).unlink(missing_ok=True)
+        shutil.rmtree(self._index_dir(df_name), ignore_errors=True)
+
+    def _build_report(self, df, stats):
+        """
+        Monta o relatório a partir das estatísticas
+
+        Com df=None (perfil em streaming) todas as seções saem de stats,
+        que então traz dtypes, memória, amostras e duplicatas.
+        """
+        return {
+            'basic_info': self._basic_info(df, stats),
+            'data_types': self._data_types(df, stats),
+            'missing_values': self._missing_values(df, stats),
+            'descriptive_stats': self._descriptive_stats(df, stats),
+            'unique_values': self._unique_values(df, stats),
+            'insights': self._generate_insights(df, stats)
+        }
+
+    def _basic_info(self, df, stats=None):
         """Informações básicas"""
+        if df is None:
+            rows, columns, memory = stats.rows, list(stats.nulls.index), stats.memory_bytes
+        else:
+            rows, columns, memory = df.shape[0], list(df.columns), df.memory_usage(deep=True).sum()
         return {
             'shape': {
-                'rows': df.shape[0],
-                'columns': df.shape[1]
+                'rows': rows,
+                'columns': len(columns)
             },
-            'memory_usage': f"{df.memory_usage(deep=True).sum() / 1024 ** 2:.2f} MB",
-            'columns': list(df.columns)
+            'memory_usage': f"{memory / 1024 ** 2:.2f} MB",
+            'columns': columns
         }
 
-    def _data_types(self, df):
+    def _data_types(self, df, stats=None):
         """Tipos de dados"""
-        dtypes = df.dtypes.value_counts()
+        column_dtypes = stats.dtypes if df is None else df.dtypes
+        dtypes = column_dtypes.value_counts()
         return {
             'summary': {str(k): int(v) for k, v in dtypes.items()},
-            'details': df.dtypes.astype(str).to_dict()
+            'details': column_dtypes.astype(str).to_dict()
         }
 
-    def _missing_values(self, df):
+    def _missing_values(self, df, stats=None):
         """Valores faltantes"""
-        missing = df.isnull().sum()
-        missing_pct = (missing / len(df)) * 100
+        stats = stats or compute_column_stats(df, correlation=False)
+        missing = stats.nulls
+        missing_pct = (missing / stats.rows) * 100
+        total_missing = stats.total_nulls
 
         missing_df = pd.DataFrame({
             'count': missing,
@@ -76,79 +357,81 @@ class ExploratoryAnalyzer:
         }).sort_values('count', ascending=False)
 
         return {
-            'total_missing': int(df.isnull().sum().sum()),
-            'total_missing_pct': float((df.isnull().sum().sum() / (df.shape[0] * df.shape[1])) * 100),
+            'total_missing': total_missing,
+            'total_missing_pct': float((total_missing / (stats.rows * len(missing))) * 100),
             'columns_with_missing': int((missing > 0).sum()),
             'details': missing_df[missing_df['count'] > 0].to_dict()
         }
 
-    def _descriptive_stats(self, df):
-        """Estatísticas descritivas"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+    def _descriptive_stats(self, df, stats=None):
+        """Estatísticas descritivas (describe + skewness e kurtosis)"""
+        stats = stats or compute_column_stats(df, correlation=False)
 
-        if len(numeric_cols) == 0:
+        if len(stats.numeric_columns) == 0:
             return {'message': 'Sem colunas numéricas'}
 
-        stats = df[numeric_cols].describe(percentiles=[.25, .5, .75]).to_dict()
+        return {col: {name: float(value) for name, value in values.items()}
+                for col, values in stats.numeric.to_dict().items()}
 
-        # Adiciona skewness e kurtosis
-        for col in numeric_cols:
-            if col not in stats:
-                stats[col] = {}
-            stats[col]['skewness'] = float(df[col].skew())
-            stats[col]['kurtosis'] = float(df[col].kurtosis())
-
-        return stats
-
-    def _unique_values(self, df):
+    def _unique_values(self, df, stats=None):
         """Valores únicos por coluna"""
+        stats = stats or compute_column_stats(df, correlation=False)
         unique_info = {}
 
-        for col in df.columns:
-            n_unique = df[col].nunique()
+        for col in stats.n_unique.index:
+            n_unique = stats.n_unique[col]
+            if n_unique > 10:
+                sample = []
+            elif df is None:
+                sample = stats.samples[col]
+            else:
+                sample = df[col].dropna().unique()[:5].tolist()
             unique_info[col] = {
                 'n_unique': int(n_unique),
-                'unique_ratio': float(n_unique / len(df)),
-                'sample': df[col].dropna().unique()[:5].tolist() if n_unique <= 10 else []
+                'unique_ratio': float(n_unique / stats.rows),
+                'sample': sample
             }
 
         return unique_info
 
-    def _generate_insights(self, df):
+    def _generate_insights(self, df, stats=None):
         """Gera insights automáticos"""
+        stats = stats or compute_column_stats(df)
         insights = []
 
+        rows, n_columns = stats.rows, len(stats.nulls)
+
         # Insight 1: Tamanho do dataset
-        if df.shape[0] > 10000:
-            insights.append(f"📊 Dataset grande: {df.shape[0]:,} linhas")
-        elif df.shape[0] > 1000:
-            insights.append(f"📊 Dataset médio: {df.shape[0]:,} linhas")
+        if rows > 10000:
+            insights.append(f"📊 Dataset grande: {rows:,} linhas")
+        elif rows > 1000:
+            insights.append(f"📊 Dataset médio: {rows:,} linhas")
         else:
-            insights.append(f"📊 Dataset pequeno: {df.shape[0]} linhas")
+            insights.append(f"📊 Dataset pequeno: {rows} linhas")
 
         # Insight 2: Valores faltantes
-        missing_total = df.isnull().sum().sum()
+        missing_total = stats.total_nulls
         if missing_total > 0:
-            missing_pct = (missing_total / (df.shape[0] * df.shape[1])) * 100
+            missing_pct = (missing_total / (rows * n_columns)) * 100
             insights.append(f"⚠️ {missing_pct:.1f}% dos valores são faltantes")
         else:
             insights.append("✅ Sem valores faltantes")
 
         # Insight 3: Colunas numéricas vs categóricas
-        numeric = len(df.select_dtypes(include=[np.number]).columns)
-        categorical = len(df.select_dtypes(include=['object']).columns)
+        numeric = len(stats.numeric_columns)
+        column_dtypes = stats.dtypes if df is None else df.dtypes
+        categorical = int((column_dtypes == 'object').sum())
         insights.append(f"📐 {numeric} colunas numéricas, {categorical} categóricas")
 
         # Insight 4: Duplicatas
-        duplicates = df.duplicated().sum()
+        duplicates = stats.duplicates if df is None else self.duplicates.count(df)
         if duplicates > 0:
-            dup_pct = (duplicates / df.shape[0]) * 100
+            dup_pct = (duplicates / rows) * 100
             insights.append(f"🔄 {duplicates} linhas duplicadas ({dup_pct:.1f}%)")
 
         # Insight 5: Correlações fortes
-        numeric_df = df.select_dtypes(include=[np.number])
-        if numeric_df.shape[1] > 1:
-            corr_matrix = numeric_df.corr()
+        corr_matrix = stats.corr
+        if corr_matrix is not None:
             strong_corr = []
             for i in range(len(corr_matrix.columns)):
                 for j in range(i + 1, len(corr_matrix.columns)):
@@ -0,0 +1,246 @@
+# src/analysis/streaming_profile.py
+"""
+Perfil de dados em streaming com estado mergeável por coluna
+
+Cada chunk atualiza resumos de tamanho limitado (momentos, quantis KLL,
+HyperLogLog, valores frequentes, co-momentos e hashes de linha). Perfis
+de chunks diferentes podem ser calculados em paralelo e somados com
+merge(); column_stats() gera o ColumnStats usado pelo relatório do
+ExploratoryAnalyzer.
+"""
+
+import numpy as np
+import pandas as pd
+from config.settings import Settings
+from src.analysis.column_stats import ColumnStats, PERCENTILES, finalize_moments, percentile_label
+from src.data.duplicates import HashIndex, row_hashes
+from src.utils.sketches import CoMoments, HeavyHitters, HyperLogLog, KLLSketch, Moments
+
+# Valores distintos guardados como amostra por coluna (como em _unique_values)
+SAMPLE_SIZE = 5
+
+
+def _is_numeric(dtype):
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _common_dtype(dtypes):
+    """Tipo da coluna inteira a partir dos tipos vistos nos chunks"""
+    dtypes = list(dtypes)
+    if not dtypes:
+        return np.dtype('object')
+    if len(dtypes) == 1:
+        return dtypes[0]
+    if all(isinstance(d, np.dtype) and _is_numeric(d) for d in dtypes):
+        # ex: int64 num chunk e float64 (com nulos) em outro
+        return np.result_type(*dtypes)
+    return np.dtype('object')
+
+
+class StreamingProfile:
+    """
+    Estado mergeável do perfil de um dataset lido em chunks
+
+    Exemplo:
+        profile = StreamingProfile()
+        for chunk in extractor.iter_csv_chunks(path):
+            profile.update(chunk)
+        stats = profile.column_stats()
+    """
+
+    def __init__(self, quantile_k=None, top_capacity=None):
+        self.quantile_k = quantile_k or Settings.STREAM_QUANTILE_K
+        self.top_capacity = top_capacity or Settings.PROFILE_TOP_CAPACITY
+        self.rows = 0
+        self.memory_bytes = 0
+        self.columns = []
+        self.dtypes = {}
+        self.nulls = {}
+        self.samples = {}
+        self.distinct = {}
+        self.moments = {}
+        self.quantiles = {}
+        self.frequent = {}
+        self.comoments = None
+        self.corr_columns = None
+        # Hashes das linhas vistas, para contar duplicatas exatas; grava em
+        # disco acima do limite de memória (save_profile o salva pelo caminho)
+        self.row_index = HashIndex()
+        # Origem dos dados, preenchida por quem atualiza o perfil
+        # (ex: ('sqlite', tabela) e o maior rowid lido, ou a assinatura
+        # das linhas de um DataFrame já perfiladas)
+        self.source = None
+        self.max_rowid = None
+        self.signature = None
+
+    def update(self, chunk):
+        """Adiciona um chunk (DataFrame) ao perfil"""
+        self.rows += len(chunk)
+        self.memory_bytes += int(chunk.memory_usage(deep=True).sum())
+        self.row_index.update(row_hashes(chunk))
+
+        numeric_cols = []
+        for col in chunk.columns:
+            series = chunk[col]
+            if col not in self.dtypes:
+                self.columns.append(col)
+                self.dtypes[col] = set()
+                self.nulls[col] = 0
+                self.samples[col] = []
+                self.distinct[col] = HyperLogLog()
+            nulls = int(series.isna().sum())
+            self.nulls[col] += nulls
+            if nulls < len(series) or series.dtype != 'object':
+                # Chunk só de nulos vindo do SQLite tem tipo object e não diz nada
+                self.dtypes[col].add(series.dtype)
+
+            sample = self.samples[col]
+            if len(sample) < SAMPLE_SIZE:
+                for value in series.dropna().unique()[:SAMPLE_SIZE].tolist():
+                    if value not in sample and len(sample) < SAMPLE_SIZE:
+                        sample.append(value)
+
+            if _is_numeric(series.dtype):
+                numeric_cols.append(col)
+            else:
+                self.distinct[col].update(series)
+                self.frequent.setdefault(col, HeavyHitters(self.top_capacity)).update(series)
+
+        if numeric_cols:
+            block = np.column_stack([chunk[col].to_numpy(dtype='float64', na_value=np.nan)
+                                     for col in numeric_cols])
+            for i, col in enumerate(numeric_cols):
+                values = block[:, i]
+                present = values[~np.isnan(values)]
+                self.moments.setdefault(col, Moments(1)).update(values[:, None])
+                self.quantiles.setdefault(col, KLLSketch(self.quantile_k)).update(present)
+                self.distinct[col].add_hashes(pd.util.hash_array(present))
+            self._update_comoments(numeric_cols, block)
+        return self
+
+    def _update_comoments(self, numeric_cols, block):
+        """Correlações só entre colunas numéricas em todos os chunks"""
+        if self.corr_columns is None:
+            self.corr_columns = list(numeric_cols)
+            self.comoments = CoMoments(len(numeric_cols))
+        self._restrict_comoments(numeric_cols)
+        positions = [numeric_cols.index(col) for col in self.corr_columns]
+        self.comoments.update(block[:, positions])
+
+    def _restrict_comoments(self, columns):
+        keep = [i for i, col in enumerate(self.corr_columns) if col in columns]
+        if len(keep) < len(self.corr_columns):
+            self.comoments.select(keep)
+            self.corr_columns = [self.corr_columns[i] for i in keep]
+
+    def merge(self, other):
+        """
+        Soma outro perfil a este
+
+        Os resumos não dependem da ordem, exceto as amostras de valores
+        (primeiros distintos vistos): para reproduzir a leitura sequencial,
+        some os perfis na ordem dos chunks.
+        """
+        self.rows += other.rows
+        self.memory_bytes += other.memory_bytes
+        self.row_index.merge(other.row_index)
+
+        for col in other.columns:
+            if col not in self.dtypes:
+                self.columns.append(col)
+                self.dtypes[col] = set()
+                self.nulls[col] = 0
+                self.samples[col] = []
+                self.distinct[col] = HyperLogLog()
+            self.dtypes[col] |= other.dtypes[col]
+            self.nulls[col] += other.nulls[col]
+            self.distinct[col].merge(other.distinct[col])
+            sample = self.samples[col]
+            for value in other.samples[col]:
+                if value not in sample and len(sample) < SAMPLE_SIZE:
+                    sample.append(value)
+
+        for name in ('moments', 'quantiles', 'frequent'):
+            mine = getattr(self, name)
+            for col, summary in getattr(other, name).items():
+                if col in mine:
+                    mine[col].merge(summary)
+                else:
+                    mine[col] = summary
+
+        if other.comoments is not None:
+            if self.comoments is None:
+                self.corr_columns, self.comoments = list(other.corr_columns), other.comoments
+            else:
+                self._restrict_comoments(other.corr_columns)
+                positions = [other.corr_columns.index(col) for col in self.corr_columns]
+                self.comoments.merge(_select_copy(other.comoments, positions))
+        return self
+
+    def column_dtypes(self):
+        """Series coluna -> tipo consolidado"""
+        return pd.Series({col: _common_dtype(self.dtypes[col]) for col in self.columns}, dtype='object')
+
+    def top_values(self, column, n=10):
+        """Valores mais frequentes (estimados) de uma coluna não numérica"""
+        if column not in self.frequent:
+            return pd.Series(dtype='int64')
+        return self.frequent[column].top(n)
+
+    def column_stats(self, percentiles=PERCENTILES):
+        """
+        Estatísticas consolidadas, no formato de compute_column_stats
+
+        Returns:
+            ColumnStats com dtypes, memory_bytes, samples e duplicates preenchidos
+        """
+        dtypes = self.column_dtypes()
+        numeric_cols = [col for col in self.columns if _is_numeric(dtypes[col]) and col in self.moments]
+
+        if numeric_cols:
+            moments = [self.moments[col] for col in numeric_cols]
+            counts, mean, m2, m3, m4, minimum, maximum = (
+                np.concatenate([getattr(m, field) for m in moments])
+                for field in ('n', 'mean', 'm2', 'm3', 'm4', 'min', 'max'))
+            var, skew, kurt = finalize_moments(counts, mean, m2, m3, m4)
+            mean = np.where(counts > 0, mean, np.nan)
+            quantiles = [[self.quantiles[col].quantile(q) for col in numeric_cols] for q in percentiles]
+            numeric = pd.DataFrame(
+                [counts, mean, np.sqrt(var), minimum, *quantiles, maximum, skew, kurt],
+                index=['count', 'mean', 'std', 'min', *map(percentile_label, percentiles), 'max',
+                       'skewness', 'kurtosis'],
+                columns=numeric_cols
+            )
+        else:
+            numeric = pd.DataFrame()
+
+        corr = None
+        corr_cols = [col for col in (self.corr_columns or []) if col in numeric_cols]
+        if len(corr_cols) > 1 and len(numeric_cols) > 1:
+            positions = [self.corr_columns.index(col) for col in corr_cols]
+            matrix = _select_copy(self.comoments, positions).corr()
+            corr = pd.DataFrame(matrix, index=corr_cols, columns=corr_cols)
+
+        return ColumnStats(
+            rows=self.rows,
+            nulls=pd.Series(self.nulls, dtype='int64').reindex(self.columns),
+            n_unique=pd.Series({col: self.distinct[col].count() for col in self.columns},
+                               dtype='int64').reindex(self.columns),
+            numeric=numeric,
+            corr=corr,
+            dtypes=dtypes,
+            memory_bytes=self.memory_bytes,
+            samples=dict(self.samples),
+            duplicates=self.rows - len(self.row_index)
+        )
+
+    def close(self):
+        """Remove arquivos temporários do índice de linhas"""
+        self.row_index.close()
+
+
+def _select_copy(comoments, positions):
+    copy = CoMoments(0)
+    copy.shift, copy.n, copy.sx, copy.sxx, copy.sxy = (comoments.shift, comoments.n, comoments.sx,
+                                                       comoments.sxx, comoments.sxy)
+    return copy.select(positions)
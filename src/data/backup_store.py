@@ -0,0 +1,227 @@
+# src/data/backup_store.py
+"""
+Backup incremental do SQLite com páginas deduplicadas e comprimidas
+"""
+
+import sqlite3
+import hashlib
+import time
+import zlib
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from config.settings import Settings
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Bytes do hash de cada página no manifesto de um snapshot
+DIGEST_SIZE = 16
+
+
+def _digest(page):
+    return hashlib.blake2b(page, digest_size=DIGEST_SIZE).digest()
+
+
+class PageBackupStore:
+    """
+    Armazena snapshots de bancos SQLite página a página
+
+    Cada página é guardada uma única vez (chave = hash do conteúdo),
+    comprimida com zlib; um snapshot é só a lista ordenada de hashes.
+    Semanas em que pouco mudou custam só as páginas alteradas.
+    """
+
+    def __init__(self, store_path=None):
+        """
+        Inicializa o repositório de páginas
+
+        Args:
+            store_path: Arquivo do repositório (padrão: Settings.BACKUP_DIR / "page_store.db")
+        """
+        self.store_path = Path(store_path or Settings.BACKUP_DIR / "page_store.db")
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.store_path))
+        # Precisa vir antes da criação das tabelas para valer
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS pages (hash BLOB PRIMARY KEY, data BLOB NOT NULL) WITHOUT ROWID")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "id INTEGER PRIMARY KEY, created_at TEXT NOT NULL, source TEXT, "
+            "page_size INTEGER NOT NULL, page_count INTEGER NOT NULL, "
+            "new_pages INTEGER NOT NULL, stored_bytes INTEGER NOT NULL, manifest BLOB NOT NULL)"
+        )
+        return conn
+
+    def add_snapshot(self, db_file, source=None, page_size=None, page_count=None,
+                     pages_per_step=None, sleep=0):
+        """
+        Registra um snapshot lendo o arquivo do banco página a página
+
+        Só páginas com hash ainda desconhecido são comprimidas e gravadas;
+        as do snapshot anterior nem são consultadas no repositório.
+
+        Args:
+            db_file: Arquivo SQLite que não muda durante a leitura: uma cópia
+                fechada ou o banco ao vivo com uma transação de leitura aberta
+                e o WAL já aplicado (ver SQLiteManager.backup_database)
+            source: Descrição da origem (caminho do banco original)
+            page_size: Tamanho de página (padrão: lido do arquivo)
+            page_count: Páginas a ler (padrão: até o fim do arquivo)
+            pages_per_step: Páginas lidas entre pausas (padrão: Settings.BACKUP_PAGES_PER_STEP)
+            sleep: Pausa em segundos entre passos
+
+        Returns:
+            dict: id, page_count, new_pages e stored_bytes do snapshot
+        """
+        db_file = Path(db_file)
+        if page_size is None:
+            src = sqlite3.connect(str(db_file))
+            try:
+                page_size = src.execute("PRAGMA page_size").fetchone()[0]
+            finally:
+                src.close()
+        pages_per_step = pages_per_step or Settings.BACKUP_PAGES_PER_STEP
+
+        conn = self._connect()
+        try:
+            previous = conn.execute("SELECT manifest FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+            known = set()
+            if previous is not None:
+                manifest = zlib.decompress(previous[0])
+                known.update(manifest[i:i + DIGEST_SIZE] for i in range(0, len(manifest), DIGEST_SIZE))
+
+            digests = []
+            new_pages = stored_bytes = 0
+            with open(db_file, 'rb') as f:
+                while page_count is None or len(digests) < page_count:
+                    page = f.read(page_size)
+                    if not page:
+                        break
+                    digest = _digest(page)
+                    digests.append(digest)
+                    if digest not in known:
+                        known.add(digest)
+                        exists = conn.execute("SELECT 1 FROM pages WHERE hash=?", (digest,)).fetchone()
+                        if not exists:
+                            data = zlib.compress(page)
+                            conn.execute("INSERT INTO pages VALUES (?, ?)", (digest, data))
+                            new_pages += 1
+                            stored_bytes += len(data)
+                    if sleep and len(digests) % pages_per_step == 0:
+                        time.sleep(sleep)
+
+            if page_count is not None and len(digests) < page_count:
+                raise ValueError(f"{db_file} tem {len(digests)} páginas, esperadas {page_count}")
+
+            manifest = zlib.compress(b"".join(digests))
+            cursor = conn.execute(
+                "INSERT INTO snapshots (created_at, source, page_size, page_count, new_pages, stored_bytes, manifest) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec='seconds'), source, page_size, len(digests),
+                 new_pages, stored_bytes + len(manifest), manifest)
+            )
+            conn.commit()
+            snapshot = {
+                'id': cursor.lastrowid,
+                'page_count': len(digests),
+                'new_pages': new_pages,
+                'stored_bytes': stored_bytes + len(manifest)
+            }
+            logger.info(f"Snapshot {snapshot['id']}: {new_pages}/{len(digests)} páginas novas "
+                        f"({snapshot['stored_bytes'] / 1024 ** 2:.2f} MB gravados)")
+            return snapshot
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def list_snapshots(self):
+        """
+        Lista os snapshots, do mais antigo ao mais recente
+
+        Returns:
+            list: dicts com id, created_at, source, page_size, page_count, new_pages e stored_bytes
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, created_at, source, page_size, page_count, new_pages, stored_bytes "
+                "FROM snapshots ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.close()
+        keys = ('id', 'created_at', 'source', 'page_size', 'page_count', 'new_pages', 'stored_bytes')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def restore(self, snapshot_id=None, target_path=None):
+        """
+        Reconstrói o arquivo do banco a partir de um snapshot
+
+        Args:
+            snapshot_id: Snapshot a restaurar (padrão: o mais recente)
+            target_path: Arquivo de destino (padrão: restore_<id>.db ao lado do repositório)
+
+        Returns:
+            Path: Arquivo restaurado
+        """
+        conn = self._connect()
+        try:
+            if snapshot_id is None:
+                row = conn.execute("SELECT id, manifest FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+            else:
+                row = conn.execute("SELECT id, manifest FROM snapshots WHERE id=?", (snapshot_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Snapshot não encontrado: {snapshot_id}")
+
+            snapshot_id, manifest = row
+            manifest = zlib.decompress(manifest)
+            target_path = Path(target_path or self.store_path.parent / f"restore_{snapshot_id}.db")
+            with open(target_path, 'wb') as f:
+                for i in range(0, len(manifest), DIGEST_SIZE):
+                    data = conn.execute("SELECT data FROM pages WHERE hash=?",
+                                        (manifest[i:i + DIGEST_SIZE],)).fetchone()[0]
+                    f.write(zlib.decompress(data))
+        finally:
+            conn.close()
+
+        logger.info(f"Snapshot {snapshot_id} restaurado em {target_path}")
+        return target_path
+
+    def prune(self, keep_days=None, keep_last=1):
+        """
+        Remove snapshots antigos e as páginas que só eles usavam
+
+        Args:
+            keep_days: Idade máxima em dias (padrão: Settings.BACKUP_RETENTION_DAYS)
+            keep_last: Snapshots mais recentes mantidos mesmo se antigos
+
+        Returns:
+            int: Número de snapshots removidos
+        """
+        cutoff = (datetime.now() - timedelta(days=keep_days or Settings.BACKUP_RETENTION_DAYS)
+                  ).isoformat(timespec='seconds')
+        conn = self._connect()
+        try:
+            removed = conn.execute(
+                "DELETE FROM snapshots WHERE created_at < ? AND id NOT IN "
+                "(SELECT id FROM snapshots ORDER BY id DESC LIMIT ?)", (cutoff, keep_last)
+            ).rowcount
+            if removed:
+                # Páginas ainda referenciadas por algum snapshot restante
+                referenced = set()
+                for (manifest,) in conn.execute("SELECT manifest FROM snapshots"):
+                    manifest = zlib.decompress(manifest)
+                    referenced.update(manifest[i:i + DIGEST_SIZE] for i in range(0, len(manifest), DIGEST_SIZE))
+                orphans = [(h,) for (h,) in conn.execute("SELECT hash FROM pages") if h not in referenced]
+                conn.executemany("DELETE FROM pages WHERE hash=?", orphans)
+                conn.commit()
+                conn.execute("PRAGMA incremental_vacuum")
+                logger.info(f"{removed} snapshots removidos ({len(orphans)} páginas liberadas)")
+            conn.commit()
+            return removed
+        finally:
+            conn.close()
@@ -0,0 +1,234 @@
+# src/data/connection_pool.py
+"""
+Pool de conexões SQLite: um escritor e N leitores somente leitura
+"""
+
+import sqlite3
+import threading
+import queue
+import time
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote
+from config.settings import Settings
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Instruções da VM do SQLite entre verificações de cancelamento nos leitores
+PROGRESS_INTERVAL = 5_000
+
+# Token de cancelamento da thread atual (ver cancel_scope)
+_scope = threading.local()
+
+
+class CancelToken:
+    """Sinaliza que as leituras de uma tarefa devem ser interrompidas"""
+
+    def __init__(self, timeout=None):
+        """
+        Args:
+            timeout: Segundos até o cancelamento automático (None = sem prazo)
+        """
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def cancelled(self):
+        """True se cancelado ou se o prazo expirou"""
+        if self._event.is_set():
+            return True
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+
+@contextmanager
+def cancel_scope(token):
+    """
+    Associa um CancelToken às leituras feitas pela thread atual
+
+    Enquanto o token não estiver cancelado, nada muda; quando estiver, a
+    query em andamento numa conexão de leitura é abortada com
+    sqlite3.OperationalError ('interrupted').
+    """
+    previous = getattr(_scope, 'token', None)
+    _scope.token = token
+    try:
+        yield token
+    finally:
+        _scope.token = previous
+
+
+def _should_abort():
+    """Progress handler dos leitores: valor diferente de zero aborta a query"""
+    token = getattr(_scope, 'token', None)
+    return 1 if token is not None and token.cancelled() else 0
+
+
+class SQLiteConnectionPool:
+    """
+    Mantém conexões SQLite abertas e seguras entre threads
+
+    O banco é colocado em modo WAL, então os leitores continuam lendo
+    enquanto uma ingestão escreve. Escritas passam por uma única conexão
+    protegida por lock; leituras usam conexões somente leitura reaproveitadas.
+    """
+
+    def __init__(self, db_path, readers=None, mmap_mb=None, cache_mb=None, busy_timeout_ms=None):
+        """
+        Inicializa o pool (as conexões são abertas sob demanda)
+
+        Args:
+            db_path: Caminho do arquivo do banco
+            readers: Máximo de conexões de leitura (padrão: Settings.SQLITE_READERS)
+            mmap_mb: PRAGMA mmap_size em MB (padrão: Settings.SQLITE_MMAP_MB)
+            cache_mb: PRAGMA cache_size em MB (padrão: Settings.SQLITE_CACHE_MB)
+            busy_timeout_ms: Espera por locks em ms (padrão: Settings.SQLITE_BUSY_TIMEOUT_MS)
+        """
+        self.db_path = str(db_path)
+        self.readers = readers or Settings.SQLITE_READERS
+        self.mmap_mb = Settings.SQLITE_MMAP_MB if mmap_mb is None else mmap_mb
+        self.cache_mb = cache_mb or Settings.SQLITE_CACHE_MB
+        self.busy_timeout_ms = busy_timeout_ms or Settings.SQLITE_BUSY_TIMEOUT_MS
+
+        # Banco em memória não é compartilhado entre conexões: tudo passa pelo escritor
+        self.in_memory = self.db_path == ':memory:'
+
+        self._writer = None
+        self._writer_lock = threading.RLock()
+        self._writer_cancellable = False
+        self._monitor = None
+        self._monitor_lock = threading.Lock()
+        self._idle_readers = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(self.readers)
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    @contextmanager
+    def writer(self, cancellable=False):
+        """
+        Conexão de escrita (uma thread por vez)
+
+        Em caso de erro, a transação aberta é desfeita antes de propagar a exceção.
+
+        Args:
+            cancellable: Se True, o CancelToken da thread (ver cancel_scope)
+                também interrompe o que rodar nesta conexão enquanto ela
+                estiver emprestada, como nos leitores
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._open(read_only=False)
+
+            # Num uso aninhado, quem instalou o handler é quem o remove
+            install = cancellable and not self._writer_cancellable
+            if install:
+                self._writer.set_progress_handler(_should_abort, PROGRESS_INTERVAL)
+                self._writer_cancellable = True
+            try:
+                yield self._writer
+            except Exception:
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+                raise
+            finally:
+                if install:
+                    self._writer.set_progress_handler(None, PROGRESS_INTERVAL)
+                    self._writer_cancellable = False
+
+    @contextmanager
+    def reader(self):
+        """Conexão somente leitura emprestada do pool"""
+        if self.in_memory:
+            with self.writer(cancellable=True) as conn:
+                yield conn
+            return
+
+        # O escritor cria o arquivo e ativa o WAL antes do primeiro leitor
+        if self._writer is None:
+            with self.writer():
+                pass
+
+        self._reader_slots.acquire()
+        try:
+            try:
+                conn = self._idle_readers.get_nowait()
+            except queue.Empty:
+                conn = self._open(read_only=True)
+
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle_readers.put(conn)
+        finally:
+            self._reader_slots.release()
+
+    def data_version(self):
+        """
+        Versão dos dados segundo PRAGMA data_version
+
+        Lida sempre na mesma conexão dedicada, então muda a cada commit
+        feito por qualquer outra conexão (o escritor do pool ou outro processo).
+        Não espera por escritas em andamento.
+        """
+        if self.in_memory:
+            return 0
+
+        # O escritor cria o arquivo antes do primeiro leitor
+        if self._writer is None:
+            with self.writer():
+                pass
+
+        with self._monitor_lock:
+            if self._monitor is None:
+                self._monitor = self._open(read_only=True)
+            return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        """Fecha todas as conexões abertas pelo pool"""
+        with self._writer_lock, self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.warning(f"Erro ao fechar conexão: {e}")
+
+            self._connections = []
+            self._writer = None
+            self._monitor = None
+            self._idle_readers = queue.LifoQueue()
+
+    def _open(self, read_only):
+        """Abre e configura uma nova conexão"""
+        timeout = self.busy_timeout_ms / 1000
+        if read_only:
+            uri = f"file:{quote(Path(self.db_path).resolve().as_posix())}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=timeout, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=timeout, check_same_thread=False)
+
+        self._configure(conn, read_only)
+
+        with self._connections_lock:
+            self._connections.append(conn)
+
+        logger.debug(f"Conexão {'leitura' if read_only else 'escrita'} aberta: {self.db_path}")
+        return conn
+
+    def _configure(self, conn, read_only):
+        """Aplica os PRAGMAs de desempenho"""
+        if not read_only and not self.in_memory:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_mb * 1024 ** 2)}")
+        # Valor negativo = tamanho em KiB
+        conn.execute(f"PRAGMA cache_size={-int(self.cache_mb * 1024)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            # Permite cancelar leituras longas (timeout/navegação no dashboard)
+            conn.set_progress_handler(_should_abort, PROGRESS_INTERVAL)
@@ -0,0 +1,191 @@
+# src/data/csv_sniffer.py
+"""
+Detecção de encoding e separador de arquivos CSV a partir de uma amostra
+"""
+
+import pandas as pd
+from pathlib import Path
+import codecs
+import csv
+import logging
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Bytes lidos do início do arquivo para a detecção
+SAMPLE_SIZE = 64 * 1024
+
+# Separadores considerados, em ordem de preferência
+DELIMITERS = [',', ';', '\t', '|']
+
+# Encoding a tentar se o parse falhar após a amostra (ex: byte inválido no fim do arquivo)
+FALLBACK_ENCODINGS = {'utf-8': 'cp1252', 'utf-8-sig': 'cp1252', 'cp1252': 'latin-1'}
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def read_sample(source, sample_size=SAMPLE_SIZE):
+    """
+    Lê os primeiros bytes de um caminho ou arquivo aberto
+
+    Args:
+        source: Caminho do arquivo ou objeto binário com read/seek
+        sample_size: Número máximo de bytes
+
+    Returns:
+        tuple: (bytes da amostra, True se a amostra contém o arquivo inteiro)
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            sample = f.read(sample_size + 1)
+    else:
+        position = source.tell()
+        sample = source.read(sample_size + 1)
+        source.seek(position)
+
+    return sample[:sample_size], len(sample) <= sample_size
+
+
+def detect_encoding(sample, complete=False):
+    """
+    Detecta o encoding de uma amostra de bytes
+
+    Args:
+        sample: Bytes do início do arquivo
+        complete: True se a amostra é o arquivo inteiro
+
+    Returns:
+        str: 'utf-8-sig', 'utf-16', 'utf-8', 'cp1252' ou 'latin-1'
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    # Decoder incremental tolera um caractere multibyte cortado no fim da amostra
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        # latin-1 decodifica qualquer byte
+        return 'latin-1'
+
+
+def detect_separator(text):
+    """
+    Detecta o separador de colunas de um trecho de texto CSV
+
+    Args:
+        text: Início do arquivo já decodificado
+
+    Returns:
+        str: Separador detectado (',' se não houver evidência)
+    """
+    lines = text.splitlines()
+    # A última linha pode estar cortada pela amostra
+    if len(lines) > 1:
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()][:50]
+    if not lines:
+        return ','
+
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters="".join(DELIMITERS)).delimiter
+    except csv.Error:
+        pass
+
+    # Alternativa: separador que aparece com mais frequência e de forma constante
+    best, best_score = ',', 0
+    for delimiter in DELIMITERS:
+        counts = [line.count(delimiter) for line in lines]
+        if counts[0] == 0:
+            continue
+        score = counts[0] * sum(1 for c in counts if c == counts[0])
+        if score > best_score:
+            best, best_score = delimiter, score
+
+    return best
+
+
+def sniff_csv_format(source, sample_size=SAMPLE_SIZE):
+    """
+    Detecta encoding e separador lendo uma única amostra limitada
+
+    Args:
+        source: Caminho do arquivo ou objeto binário com read/seek
+        sample_size: Número máximo de bytes lidos
+
+    Returns:
+        dict: {'encoding': ..., 'sep': ...}
+    """
+    sample, complete = read_sample(source, sample_size)
+    encoding = detect_encoding(sample, complete)
+    text = sample.decode(encoding, errors='ignore')
+    sep = detect_separator(text)
+
+    logger.info(f"Formato detectado: encoding={encoding}, sep={sep!r}")
+    return {'encoding': encoding, 'sep': sep}
+
+
+def resolve_csv_options(source, **kwargs):
+    """
+    Substitui encoding/sep 'auto' pelos valores detectados
+
+    Args:
+        source: Caminho do arquivo ou objeto binário com read/seek
+        **kwargs: Argumentos do pandas.read_csv
+
+    Returns:
+        dict: kwargs com encoding e sep resolvidos
+    """
+    if kwargs.get('encoding') != 'auto' and kwargs.get('sep') != 'auto':
+        return kwargs
+
+    detected = sniff_csv_format(source)
+    for option in ('encoding', 'sep'):
+        if kwargs.get(option) == 'auto':
+            kwargs[option] = detected[option]
+
+    return kwargs
+
+
+def read_csv_auto(source, **kwargs):
+    """
+    Lê um CSV detectando encoding/sep ('auto') a partir de uma amostra
+
+    O arquivo é lido uma vez; só há novo parse se o encoding detectado
+    falhar em um trecho posterior à amostra.
+
+    Args:
+        source: Caminho do arquivo ou objeto binário com read/seek
+        **kwargs: Argumentos do pandas.read_csv (encoding/sep podem ser 'auto')
+
+    Returns:
+        tuple: (DataFrame, dict com encoding e sep usados)
+    """
+    auto_encoding = kwargs.get('encoding') == 'auto'
+    kwargs = resolve_csv_options(source, **kwargs)
+
+    while True:
+        if not isinstance(source, (str, Path)):
+            source.seek(0)
+        try:
+            df = pd.read_csv(source, **kwargs)
+            break
+        except UnicodeDecodeError:
+            fallback = FALLBACK_ENCODINGS.get(kwargs.get('encoding'))
+            if not auto_encoding or fallback is None:
+                raise
+            logger.warning(f"Encoding {kwargs['encoding']} falhou; tentando {fallback}")
+            kwargs['encoding'] = fallback
+
+    return df, {'encoding': kwargs.get('encoding'), 'sep': kwargs.get('sep', ',')}
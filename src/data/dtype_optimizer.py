@@ -0,0 +1,117 @@
+# src/data/dtype_optimizer.py
+"""
+Redução do uso de memória de DataFrames por ajuste de tipos
+"""
+
+import pandas as pd
+import logging
+import warnings
+from pandas.tseries.api import guess_datetime_format
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Valores não nulos inspecionados por coluna para inferir datas
+SAMPLE_SIZE = 1000
+
+
+def memory_mb(df):
+    """Memória ocupada pelo DataFrame em MB (deep)"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def infer_datetime_format(sample):
+    """
+    Infere um formato de data que converte toda a amostra
+
+    Args:
+        sample: Series de strings não nulas
+
+    Returns:
+        str: Formato strftime ou None se a amostra não parece conter datas
+    """
+    if len(sample) == 0:
+        return None
+
+    first = str(sample.iloc[0]).strip()
+    # Números puros (IDs, anos soltos) não são tratados como datas
+    if not first or first.replace('.', '', 1).isdigit():
+        return None
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        candidates = [guess_datetime_format(first), guess_datetime_format(first, dayfirst=True)]
+
+        for fmt in dict.fromkeys(c for c in candidates if c):
+            parsed = pd.to_datetime(sample, format=fmt, errors='coerce')
+            if parsed.notna().all():
+                return fmt
+
+    return None
+
+
+def optimize_dtypes(df, category_threshold=0.5, parse_dates=True):
+    """
+    Reduz a memória do DataFrame logo após o parse
+
+    - Inteiros e floats são reduzidos ao menor tipo que preserva os valores
+    - Colunas object de baixa cardinalidade viram category
+    - Strings com cara de data são convertidas uma vez para datetime64
+
+    Args:
+        df: DataFrame
+        category_threshold: Razão máxima valores únicos / linhas para virar category
+        parse_dates: Se True, converte colunas de texto que parecem datas
+
+    Returns:
+        tuple: (DataFrame otimizado, relatório com memória antes/depois)
+    """
+    before = memory_mb(df)
+    df = df.copy()
+    changes = {}
+
+    for col in df.columns:
+        series = df[col]
+        old_dtype = str(series.dtype)
+
+        if pd.api.types.is_bool_dtype(series):
+            continue
+
+        if pd.api.types.is_integer_dtype(series):
+            # Sempre com sinal: evita que subtrações "dêem a volta" em tipos unsigned
+            df[col] = pd.to_numeric(series, downcast='integer')
+
+        elif pd.api.types.is_float_dtype(series):
+            reduced = series.astype('float32')
+            # Só reduz se todos os valores voltam idênticos para float64
+            if ((reduced.astype('float64') == series) | series.isna()).all():
+                df[col] = reduced
+
+        elif series.dtype == 'object':
+            non_null = series.dropna()
+            sample = non_null.head(SAMPLE_SIZE)
+            if len(sample) == 0 or not sample.map(lambda v: isinstance(v, str)).all():
+                continue
+
+            fmt = infer_datetime_format(sample) if parse_dates else None
+            if fmt:
+                parsed = pd.to_datetime(series, format=fmt, errors='coerce')
+                if parsed.notna().sum() == len(non_null):
+                    df[col] = parsed
+
+            if df[col].dtype == 'object' and non_null.nunique() <= category_threshold * len(series):
+                df[col] = series.astype('category')
+
+        if str(df[col].dtype) != old_dtype:
+            changes[col] = f"{old_dtype} -> {df[col].dtype}"
+
+    after = memory_mb(df)
+    report = {
+        'before_mb': round(float(before), 2),
+        'after_mb': round(float(after), 2),
+        'reduction_pct': round(float(1 - after / before) * 100, 1) if before else 0.0,
+        'changes': changes
+    }
+
+    logger.info(f"Tipos otimizados: {before:.2f} MB -> {after:.2f} MB ({len(changes)} colunas alteradas)")
+    return df, report
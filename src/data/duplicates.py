@@ -0,0 +1,359 @@
+# src/data/duplicates.py
+"""
+Detecção de linhas duplicadas por hash de linha
+
+Os hashes de 64 bits de cada linha são calculados uma vez (vetorizado,
+pd.util.hash_pandas_object) e reaproveitados por DataTransformer,
+ExploratoryAnalyzer e dashboard para o mesmo dataset.
+"""
+
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from loguru import logger
+from config.settings import Settings
+
+
+def _subset_key(subset):
+    if subset is None:
+        return None
+    return (subset,) if isinstance(subset, str) else tuple(subset)
+
+
+def row_hashes(df, subset=None):
+    """
+    Hash de 64 bits de cada linha (ignora o índice)
+
+    Colunas float/complex são normalizadas com + 0.0 antes do hash, para
+    que -0.0 e 0.0 (iguais para df.duplicated) tenham o mesmo hash.
+
+    Args:
+        df: DataFrame
+        subset: Colunas consideradas (padrão: todas)
+
+    Returns:
+        np.ndarray uint64 com um hash por linha
+    """
+    if subset is not None:
+        df = df[list(_subset_key(subset))]
+    signed = [i for i, dtype in enumerate(df.dtypes)
+              if pd.api.types.is_float_dtype(dtype) or pd.api.types.is_complex_dtype(dtype)]
+    if signed:
+        df = df.copy(deep=False)
+        for i in signed:
+            df.isetitem(i, df.iloc[:, i] + 0.0)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+class DuplicateDetector:
+    """
+    Duplicatas a partir de hashes de linha
+
+    Os hashes só servem para achar candidatas: linhas com hash repetido
+    são confirmadas com df.duplicated, então colisões de 64 bits nunca
+    descartam uma linha distinta. Os hashes só ficam em cache (LRU
+    limitado por memória) quando o chamador passa uma version explícita
+    do dataset; sem version eles são recalculados a cada chamada, já que
+    um DataFrame pode ser alterado in-place sem mudar de identidade.
+    """
+
+    def __init__(self, max_size_mb=None):
+        """
+        Args:
+            max_size_mb: Memória máxima dos hashes em cache (padrão: Settings.DUPLICATE_CACHE_MB)
+        """
+        self.max_bytes = (max_size_mb or Settings.DUPLICATE_CACHE_MB) * 1024 ** 2
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hashes(self, df, subset=None, version=None):
+        """
+        Hashes de linha do DataFrame, do cache quando há version
+
+        Args:
+            df: DataFrame
+            subset: Colunas consideradas (padrão: todas)
+            version: Versão do dataset; quem a informa garante que ela muda
+                a cada alteração dos dados (sem version não há cache)
+
+        Returns:
+            np.ndarray uint64, ou None se alguma coluna não for hashable
+                (ex: listas); nesse caso os métodos usam o pandas direto
+        """
+        key = (version, df.shape, _subset_key(subset))
+
+        if version is not None:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return cached
+                self.misses += 1
+
+        try:
+            hashes = row_hashes(df, subset)
+        except TypeError as e:
+            logger.debug(f"Hash de linhas indisponível ({e}); usando pandas")
+            return None
+
+        if version is not None and hashes.nbytes <= self.max_bytes:
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._size -= previous.nbytes
+                self._entries[key] = hashes
+                self._size += hashes.nbytes
+                while self._size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= evicted.nbytes
+        return hashes
+
+    def duplicated(self, df, subset=None, keep='first', version=None):
+        """Máscara booleana como df.duplicated(subset, keep)"""
+        hashes = self.hashes(df, subset, version)
+        if hashes is None:
+            return df.duplicated(subset=subset, keep=keep).to_numpy()
+
+        # Só linhas com hash repetido podem ser duplicatas; o pandas confirma
+        candidates = pd.Series(hashes).duplicated(keep=False).to_numpy()
+        mask = np.zeros(len(df), dtype=bool)
+        if candidates.any():
+            mask[candidates] = df[candidates].duplicated(subset=subset, keep=keep).to_numpy()
+        return mask
+
+    def count(self, df, subset=None, version=None):
+        """Número de linhas duplicadas (todas as ocorrências após a primeira)"""
+        return int(self.duplicated(df, subset, version=version).sum())
+
+    def drop(self, df, subset=None, keep='first', version=None):
+        """DataFrame sem as linhas duplicadas, como df.drop_duplicates"""
+        return df[~self.duplicated(df, subset, keep, version)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_detector():
+    """DuplicateDetector compartilhado pelo processo"""
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = DuplicateDetector()
+        return _detector
+
+
+class HashIndex:
+    """
+    Conjunto de hashes de linhas já vistas, para deduplicar entre chunks
+
+    Os hashes ficam em runs ordenados (arrays uint64); runs de tamanho
+    parecido são fundidos, então há O(log n) runs e cada consulta é uma
+    busca binária vetorizada por run. Quando os runs em memória passam
+    de memory_mb, são fundidos num arquivo .npy e consultados via memmap
+    (só as páginas tocadas pela busca binária são lidas).
+
+    No pickle os runs em disco entram só pelo caminho do arquivo: para
+    guardar o índice junto de outro estado, chame persist(diretório) antes.
+    """
+
+    def __init__(self, memory_mb=None, spill_dir=None):
+        """
+        Args:
+            memory_mb: Memória máxima dos runs (padrão: Settings.DUPLICATE_INDEX_MEMORY_MB)
+            spill_dir: Diretório dos arquivos temporários (padrão: o do sistema)
+        """
+        self.max_bytes = (memory_mb or Settings.DUPLICATE_INDEX_MEMORY_MB) * 1024 ** 2
+        self.spill_dir = spill_dir
+        self.runs = []
+        self.disk_runs = []
+        self._tmpdir = None
+        # Diretório permanente (ver persist): close() não apaga seus arquivos
+        self.directory = None
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs + self.disk_runs)
+
+    def __enter__(self):
+        return self
+
+    def __getstate__(self):
+        # Runs em disco vão pelo caminho, sem ler o conteúdo para a memória
+        state = self.__dict__.copy()
+        state['disk_runs'] = [run.filename for run in self.disk_runs]
+        state['_tmpdir'] = None
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault('directory', None)
+        self.__dict__.update(state)
+        self.disk_runs = [np.load(path, mmap_mode='r') for path in self.disk_runs]
+        if sum(run.nbytes for run in self.runs) > self.max_bytes:
+            self._spill()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def contains(self, hashes):
+        """Máscara booleana: True para hashes já presentes no índice"""
+        hashes = np.asarray(hashes, dtype='uint64')
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.disk_runs + self.runs:
+            positions = np.searchsorted(run, hashes)
+            positions[positions == len(run)] = 0
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes):
+        """Adiciona hashes ao índice"""
+        run = np.unique(np.asarray(hashes, dtype='uint64'))
+        if len(run) == 0:
+            return
+        while self.runs and len(self.runs[-1]) <= 2 * len(run):
+            run = np.union1d(self.runs.pop(), run)
+        self.runs.append(run)
+
+        if sum(r.nbytes for r in self.runs) > self.max_bytes:
+            self._spill()
+
+    def update(self, hashes):
+        """Adiciona só os hashes ainda ausentes (os runs ficam disjuntos e len() conta distintos)"""
+        hashes = np.unique(np.asarray(hashes, dtype='uint64'))
+        self.add(hashes[~self.contains(hashes)])
+
+    def merge(self, other):
+        """Adiciona os hashes de outro índice a este e fecha o outro"""
+        for run in other.disk_runs + other.runs:
+            self.update(np.asarray(run))
+        other.close()
+
+    def _spill(self):
+        """Funde os runs em memória num arquivo e passa a consultá-lo por memmap"""
+        merged = self.runs[0]
+        for run in self.runs[1:]:
+            merged = np.union1d(merged, run)
+        path = self._write_run(merged)
+        self.runs = []
+        logger.debug(f"HashIndex: {len(merged)} hashes gravados em disco ({path.name})")
+
+    def _run_dir(self):
+        if self.directory is not None:
+            return self.directory
+        if self._tmpdir is None:
+            self._tmpdir = Path(tempfile.mkdtemp(prefix='hash_index_', dir=self.spill_dir))
+        return self._tmpdir
+
+    def _new_path(self):
+        directory = self._run_dir()
+        number = len(self.disk_runs)
+        while (directory / f"run_{number}.npy").exists():
+            number += 1
+        return directory / f"run_{number}.npy"
+
+    def _write_run(self, run):
+        """Grava um run ordenado num arquivo novo e o anexa aos runs em disco"""
+        path = self._new_path()
+        np.save(path, run)
+        self.disk_runs.append(np.load(path, mmap_mode='r'))
+        return path
+
+    def persist(self, directory):
+        """
+        Move o índice para um diretório permanente
+
+        Runs em memória são gravados lá e runs temporários são copiados;
+        runs em disco pequenos são fundidos (cada arquivo resultante fica
+        até memory_mb), para o número de arquivos não crescer a cada
+        gravação. Arquivos de run do diretório que não pertencem ao índice
+        (de um perfil anterior) são removidos. Depois disso o pickle do
+        índice guarda só os caminhos.
+
+        Args:
+            directory: Diretório dos arquivos do índice
+        """
+        directory = Path(directory).resolve()
+        directory.mkdir(parents=True, exist_ok=True)
+        moved = self.directory != directory
+        self.directory = directory
+
+        runs, self.disk_runs = self.disk_runs, []
+        if moved:
+            for run in runs:
+                # Cópia em blocos: o run não passa pela memória
+                target = self._new_path()
+                shutil.copyfile(run.filename, target)
+                self.disk_runs.append(np.load(target, mmap_mode='r'))
+        else:
+            self.disk_runs = runs
+        if self.runs:
+            self._spill()
+        self._compact()
+
+        keep = {Path(run.filename).name for run in self.disk_runs}
+        for path in directory.glob("run_*.npy"):
+            if path.name not in keep:
+                _remove(path)
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def _compact(self):
+        """Funde os dois menores runs em disco enquanto o resultado couber em memory_mb"""
+        runs = sorted(self.disk_runs, key=len)
+        while len(runs) > 1 and runs[0].nbytes + runs[1].nbytes <= self.max_bytes:
+            first, second = runs.pop(0), runs.pop(0)
+            self.disk_runs = runs
+            merged = np.union1d(first, second)
+            paths = [first.filename, second.filename]
+            del first, second
+            self._write_run(merged)
+            for path in paths:
+                _remove(Path(path))
+            runs = sorted(self.disk_runs, key=len)
+        self.disk_runs = runs
+
+    def new_rows(self, df, subset=None):
+        """
+        Marca as linhas que ainda não foram vistas e registra seus hashes
+
+        A primeira ocorrência de cada linha (no chunk ou em chunks
+        anteriores) é mantida, como drop_duplicates(keep='first').
+
+        Returns:
+            np.ndarray booleano: True para as linhas a manter
+        """
+        hashes = row_hashes(df, subset)
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        keep &= ~self.contains(hashes)
+        self.add(hashes[keep])
+        return keep
+
+    def close(self):
+        """Remove os arquivos temporários (os de persist ficam)"""
+        self.runs = []
+        self.disk_runs = []
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+
+def _remove(path):
+    """Remove um arquivo de run; no Windows pode falhar se ainda estiver mapeado"""
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug(f"HashIndex: {path.name} não removido ({e})")
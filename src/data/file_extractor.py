@@ -7,7 +7,13 @@ import pandas as pd
 from pathlib import Path
 import logging
 import glob
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from config.settings import Settings
+from src.data.ingest_cache import IngestCache
+from src.data.csv_sniffer import read_csv_auto, resolve_csv_options
+from src.data.dtype_optimizer import optimize_dtypes
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -16,40 +22,155 @@ logger = logging.getLogger(__name__)
 class FileExtractor:
     """Extrai dados de arquivos locais"""
 
-    def __init__(self, data_dir=None):
+    def __init__(self, data_dir=None, use_cache=False, optimize_dtypes=False):
         """
         Inicializa o extrator com um diretório de dados
 
         Args:
             data_dir: Caminho para o diretório de dados (opcional)
+            use_cache: Se True, reaproveita cópias Parquet de arquivos já lidos
+            optimize_dtypes: Se True, reduz os tipos de dados logo após o parse
+                (downcast numérico, category e datas)
         """
         self.data_dir = Path(data_dir) if data_dir else Settings.RAW_DATA_DIR
+        self.cache = IngestCache() if use_cache else None
+        self.optimize_dtypes = optimize_dtypes
+        self.last_extraction_report = []
         logger.info(f"FileExtractor inicializado: {self.data_dir}")
 
-    def extract_csv(self, file_path, **kwargs):
+    def extract_csv(self, file_path, chunksize=None, memory_budget_mb=None, **kwargs):
         """
         Extrai dados de arquivo CSV
 
         Args:
             file_path: Caminho do arquivo CSV
+            chunksize: Linhas por chunk; se informado, ativa o modo streaming
+            memory_budget_mb: Memória alvo por chunk em MB; ativa o modo streaming
             **kwargs: Argumentos adicionais do pandas.read_csv
+                (encoding='auto' e sep='auto' detectam o formato por amostra)
 
         Returns:
-            DataFrame com os dados
+            DataFrame com os dados, ou gerador de DataFrames no modo streaming
         """
+        if chunksize or memory_budget_mb:
+            return self.iter_csv_chunks(file_path, chunksize=chunksize,
+                                        memory_budget_mb=memory_budget_mb, **kwargs)
+
         try:
-            path = Path(file_path)
-            if not path.exists():
-                path = self.data_dir / file_path
+            path = self._resolve_path(file_path)
 
-            logger.info(f"Lendo CSV: {path}")
-            df = pd.read_csv(path, **kwargs)
-            logger.info(f"Arquivo lido: {len(df)} linhas, {len(df.columns)} colunas")
-            return df
+            return self._read_csv(path, **kwargs)
         except Exception as e:
             logger.error(f"Erro ao ler CSV {file_path}: {e}")
             return pd.DataFrame()
 
+    def iter_csv_chunks(self, file_path, chunksize=None, memory_budget_mb=None, **kwargs):
+        """
+        Lê um CSV em chunks, sem carregar o arquivo inteiro na memória
+
+        Args:
+            file_path: Caminho do arquivo CSV
+            chunksize: Linhas por chunk (padrão: Settings.CSV_CHUNK_SIZE)
+            memory_budget_mb: Memória alvo por chunk em MB; usado para estimar
+                o chunksize quando este não é informado
+            **kwargs: Argumentos adicionais do pandas.read_csv
+
+        Yields:
+            DataFrame com cada chunk do arquivo
+
+        Raises:
+            Exception: Erro de leitura, mesmo no meio do arquivo (registrado e
+                repassado, para um arquivo truncado não parecer completo)
+        """
+        try:
+            path = self._resolve_path(file_path)
+            kwargs = resolve_csv_options(path, **kwargs)
+
+            if not chunksize:
+                if memory_budget_mb:
+                    chunksize = self._estimate_chunksize(path, memory_budget_mb, **kwargs)
+                else:
+                    chunksize = Settings.CSV_CHUNK_SIZE
+
+            logger.info(f"Lendo CSV em chunks de {chunksize:,} linhas: {path}")
+            total_rows = 0
+            n_chunks = 0
+            with pd.read_csv(path, chunksize=chunksize, **kwargs) as reader:
+                for chunk in reader:
+                    total_rows += len(chunk)
+                    n_chunks += 1
+                    yield chunk
+
+            logger.info(f"Arquivo lido: {total_rows} linhas em {n_chunks} chunks")
+        except Exception as e:
+            logger.error(f"Erro ao ler CSV {file_path} em chunks: {e}")
+            raise
+
+    def _read_csv(self, path, **kwargs):
+        """Lê um CSV inteiro; erros são propagados para quem chama"""
+        params = {'reader': 'csv', 'optimize_dtypes': self.optimize_dtypes, **kwargs}
+        df = self._from_cache(path, params)
+        if df is not None:
+            return df
+
+        logger.info(f"Lendo CSV: {path}")
+        df, _ = read_csv_auto(path, **kwargs)
+        logger.info(f"Arquivo lido: {len(df)} linhas, {len(df.columns)} colunas")
+        return self._to_cache(path, params, self._optimize(df))
+
+    def _read_excel(self, path, sheet_name=0, **kwargs):
+        """Lê uma planilha Excel; erros são propagados para quem chama"""
+        params = {'reader': 'excel', 'sheet_name': sheet_name, 'optimize_dtypes': self.optimize_dtypes, **kwargs}
+        df = self._from_cache(path, params)
+        if df is not None:
+            return df
+
+        logger.info(f"Lendo Excel: {path}, sheet: {sheet_name}")
+        df = pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+        logger.info(f"Arquivo lido: {len(df)} linhas, {len(df.columns)} colunas")
+        return self._to_cache(path, params, self._optimize(df))
+
+    def _optimize(self, df):
+        """Reduz os tipos de dados, se a opção estiver ativa"""
+        if not self.optimize_dtypes or not isinstance(df, pd.DataFrame):
+            return df
+
+        df, report = optimize_dtypes(df)
+        logger.info(f"Memória: {report['before_mb']} MB -> {report['after_mb']} MB "
+                    f"(-{report['reduction_pct']}%)")
+        return df
+
+    def _from_cache(self, path, params):
+        """Busca o arquivo no cache colunar, se ativo"""
+        if self.cache is None:
+            return None
+        return self.cache.get(path, params)
+
+    def _to_cache(self, path, params, df):
+        """Grava o arquivo no cache colunar, se ativo"""
+        if self.cache is not None and isinstance(df, pd.DataFrame):
+            self.cache.put(path, params, df)
+        return df
+
+    def _estimate_chunksize(self, path, memory_budget_mb, sample_rows=1000, **kwargs):
+        """Estima linhas por chunk a partir do uso de memória de uma amostra"""
+        kwargs.pop('nrows', None)
+        sample = pd.read_csv(path, nrows=sample_rows, **kwargs)
+        if sample.empty:
+            return Settings.CSV_CHUNK_SIZE
+
+        bytes_per_row = sample.memory_usage(deep=True).sum() / len(sample)
+        chunksize = max(1, int(memory_budget_mb * 1024 ** 2 / bytes_per_row))
+        logger.info(f"Chunksize estimado: {chunksize:,} linhas para {memory_budget_mb} MB")
+        return chunksize
+
+    def _resolve_path(self, file_path):
+        """Resolve o caminho relativo ao diretório de dados"""
+        path = Path(file_path)
+        if not path.exists():
+            path = self.data_dir / file_path
+        return path
+
     def extract_excel(self, file_path, sheet_name=0, **kwargs):
         """
         Extrai dados de arquivo Excel
@@ -63,14 +184,9 @@ class FileExtractor:
             DataFrame com os dados
         """
         try:
-            path = Path(file_path)
-            if not path.exists():
-                path = self.data_dir / file_path
+            path = self._resolve_path(file_path)
 
-            logger.info(f"Lendo Excel: {path}, sheet: {sheet_name}")
-            df = pd.read_excel(path, sheet_name=sheet_name, **kwargs)
-            logger.info(f"Arquivo lido: {len(df)} linhas, {len(df.columns)} colunas")
-            return df
+            return self._read_excel(path, sheet_name=sheet_name, **kwargs)
         except Exception as e:
             logger.error(f"Erro ao ler Excel {file_path}: {e}")
             return pd.DataFrame()
@@ -87,9 +203,7 @@ class FileExtractor:
             DataFrame com os dados
         """
         try:
-            path = Path(file_path)
-            if not path.exists():
-                path = self.data_dir / file_path
+            path = self._resolve_path(file_path)
 
             logger.info(f"Lendo JSON: {path}")
             df = pd.read_json(path, **kwargs)
@@ -114,36 +228,171 @@ class FileExtractor:
         logger.info(f"Arquivos encontrados com padrão '{pattern}': {len(files)}")
         return files
 
-    def extract_all_csv(self):
+    def extract_all_csv(self, parallel=False, max_workers=None, timeout=None):
         """
         Extrai todos os arquivos CSV do diretório
 
+        Args:
+            parallel: Se True, lê os arquivos em paralelo com um pool de processos
+            max_workers: Número de processos (padrão: Settings.EXTRACT_WORKERS)
+            timeout: Tempo máximo em segundos por arquivo no modo paralelo
+                (padrão: Settings.EXTRACT_FILE_TIMEOUT_SECONDS)
+
         Returns:
             Dicionário com nome do arquivo: DataFrame
         """
         csv_files = self.find_files("*.csv")
-        dataframes = {}
-
-        for csv_file in csv_files:
-            name = Path(csv_file).stem
-            dataframes[name] = self.extract_csv(csv_file)
+        dataframes = self._extract_many('csv', csv_files, parallel, max_workers, timeout)
 
         logger.info(f"Extraídos {len(dataframes)} arquivos CSV")
         return dataframes
 
-    def extract_all_excel(self):
+    def extract_all_excel(self, parallel=False, max_workers=None, timeout=None):
         """
         Extrai todos os arquivos Excel do diretório
 
+        Args:
+            parallel: Se True, lê os arquivos em paralelo com um pool de processos
+            max_workers: Número de processos (padrão: Settings.EXTRACT_WORKERS)
+            timeout: Tempo máximo em segundos por arquivo no modo paralelo
+                (padrão: Settings.EXTRACT_FILE_TIMEOUT_SECONDS)
+
         Returns:
             Dicionário com nome do arquivo: DataFrame
         """
         excel_files = self.find_files("*.xlsx") + self.find_files("*.xls")
+        dataframes = self._extract_many('excel', excel_files, parallel, max_workers, timeout)
+
+        logger.info(f"Extraídos {len(dataframes)} arquivos Excel")
+        return dataframes
+
+    def _extract_many(self, kind, files, parallel=False, max_workers=None, timeout=None):
+        """
+        Lê vários arquivos, em sequência ou em um pool de processos
+
+        O resultado por arquivo (linhas, tempo e erro) fica em
+        self.last_extraction_report. Arquivos com erro ou que estouram o
+        timeout (por arquivo, só no modo paralelo) entram no dicionário
+        como DataFrame vazio.
+        """
+        results = {}
+
+        if parallel and len(files) > 1:
+            workers = min(max_workers or Settings.EXTRACT_WORKERS, len(files))
+            timeout = timeout or Settings.EXTRACT_FILE_TIMEOUT_SECONDS
+            logger.info(f"Extraindo {len(files)} arquivos com {workers} processos")
+
+            pending = list(files)
+            while pending:
+                pending = self._run_pool(kind, pending, workers, timeout, results)
+        else:
+            for file_path in files:
+                results[file_path] = _timed_extract(self, kind, file_path)
+
         dataframes = {}
+        self.last_extraction_report = []
+        for file_path in files:
+            result = results[file_path]
+            dataframes[Path(file_path).stem] = result.pop('df')
+            self.last_extraction_report.append(result)
 
-        for excel_file in excel_files:
-            name = Path(excel_file).stem
-            dataframes[name] = self.extract_excel(excel_file)
+            if result['error']:
+                logger.error(f"Erro ao ler {file_path}: {result['error']}")
+            else:
+                logger.info(f"{Path(file_path).name}: {result['rows']} linhas em {result['seconds']:.2f}s")
 
-        logger.info(f"Extraídos {len(dataframes)} arquivos Excel")
-        return dataframes
\ No newline at end of file
+        return dataframes
+
+    def _run_pool(self, kind, files, workers, timeout, results):
+        """
+        Lê arquivos num pool de processos, cada um com prazo próprio
+
+        No máximo workers arquivos são enviados por vez, então cada um
+        começa a rodar ao ser enviado e o prazo conta a partir daí. Um
+        processo preso não pode ser interrompido sozinho: quando um
+        arquivo estoura o prazo, o pool inteiro é encerrado (processos
+        terminados) e os arquivos ainda em andamento voltam para a fila.
+
+        Returns:
+            list: Arquivos a ler num pool novo (vazia quando todos terminaram)
+        """
+        queue = list(files)
+        running = {}
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            while queue or running:
+                while queue and len(running) < workers:
+                    future = executor.submit(_timed_extract, self, kind, queue[0])
+                    running[future] = (queue.pop(0), time.monotonic() + timeout)
+
+                nearest = min(deadline for _, deadline in running.values())
+                done, _ = wait(running, timeout=max(0, nearest - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, _ = running.pop(future)
+                    try:
+                        results[file_path] = future.result()
+                    except Exception as e:
+                        results[file_path] = _failed_result(file_path, e)
+
+                expired = [f for f, (_, deadline) in running.items() if deadline <= time.monotonic()]
+                for future in expired:
+                    file_path, _ = running.pop(future)
+                    results[file_path] = _failed_result(file_path, f"timeout após {timeout}s")
+                if expired:
+                    _terminate(executor)
+                    return [file_path for file_path, _ in running.values()] + queue
+        except BrokenProcessPool as e:
+            # Um processo morreu (ex.: falta de memória): o pool não aceita mais arquivos
+            for file_path in [file_path for file_path, _ in running.values()] + queue:
+                results[file_path] = _failed_result(file_path, e)
+            _terminate(executor)
+            return []
+
+        executor.shutdown()
+        return []
+
+
+def _terminate(executor):
+    """Encerra o pool sem esperar: processos presos em arquivos lentos são terminados"""
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout=5)
+
+
+def _timed_extract(extractor, kind, file_path):
+    """Lê um arquivo medindo o tempo; executado também nos processos do pool"""
+    start = time.perf_counter()
+    try:
+        path = extractor._resolve_path(file_path)
+        if kind == 'csv':
+            df = extractor._read_csv(path)
+        else:
+            df = extractor._read_excel(path)
+        error = None
+    except Exception as e:
+        df = pd.DataFrame()
+        error = str(e)
+
+    return {
+        'file': str(file_path),
+        'df': df,
+        'rows': len(df),
+        'seconds': time.perf_counter() - start,
+        'error': error
+    }
+
+
+def _failed_result(file_path, error):
+    """Resultado de um arquivo que não pôde ser lido"""
+    return {
+        'file': str(file_path),
+        'df': pd.DataFrame(),
+        'rows': 0,
+        'seconds': None,
+        'error': str(error)
+    }
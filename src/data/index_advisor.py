@@ -0,0 +1,160 @@
+# src/data/index_advisor.py
+"""
+Registro de uso de colunas em queries e sugestão de índices para o SQLite
+"""
+
+import re
+import threading
+import logging
+from collections import Counter
+from config.settings import Settings
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Literais de texto são removidos antes de procurar colunas
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+# Cláusulas que delimitam os trechos analisados
+CLAUSE = re.compile(r"\b(FROM|JOIN|WHERE|ON|GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT|UNION)\b", re.IGNORECASE)
+
+# Identificadores entre aspas duplas, colchetes, crases ou simples
+IDENTIFIER = re.compile(r'"((?:[^"]|"")+)"|\[([^\]]+)\]|`([^`]+)`|\b([A-Za-z_]\w*)\b')
+
+# Tipo de uso registrado por cláusula
+USAGE_KIND = {'WHERE': 'filter', 'ON': 'filter', 'GROUP BY': 'group', 'ORDER BY': 'sort'}
+
+
+def _identifiers(text):
+    """Lista os identificadores de um trecho SQL"""
+    names = []
+    for match in IDENTIFIER.finditer(text):
+        quoted, bracketed, backticked, plain = match.groups()
+        names.append((quoted or "").replace('""', '"') or bracketed or backticked or plain)
+    return names
+
+
+def parse_query_columns(sql):
+    """
+    Extrai tabelas e colunas usadas em filtros, agrupamentos e ordenações
+
+    Análise léxica simples (sem parser SQL completo): os identificadores
+    de cada cláusula são candidatos a coluna e devem ser conferidos contra
+    as colunas reais das tabelas.
+
+    Returns:
+        tuple: (lista de tabelas, lista de (identificador, tipo de uso))
+    """
+    parts = CLAUSE.split(STRING_LITERAL.sub("''", sql))
+    tables = []
+    usages = []
+    for i in range(1, len(parts) - 1, 2):
+        keyword = " ".join(parts[i].upper().split())
+        text = parts[i + 1]
+        if keyword in ('FROM', 'JOIN'):
+            # Só o primeiro identificador de cada item é o nome da tabela
+            for item in text.split(','):
+                names = _identifiers(item)
+                if names and names[0].upper() != 'SELECT':
+                    tables.append(names[0])
+        elif keyword in USAGE_KIND:
+            usages.extend((name, USAGE_KIND[keyword]) for name in _identifiers(text))
+    return tables, usages
+
+
+class IndexAdvisor:
+    """
+    Conta quantas vezes cada coluna aparece em WHERE/ON, GROUP BY e ORDER BY
+
+    Colunas muito usadas e que ainda não são a primeira coluna de um
+    índice viram sugestões de índice.
+    """
+
+    def __init__(self, min_uses=None):
+        """
+        Inicializa o registro
+
+        Args:
+            min_uses: Usos mínimos para sugerir um índice (padrão: Settings.INDEX_ADVISOR_MIN_USES)
+        """
+        self.min_uses = min_uses or Settings.INDEX_ADVISOR_MIN_USES
+        self._usage = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, table_name, column, kind):
+        """Registra um uso de coluna ('filter', 'group' ou 'sort')"""
+        with self._lock:
+            self._usage[(table_name, column, kind)] += 1
+
+    def record_query(self, sql, table_columns):
+        """
+        Registra as colunas usadas por uma query
+
+        Args:
+            sql: Texto da query
+            table_columns: Função que recebe o nome da tabela e retorna suas colunas
+        """
+        try:
+            tables, usages = parse_query_columns(sql)
+            columns = {table: set(table_columns(table)) for table in set(tables)}
+        except Exception as e:
+            logger.debug(f"Query não analisada pelo advisor: {e}")
+            return
+
+        for name, kind in usages:
+            for table, table_cols in columns.items():
+                if name in table_cols:
+                    self.record(table, name, kind)
+
+    def usage(self, table_name=None):
+        """
+        Usos registrados
+
+        Returns:
+            list: dicts com table, column, filter, group, sort e total
+        """
+        with self._lock:
+            items = list(self._usage.items())
+
+        summary = {}
+        for (table, column, kind), count in items:
+            if table_name is not None and table != table_name:
+                continue
+            entry = summary.setdefault((table, column), {
+                'table': table, 'column': column, 'filter': 0, 'group': 0, 'sort': 0, 'total': 0
+            })
+            entry[kind] += count
+            entry['total'] += count
+        return sorted(summary.values(), key=lambda e: e['total'], reverse=True)
+
+    def suggest(self, indexed_columns, table_name=None):
+        """
+        Sugere índices para as colunas mais usadas
+
+        Args:
+            indexed_columns: Dict {tabela: conjunto de colunas que já iniciam um índice}
+            table_name: Restringe a uma tabela
+
+        Returns:
+            list: dicts com table, column, uses e reason, do mais usado ao menos usado
+        """
+        suggestions = []
+        for entry in self.usage(table_name):
+            if entry['total'] < self.min_uses:
+                continue
+            if entry['column'] in indexed_columns.get(entry['table'], set()):
+                continue
+            reasons = [f"{kind} x{entry[kind]}" for kind in ('filter', 'group', 'sort') if entry[kind]]
+            suggestions.append({
+                'table': entry['table'],
+                'column': entry['column'],
+                'uses': entry['total'],
+                'reason': ", ".join(reasons)
+            })
+        return suggestions
+
+    def forget_table(self, table_name):
+        """Descarta os usos de uma tabela (ex.: tabela removida)"""
+        with self._lock:
+            for key in [k for k in self._usage if k[0] == table_name]:
+                del self._usage[key]
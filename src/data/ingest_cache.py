@@ -0,0 +1,141 @@
+# src/data/ingest_cache.py
+"""
+Cache colunar (Parquet) de arquivos já lidos pelo FileExtractor
+"""
+
+import pandas as pd
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+from config.settings import Settings
+
+# Parquet depende do pyarrow (opcional)
+try:
+    import pyarrow  # noqa: F401
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+
+class IngestCache:
+    """
+    Guarda uma cópia Parquet de cada arquivo lido
+
+    A chave combina caminho, tamanho, mtime do arquivo de origem e os
+    parâmetros de leitura, então qualquer alteração no arquivo gera um
+    novo parse. O tamanho total em disco é limitado com descarte LRU.
+    """
+
+    def __init__(self, cache_dir=None, max_size_mb=None):
+        """
+        Inicializa o cache
+
+        Args:
+            cache_dir: Diretório do cache (padrão: Settings.INGEST_CACHE_DIR)
+            max_size_mb: Tamanho máximo em disco (padrão: Settings.INGEST_CACHE_MAX_MB)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Settings.INGEST_CACHE_DIR
+        self.max_size_mb = max_size_mb or Settings.INGEST_CACHE_MAX_MB
+        self.enabled = PYARROW_AVAILABLE
+
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(f"IngestCache inicializado: {self.cache_dir} ({self.max_size_mb} MB)")
+        else:
+            logger.warning("pyarrow não instalado: cache de ingestão desativado")
+
+    def get(self, path, params=None):
+        """
+        Busca a cópia colunar de um arquivo
+
+        Args:
+            path: Caminho do arquivo de origem
+            params: Parâmetros de leitura usados no parse
+
+        Returns:
+            DataFrame em cache ou None
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            cache_file = self._cache_file(path, params)
+            if not cache_file.exists():
+                return None
+
+            df = pd.read_parquet(cache_file)
+            # Atualiza o mtime para o descarte LRU
+            os.utime(cache_file)
+            logger.info(f"Cache hit: {path}")
+            return df
+        except Exception as e:
+            logger.warning(f"Erro ao ler cache de {path}: {e}")
+            return None
+
+    def put(self, path, params, df):
+        """
+        Grava a cópia colunar de um arquivo
+
+        Args:
+            path: Caminho do arquivo de origem
+            params: Parâmetros de leitura usados no parse
+            df: DataFrame lido
+
+        Returns:
+            bool: True se gravou, False caso contrário
+        """
+        if not self.enabled:
+            return False
+
+        try:
+            cache_file = self._cache_file(path, params)
+            tmp_file = cache_file.with_suffix('.tmp')
+            df.to_parquet(tmp_file)
+            os.replace(tmp_file, cache_file)
+            logger.info(f"Cache gravado: {path} -> {cache_file.name}")
+        except Exception as e:
+            logger.warning(f"Erro ao gravar cache de {path}: {e}")
+            return False
+
+        self._evict()
+        return True
+
+    def size_mb(self):
+        """Tamanho atual do cache em MB"""
+        return sum(f.stat().st_size for f in self.cache_dir.glob("*.parquet")) / 1024 ** 2
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        for cache_file in self.cache_dir.glob("*.parquet"):
+            cache_file.unlink(missing_ok=True)
+        logger.info("Cache de ingestão limpo")
+
+    def _cache_file(self, path, params):
+        """Caminho da entrada de cache para o arquivo e parâmetros"""
+        path = Path(path).resolve()
+        stat = path.stat()
+        raw = json.dumps([str(path), stat.st_size, stat.st_mtime_ns, params or {}],
+                         sort_keys=True, default=str)
+        key = hashlib.sha1(raw.encode()).hexdigest()
+        return self.cache_dir / f"{key}.parquet"
+
+    def _evict(self):
+        """Remove as entradas menos usadas até caber no limite"""
+        entries = sorted(
+            (f.stat().st_mtime, f.stat().st_size, f) for f in self.cache_dir.glob("*.parquet")
+        )
+        total = sum(size for _, size, _ in entries)
+        limit = self.max_size_mb * 1024 ** 2
+
+        for _, size, cache_file in entries:
+            if total <= limit:
+                break
+            cache_file.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Cache descartado (LRU): {cache_file.name}")
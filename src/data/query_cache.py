@@ -0,0 +1,123 @@
+# src/data/query_cache.py
+"""
+Cache de resultados de queries do SQLiteManager
+"""
+
+import threading
+import re
+import logging
+from collections import OrderedDict
+from config.settings import Settings
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Trechos entre aspas não são normalizados (o conteúdo é significativo)
+QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+
+def normalize_sql(query):
+    """Remove espaços redundantes e o ';' final, preservando literais"""
+    parts = QUOTED.split(query.strip().rstrip(';').strip())
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\s+", " ", parts[i])
+    return "".join(parts)
+
+
+def _freeze(params):
+    """Converte parâmetros em algo hashable para compor a chave"""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in params.items()))
+    if isinstance(params, (list, tuple)):
+        return tuple(_freeze(v) for v in params)
+    return params
+
+
+class QueryCache:
+    """
+    Cache LRU de DataFrames limitado por memória
+
+    Cada entrada guarda a versão do banco em que foi calculada; se a
+    versão atual for outra, a entrada é descartada na leitura.
+    """
+
+    def __init__(self, max_size_mb=None):
+        """
+        Inicializa o cache
+
+        Args:
+            max_size_mb: Memória máxima das entradas (padrão: Settings.QUERY_CACHE_MB)
+        """
+        self.max_bytes = (max_size_mb or Settings.QUERY_CACHE_MB) * 1024 ** 2
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query, params=None):
+        """Chave a partir do SQL normalizado e dos parâmetros"""
+        return normalize_sql(query), _freeze(params)
+
+    def get(self, key, version):
+        """
+        Busca um resultado válido para a versão atual do banco
+
+        Returns:
+            DataFrame em cache ou None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, df):
+        """Guarda um resultado, descartando os menos usados se preciso"""
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            logger.debug(f"Resultado grande demais para o cache ({size / 1024 ** 2:.1f} MB)")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (version, df, size)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Entradas, memória usada e taxa de acerto"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'size_mb': round(self._size / 1024 ** 2, 2),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+    def _remove(self, key):
+        """Remove uma entrada (chamado com o lock adquirido)"""
+        _, _, size = self._entries.pop(key)
+        self._size -= size
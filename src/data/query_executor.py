@@ -0,0 +1,185 @@
+# src/data/query_executor.py
+"""
+Execução concorrente de queries do SQLiteManager com prazo e cancelamento
+"""
+
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from config.settings import Settings
+from src.data.connection_pool import CancelToken, cancel_scope
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+
+class QueryCancelled(Exception):
+    """A query foi cancelada ou excedeu o prazo"""
+
+
+class QueryBatch:
+    """
+    Conjunto de queries independentes disparadas juntas
+
+    Cada query roda numa thread do executor, com sua própria conexão de
+    leitura do pool. cancel() interrompe as que ainda estão rodando.
+    """
+
+    def __init__(self, executor, timeout=None):
+        self._executor = executor
+        self.timeout = Settings.QUERY_TIMEOUT_SECONDS if timeout is None else timeout
+        self._futures = {}
+        self._tokens = {}
+
+    def submit(self, name, func, *args, **kwargs):
+        """
+        Agenda func(*args, **kwargs) sob o nome dado
+
+        Args:
+            name: Chave do resultado em results()
+            func: Normalmente um método do SQLiteManager (sql_to_df, fetch_page...)
+
+        Returns:
+            QueryBatch: o próprio lote, para encadear chamadas
+        """
+        token = CancelToken(self.timeout)
+        self._tokens[name] = token
+        self._futures[name] = self._executor.submit_with_token(token, func, *args, **kwargs)
+        return self
+
+    def results(self, timeout=None):
+        """
+        Espera as queries e retorna os resultados
+
+        Args:
+            timeout: Espera máxima em segundos (padrão: o prazo do lote)
+
+        Returns:
+            dict: {nome: resultado}; None para queries que falharam,
+                estouraram o prazo ou foram canceladas
+        """
+        done, _ = wait(self._futures.values(), timeout=timeout or self.timeout or None)
+        results = {}
+        for name, future in self._futures.items():
+            if future not in done:
+                self._tokens[name].cancel()
+                logger.warning(f"Query '{name}' excedeu {self.timeout}s e foi cancelada")
+                results[name] = None
+            elif future.cancelled() or isinstance(future.exception(), QueryCancelled):
+                logger.warning(f"Query '{name}' cancelada")
+                results[name] = None
+            elif future.exception() is not None:
+                logger.error(f"Erro na query '{name}': {future.exception()}")
+                results[name] = None
+            else:
+                results[name] = future.result()
+        return results
+
+    def cancel(self):
+        """Cancela as queries pendentes e interrompe as que estão rodando"""
+        for name, future in self._futures.items():
+            self._tokens[name].cancel()
+            future.cancel()
+
+    def done(self):
+        return all(future.done() for future in self._futures.values())
+
+
+class QueryExecutor:
+    """
+    Executor de queries em threads para o dashboard
+
+    Queries independentes (contagem, página, estatísticas) rodam em
+    paralelo nas conexões de leitura do pool, em vez de uma depois da
+    outra. Cada query tem prazo próprio; ao vencer (ou em cancel()), a
+    leitura é abortada dentro do SQLite pelo progress handler dos leitores.
+    """
+
+    def __init__(self, max_workers=None):
+        """
+        Inicializa o executor
+
+        Args:
+            max_workers: Threads (padrão: Settings.QUERY_EXECUTOR_WORKERS)
+        """
+        self.max_workers = max_workers or Settings.QUERY_EXECUTOR_WORKERS
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="query")
+        self._lock = threading.Lock()
+
+    def batch(self, timeout=None):
+        """Cria um lote de queries (prazo padrão: Settings.QUERY_TIMEOUT_SECONDS)"""
+        return QueryBatch(self, timeout)
+
+    def submit(self, func, *args, timeout=None, **kwargs):
+        """
+        Agenda uma única chamada
+
+        Returns:
+            tuple: (Future, CancelToken)
+        """
+        token = CancelToken(Settings.QUERY_TIMEOUT_SECONDS if timeout is None else timeout)
+        return self.submit_with_token(token, func, *args, **kwargs), token
+
+    def submit_with_token(self, token, func, *args, **kwargs):
+        """
+        Agenda func na thread pool com o token ativo durante a execução
+
+        Os métodos do SQLiteManager devolvem resultado vazio quando a
+        leitura é interrompida; por isso o token é conferido ao final e,
+        se cancelado, o Future termina com QueryCancelled.
+        """
+        def run():
+            if token.cancelled():
+                raise QueryCancelled()
+            with cancel_scope(token):
+                result = func(*args, **kwargs)
+            if token.cancelled():
+                raise QueryCancelled()
+            return result
+
+        with self._lock:
+            return self._pool.submit(run)
+
+    async def run_async(self, func, *args, timeout=None, **kwargs):
+        """
+        Versão asyncio: aguarda func sem bloquear o event loop
+
+        Raises:
+            asyncio.TimeoutError: Se o prazo vencer (a query é interrompida)
+            QueryCancelled: Se o token for cancelado antes do fim
+        """
+        timeout = Settings.QUERY_TIMEOUT_SECONDS if timeout is None else timeout
+        future, token = self.submit(func, *args, timeout=timeout, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or None)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            token.cancel()
+            raise
+
+    async def gather_async(self, calls, timeout=None):
+        """
+        Executa várias chamadas concorrentes
+
+        Args:
+            calls: Dict {nome: (func, args, kwargs)}
+
+        Returns:
+            dict: {nome: resultado ou None em caso de erro/timeout}
+        """
+        names = list(calls)
+        outcomes = await asyncio.gather(
+            *(self.run_async(func, *args, timeout=timeout, **kwargs) for func, args, kwargs in calls.values()),
+            return_exceptions=True
+        )
+        results = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"Query '{name}' falhou: {outcome!r}")
+                outcome = None
+            results[name] = outcome
+        return results
+
+    def shutdown(self):
+        """Encerra as threads (queries pendentes são descartadas)"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
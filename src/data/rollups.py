@@ -0,0 +1,245 @@
+# src/data/rollups.py
+"""
+Tabelas de agregação por período (rollups) para séries temporais no SQLite
+"""
+
+import json
+import logging
+from src.data.table_catalog import NUMERIC_TYPES
+from src.utils.sql import quote_identifier
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+REGISTRY_TABLE = "__rollups"
+DELTA_TABLE = "__rollup_delta"
+
+# Rótulo do período a partir do dia (YYYY-MM-DD); semanas começam na segunda-feira
+GRAINS = {
+    'day': "day",
+    'week': "date(day, '-' || ((CAST(strftime('%w', day) AS INTEGER) + 6) % 7) || ' days')",
+    'month': "strftime('%Y-%m', day)",
+    'quarter': "strftime('%Y', day) || 'Q' || ((CAST(strftime('%m', day) AS INTEGER) + 2) / 3)",
+    'year': "CAST(strftime('%Y', day) AS INTEGER)"
+}
+
+METRICS = ('sum', 'count', 'min', 'max')
+
+
+def rollup_table_name(table_name, grain):
+    """Nome da tabela de rollup de uma tabela e granularidade"""
+    return f"__rollup_{table_name}_{grain}"
+
+
+def metric_column(column, metric):
+    """Nome da coluna de uma métrica no rollup (ex.: valor__sum)"""
+    return f"{column}__{metric}"
+
+
+class RollupManager:
+    """
+    Mantém rollups dia/semana/mês/trimestre/ano de uma tabela com coluna de data
+
+    Cada rollup guarda, por período, a contagem de linhas e soma, contagem,
+    mínimo e máximo de cada coluna numérica. O registro (__rollups) guarda
+    o maior rowid já agregado e quantas linhas foram agregadas: inserções
+    novas entram por UPSERT somando só as linhas acima dele, com uma única
+    leitura da tabela base (os dias novos são agregados numa tabela
+    temporária e dela saem as demais granularidades). Se as linhas acima
+    do rowid não somam as linhas inseridas (ids explícitos abaixo dele),
+    os rollups são recriados. Alterações que não são inserções puras
+    (UPDATE, DELETE, REPLACE, UPSERT) exigem rebuild.
+    Os métodos não fazem commit; isso fica com quem chama.
+    """
+
+    def ensure(self, conn):
+        """Cria a tabela de registro se não existir"""
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote_identifier(REGISTRY_TABLE)} ("
+            "table_name TEXT PRIMARY KEY, date_column TEXT NOT NULL, "
+            "value_columns TEXT NOT NULL, last_rowid INTEGER NOT NULL, row_count INTEGER)"
+        )
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(REGISTRY_TABLE)})")]
+        if 'row_count' not in columns:
+            # Registro antigo: contagem desconhecida (NULL) até o próximo rebuild
+            conn.execute(f"ALTER TABLE {quote_identifier(REGISTRY_TABLE)} ADD COLUMN row_count INTEGER")
+
+    def get(self, conn, table_name):
+        """
+        Registro de rollups de uma tabela
+
+        Returns:
+            dict com table, date_column, value_columns, last_rowid e
+                row_count (linhas agregadas; None se desconhecida), ou None
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (REGISTRY_TABLE,)
+        ).fetchone()
+        if not exists:
+            return None
+        cursor = conn.execute(f"SELECT * FROM {quote_identifier(REGISTRY_TABLE)} WHERE table_name=?", (table_name,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        # Registros antigos não têm row_count (ver ensure)
+        row = dict(zip([d[0] for d in cursor.description], row))
+        return {'table': table_name, 'date_column': row['date_column'],
+                'value_columns': json.loads(row['value_columns']),
+                'last_rowid': row['last_rowid'], 'row_count': row.get('row_count')}
+
+    def list(self, conn):
+        """Lista os registros de rollup"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (REGISTRY_TABLE,)
+        ).fetchone()
+        if not exists:
+            return []
+        rows = conn.execute(f"SELECT table_name FROM {quote_identifier(REGISTRY_TABLE)} ORDER BY table_name").fetchall()
+        return [self.get(conn, row[0]) for row in rows]
+
+    def build(self, conn, table_name, date_column):
+        """
+        Cria (ou recria) os rollups de uma tabela a partir de todas as linhas
+
+        Colunas numéricas são as de tipo declarado inteiro/real, exceto a de data.
+        """
+        info = conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})").fetchall()
+        columns = {row[1]: (row[2] or "").upper() for row in info}
+        if date_column not in columns:
+            raise ValueError(f"Coluna '{date_column}' não existe em '{table_name}'")
+        value_columns = [name for name, declared in columns.items()
+                         if name != date_column and any(t in declared for t in NUMERIC_TYPES)]
+
+        self.ensure(conn)
+        self._drop_tables(conn, table_name)
+        for grain in GRAINS:
+            definitions = ["period PRIMARY KEY", "row_count INTEGER NOT NULL"]
+            definitions += [f"{quote_identifier(metric_column(col, metric))} "
+                            f"{'INTEGER' if metric == 'count' else 'REAL'}"
+                            for col in value_columns for metric in METRICS]
+            conn.execute(f"CREATE TABLE {quote_identifier(rollup_table_name(table_name, grain))} ({', '.join(definitions)})")
+
+        conn.execute(
+            f"INSERT OR REPLACE INTO {quote_identifier(REGISTRY_TABLE)} VALUES (?, ?, ?, 0, 0)",
+            (table_name, date_column, json.dumps(value_columns))
+        )
+        self.update(conn, table_name)
+
+    def rebuild(self, conn, table_name):
+        """Recria os rollups de uma tabela registrada (após UPDATE/DELETE/substituição)"""
+        registry = self.get(conn, table_name)
+        if registry is None:
+            return
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})")]
+        if registry['date_column'] not in columns:
+            logger.warning(f"Rollups de '{table_name}' removidos: coluna '{registry['date_column']}' não existe mais")
+            self.drop(conn, table_name)
+            return
+        self.build(conn, table_name, registry['date_column'])
+
+    def update(self, conn, table_name, inserted=None):
+        """
+        Agrega as linhas inseridas desde a última atualização
+
+        Args:
+            conn: Conexão de escrita
+            table_name: Tabela base
+            inserted: Linhas inseridas desde a última atualização; se as
+                linhas acima de last_rowid não somam isso, recria os rollups
+
+        Returns:
+            bool: True se havia linhas novas
+        """
+        registry = self.get(conn, table_name)
+        if registry is None:
+            return False
+
+        max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {quote_identifier(table_name)}").fetchone()[0] or 0
+        added = conn.execute(
+            f"SELECT COUNT(*) FROM {quote_identifier(table_name)} WHERE rowid > ? AND rowid <= ?",
+            (registry['last_rowid'], max_rowid)
+        ).fetchone()[0]
+        if registry['row_count'] is None or (inserted is not None and added != inserted):
+            logger.debug(f"Rollups de '{table_name}': {added} linhas acima do rowid "
+                         f"{registry['last_rowid']}, {inserted} inseridas; recriando")
+            self.rebuild(conn, table_name)
+            return True
+        if not added:
+            return False
+
+        date_col = quote_identifier(registry['date_column'])
+        value_columns = registry['value_columns']
+
+        # Dias novos, numa única leitura das linhas acima de last_rowid
+        select = [f"date({date_col}) AS day", "COUNT(*) AS row_count"]
+        for col in value_columns:
+            q = quote_identifier(col)
+            select += [f"TOTAL({q}) AS {quote_identifier(metric_column(col, 'sum'))}",
+                       f"COUNT({q}) AS {quote_identifier(metric_column(col, 'count'))}",
+                       f"MIN({q}) AS {quote_identifier(metric_column(col, 'min'))}",
+                       f"MAX({q}) AS {quote_identifier(metric_column(col, 'max'))}"]
+        conn.execute(f"DROP TABLE IF EXISTS temp.{quote_identifier(DELTA_TABLE)}")
+        conn.execute(
+            f"CREATE TEMP TABLE {quote_identifier(DELTA_TABLE)} AS SELECT {', '.join(select)} "
+            f"FROM {quote_identifier(table_name)} WHERE rowid > ? AND rowid <= ? AND date({date_col}) IS NOT NULL GROUP BY day",
+            (registry['last_rowid'], max_rowid)
+        )
+
+        # Cada granularidade sai dos dias novos e é somada ao que já existe
+        metric_names = [metric_column(col, metric) for col in value_columns for metric in METRICS]
+        aggregates = ["SUM(row_count)"]
+        updates = ["row_count = row_count + excluded.row_count"]
+        for name in metric_names:
+            q = quote_identifier(name)
+            metric = name.rsplit('__', 1)[1]
+            if metric in ('sum', 'count'):
+                aggregates.append(f"SUM({q})")
+                updates.append(f"{q} = {q} + excluded.{q}")
+            else:
+                func = metric.upper()
+                aggregates.append(f"{func}({q})")
+                # MIN/MAX escalares retornam NULL se algum argumento for NULL
+                updates.append(f"{q} = {func}(COALESCE({q}, excluded.{q}), COALESCE(excluded.{q}, {q}))")
+
+        target_columns = ", ".join(["period", "row_count"] + [quote_identifier(n) for n in metric_names])
+        for grain, expression in GRAINS.items():
+            conn.execute(
+                f"INSERT INTO {quote_identifier(rollup_table_name(table_name, grain))} ({target_columns}) "
+                f"SELECT {expression}, {', '.join(aggregates)} FROM temp.{quote_identifier(DELTA_TABLE)} WHERE true "
+                f"GROUP BY 1 ON CONFLICT(period) DO UPDATE SET {', '.join(updates)}"
+            )
+
+        conn.execute(f"DROP TABLE temp.{quote_identifier(DELTA_TABLE)}")
+        conn.execute(
+            f"UPDATE {quote_identifier(REGISTRY_TABLE)} SET last_rowid=?, row_count=row_count + ? WHERE table_name=?",
+            (max_rowid, added, table_name)
+        )
+        return True
+
+    def sync(self, conn, table_name):
+        """
+        Agrega linhas escritas por fora deste processo
+
+        Compara COUNT(*) da tabela com as linhas já agregadas: a diferença
+        são as inserções novas (ver update); se a tabela encolheu, recria.
+
+        Returns:
+            bool: True se os rollups mudaram
+        """
+        registry = self.get(conn, table_name)
+        if registry is None:
+            return False
+        count = conn.execute(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}").fetchone()[0]
+        if registry['row_count'] is not None and count == registry['row_count']:
+            return False
+        return self.update(conn, table_name, inserted=count - (registry['row_count'] or 0))
+
+    def drop(self, conn, table_name):
+        """Remove os rollups e o registro de uma tabela"""
+        self._drop_tables(conn, table_name)
+        self.ensure(conn)
+        conn.execute(f"DELETE FROM {quote_identifier(REGISTRY_TABLE)} WHERE table_name=?", (table_name,))
+
+    def _drop_tables(self, conn, table_name):
+        for grain in GRAINS:
+            conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(rollup_table_name(table_name, grain))}")
@@ -5,13 +5,52 @@ Gerenciador de banco SQLite
 
 import sqlite3
 import pandas as pd
+import numpy as np
 from pathlib import Path
 import logging
+import re
+from itertools import islice
 from config.settings import Settings
+from src.data.connection_pool import SQLiteConnectionPool
+from src.data.query_cache import QueryCache
+from src.data.table_catalog import TableCatalog, INTERNAL_PREFIX
+from src.data.index_advisor import IndexAdvisor
+from src.data.rollups import RollupManager, GRAINS, METRICS, rollup_table_name, metric_column
+from src.utils.sql import quote_identifier
+
+# Leitura via Arrow (ADBC) é opcional
+try:
+    import adbc_driver_sqlite
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+
+    ADBC_AVAILABLE = True
+except ImportError:
+    ADBC_AVAILABLE = False
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+# Funções de agregação aceitas por aggregate (nomes do pandas -> SQL)
+_AGG_FUNCTIONS = {
+    'count': 'COUNT',
+    'sum': 'SUM',
+    'mean': 'AVG',
+    'avg': 'AVG',
+    'min': 'MIN',
+    'max': 'MAX'
+}
+
+# Comando de escrita e tabela alvo, para manter o catálogo em execute_query
+_WRITE_STATEMENT = re.compile(
+    r'^\s*(?P<verb>INSERT|REPLACE|UPDATE|DELETE|DROP\s+TABLE|ALTER\s+TABLE|CREATE\s+TABLE)\b'
+    r'(?:\s+OR\s+(?P<conflict>\w+))?(?:\s+INTO|\s+FROM)?(?:\s+IF(?:\s+NOT)?\s+EXISTS)?\s+'
+    r'(?:"(?P<quoted>(?:[^"]|"")+)"|\[(?P<bracketed>[^\]]+)\]|`(?P<backticked>[^`]+)`|(?P<plain>\w+))',
+    re.IGNORECASE
+)
+
+# Cláusula de UPSERT: a linha pode substituir ou manter uma já existente
+_ON_CONFLICT = re.compile(r'\bON\s+CONFLICT\b', re.IGNORECASE)
+
 
 class SQLiteManager:
     """Gerencia operações com SQLite"""
@@ -25,6 +64,15 @@ class SQLiteManager:
         """
         self.db_path = db_path or Settings.SQLITE_PATH
         self.conn = None
+        self.pool = SQLiteConnectionPool(self.db_path)
+        self.query_cache = QueryCache()
+        self.catalog = TableCatalog()
+        self.index_advisor = IndexAdvisor()
+        self.rollups = RollupManager()
+        # Incrementado a cada escrita feita por este gerenciador
+        self._write_version = 0
+        # Colunas por tabela para o index_advisor: {tabela: (versão dos dados, colunas)}
+        self._columns_memo = {}
         logger.info(f"SQLiteManager inicializado: {self.db_path}")
 
     def connect(self):
@@ -42,73 +90,790 @@ class SQLiteManager:
             self.conn.close()
             self.conn = None
 
-    def df_to_sql(self, df, table_name, if_exists='replace'):
+    def close(self):
+        """Fecha a conexão avulsa e todas as conexões do pool"""
+        self.disconnect()
+        self.pool.close()
+
+    def df_to_sql(self, df, table_name, if_exists='replace', bulk=False, batch_size=None,
+                  index_columns=None):
         """
         Salva DataFrame em tabela SQL
 
         Args:
-            df: DataFrame a ser salvo
+            df: DataFrame ou iterável de DataFrames (chunks) a ser salvo
             table_name: Nome da tabela
             if_exists: Comportamento se tabela existir ('replace', 'append', 'fail')
+            bulk: Se True, usa a carga rápida (uma transação, executemany em lotes)
+            batch_size: Linhas por executemany na carga rápida
+                (padrão: Settings.SQLITE_BULK_BATCH_SIZE)
+            index_columns: Colunas a indexar depois da carga
+
+        Índices que a tabela já tinha são recriados depois da carga, inclusive
+        com if_exists='replace'.
 
         Returns:
             bool: True se sucesso, False caso contrário
         """
-        conn = self.connect()
-        if not conn:
-            return False
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
 
         try:
-            df.to_sql(table_name, conn, if_exists=if_exists, index=False)
-            logger.info(f"DataFrame salvo em '{table_name}' ({len(df)} linhas)")
+            with self.pool.writer() as conn:
+                since_rowid = self.catalog.max_rowid(conn, table_name) if if_exists == 'append' else 0
+                changes = conn.total_changes
+                if bulk:
+                    total_rows = self._bulk_insert(conn, chunks, table_name, if_exists,
+                                                   batch_size or Settings.SQLITE_BULK_BATCH_SIZE,
+                                                   index_columns)
+                else:
+                    indexes = _table_indexes(conn, table_name) if if_exists == 'replace' else []
+                    total_rows = 0
+                    for chunk in chunks:
+                        chunk.to_sql(table_name, conn, if_exists=if_exists, index=False)
+                        total_rows += len(chunk)
+                        # Chunks seguintes são anexados à tabela criada pelo primeiro
+                        if_exists = 'append'
+
+                    _create_indexes(conn, table_name, indexes, index_columns)
+                    conn.commit()
+
+                self._after_write(conn, table_name, since_rowid, inserted=conn.total_changes - changes)
+
+            logger.info(f"DataFrame salvo em '{table_name}' ({total_rows} linhas)")
             return True
         except Exception as e:
             logger.error(f"Erro ao salvar: {e}")
             return False
         finally:
-            self.disconnect()
+            self._write_version += 1
 
-    def sql_to_df(self, query):
+    def _bulk_insert(self, conn, chunks, table_name, if_exists, batch_size, index_columns=None):
+        """
+        Carga rápida: uma única transação com executemany em lotes
+
+        Índices existentes da tabela são removidos durante a carga e
+        recriados no fim, junto com os de index_columns (também quando a
+        tabela é substituída). O fsync fica desligado (synchronous=OFF) só
+        enquanto a carga roda.
+
+        Returns:
+            int: Número de linhas inseridas
+        """
+        table = quote_identifier(table_name)
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+        ).fetchone() is not None
+
+        if exists and if_exists == 'fail':
+            raise ValueError(f"Tabela '{table_name}' já existe")
+
+        indexes = _table_indexes(conn, table_name)
+
+        conn.execute("PRAGMA synchronous=OFF")
+        try:
+            conn.execute("BEGIN")
+            if exists and if_exists == 'replace':
+                # DROP TABLE já remove os índices
+                conn.execute(f"DROP TABLE {table}")
+                exists = False
+            else:
+                for name, _, _ in indexes:
+                    conn.execute(f"DROP INDEX {quote_identifier(name)}")
+
+            total_rows = 0
+            insert_sql = None
+            for chunk in chunks:
+                if not exists:
+                    conn.execute(pd.io.sql.get_schema(chunk, table_name))
+                    exists = True
+                if insert_sql is None:
+                    columns = ", ".join(quote_identifier(c) for c in chunk.columns)
+                    placeholders = ", ".join("?" * len(chunk.columns))
+                    insert_sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+
+                for batch in _iter_row_batches(chunk, batch_size):
+                    conn.executemany(insert_sql, batch)
+                total_rows += len(chunk)
+
+            # Índices construídos depois da carga, uma vez só
+            _create_indexes(conn, table_name, indexes, index_columns)
+
+            conn.commit()
+            return total_rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+    def sql_to_df(self, query, params=None, cache=False):
         """
         Executa query SQL e retorna DataFrame
 
         Args:
             query: String SQL
+            params: Parâmetros para query parametrizada
+            cache: Se True, reaproveita o resultado enquanto o banco não mudar
+                (respostas do cache não são registradas no index_advisor)
 
         Returns:
             DataFrame com resultados
         """
-        conn = self.connect()
-        if not conn:
-            return pd.DataFrame()
-
         try:
-            df = pd.read_sql_query(query, conn)
+            if cache:
+                key = QueryCache.make_key(query, params)
+                version = self.data_version()
+                cached = self.query_cache.get(key, version)
+                if cached is not None:
+                    logger.debug("Query servida pelo cache")
+                    return cached.copy()
+
+            self.index_advisor.record_query(query, self._memo_columns)
+            with self.pool.reader() as conn:
+                df = pd.read_sql_query(query, conn, params=params)
             logger.debug(f"Query retornou {len(df)} linhas")
+
+            if cache:
+                self.query_cache.put(key, version, df.copy())
             return df
         except Exception as e:
             logger.error(f"Erro na query: {e}")
             return pd.DataFrame()
+
+    def iter_sql_chunks(self, query, params=None, chunksize=None, engine='sqlite3'):
+        """
+        Executa query SQL e retorna os resultados em chunks
+
+        Só um chunk fica em memória por vez, então tabelas maiores que a
+        RAM podem ser agregadas direto do SQLite.
+
+        Args:
+            query: String SQL
+            params: Parâmetros para query parametrizada
+            chunksize: Linhas por chunk (padrão: Settings.SQLITE_FETCH_CHUNK_SIZE)
+            engine: 'sqlite3' (cursor.fetchmany) ou 'arrow' (lotes Arrow via
+                adbc_driver_sqlite, sem criar uma tupla Python por linha)
+
+        Yields:
+            DataFrame com cada chunk do resultado
+
+        Raises:
+            Exception: Erro na query, mesmo depois de chunks já entregues
+                (registrado e repassado, para um resultado truncado não
+                parecer completo)
+        """
+        chunksize = chunksize or Settings.SQLITE_FETCH_CHUNK_SIZE
+        self.index_advisor.record_query(query, self._memo_columns)
+
+        if engine == 'arrow':
+            if ADBC_AVAILABLE and not self.pool.in_memory:
+                yield from self._iter_arrow_chunks(query, params, chunksize)
+                return
+            logger.warning("adbc_driver_sqlite não instalado: usando leitura via sqlite3")
+
+        try:
+            with self.pool.reader() as conn:
+                cursor = conn.execute(query, params or ())
+                columns = [description[0] for description in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(chunksize)
+                    if not rows:
+                        break
+                    yield pd.DataFrame.from_records(rows, columns=columns)
+        except Exception as e:
+            logger.error(f"Erro na query: {e}")
+            raise
+
+    def _iter_arrow_chunks(self, query, params, chunksize):
+        """Lê o resultado em lotes Arrow por uma conexão ADBC somente leitura"""
+        uri = f"file:{Path(self.db_path).resolve().as_posix()}?mode=ro"
+        try:
+            with adbc_sqlite.connect(uri) as conn, conn.cursor() as cursor:
+                cursor.adbc_statement.set_options(
+                    **{adbc_driver_sqlite.StatementOptions.BATCH_ROWS.value: str(chunksize)}
+                )
+                cursor.execute(query, params)
+                for batch in cursor.fetch_record_batch():
+                    yield batch.to_pandas()
+        except Exception as e:
+            logger.error(f"Erro na query (arrow): {e}")
+            raise
+
+    def data_version(self):
+        """
+        Versão atual dos dados, usada para invalidar o cache de queries
+
+        Combina o PRAGMA data_version (commits de qualquer conexão, inclusive
+        de outros processos) com o contador de escritas deste gerenciador.
+        """
+        return self.pool.data_version(), self._write_version
+
+    def _after_write(self, conn, table_name, since_rowid=None, dropped=False, inserted=None):
+        """
+        Atualiza catálogo e rollups após uma escrita
+
+        Com since_rowid só as linhas novas são agregadas; sem ele (UPDATE,
+        DELETE, ALTER, REPLACE e UPSERT) a tabela é recalculada, assim como quando since_rowid
+        é 0 (tabela criada ou substituída) ou quando as linhas acima de
+        since_rowid não somam inserted (linhas gravadas). Falhas aqui não desfazem a
+        escrita: catálogo e rollups podem ser corrigidos com
+        refresh_table_stats e create_rollups.
+        """
+        if table_name.startswith(INTERNAL_PREFIX):
+            return
+        exists = True
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+            ).fetchone()
+            if dropped or not exists:
+                self.catalog.remove(conn, table_name)
+                self.index_advisor.forget_table(table_name)
+                self._columns_memo.pop(table_name, None)
+            elif since_rowid is None:
+                self.catalog.refresh(conn, table_name)
+            else:
+                self.catalog.update(conn, table_name, since_rowid, replace=not since_rowid,
+                                    inserted=inserted)
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Catálogo não atualizado para '{table_name}': {e}")
+
+        try:
+            if dropped or not exists:
+                self.rollups.drop(conn, table_name)
+            elif since_rowid:
+                self.rollups.update(conn, table_name, inserted=inserted)
+            else:
+                # Tabela substituída ou escrita que não é só inserção (ver _is_append_only)
+                self.rollups.rebuild(conn, table_name)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"Rollups não atualizados para '{table_name}': {e}")
+
+    def get_table_stats(self, table_name):
+        """
+        Estatísticas da tabela lidas do catálogo (sem varrer a tabela)
+
+        Tabelas ainda fora do catálogo (criadas por outro processo ou antes
+        dele existir) são calculadas uma vez e registradas.
+
+        Returns:
+            dict: table, row_count, columns, column_stats ({coluna: min, max,
+                nulls e sum nas numéricas}) e last_modified; None em caso de erro
+        """
+        try:
+            with self.pool.reader() as conn:
+                stats = self.catalog.get(conn, table_name)
+            if stats is None:
+                stats = self.refresh_table_stats(table_name)
+            return stats
+        except Exception as e:
+            logger.error(f"Erro ao ler estatísticas de '{table_name}': {e}")
+            return None
+
+    def get_row_count(self, table_name):
+        """Número de linhas da tabela segundo o catálogo (None em caso de erro)"""
+        stats = self.get_table_stats(table_name)
+        return stats['row_count'] if stats else None
+
+    def refresh_table_stats(self, table_name):
+        """
+        Recalcula as estatísticas de uma tabela lendo todas as linhas
+
+        A leitura roda na conexão de escrita, mas pode ser interrompida pelo
+        CancelToken da thread (ver QueryExecutor), como as dos leitores.
+
+        Returns:
+            dict com as estatísticas ou None em caso de erro
+        """
+        try:
+            with self.pool.writer(cancellable=True) as conn:
+                self.catalog.refresh(conn, table_name)
+                stats = self.catalog.get(conn, table_name)
+            logger.info(f"Estatísticas recalculadas: '{table_name}'")
+            return stats
+        except Exception as e:
+            logger.error(f"Erro ao recalcular estatísticas de '{table_name}': {e}")
+            return None
         finally:
-            self.disconnect()
+            self._write_version += 1
 
     def list_tables(self):
-        """Lista tabelas do banco"""
-        query = "SELECT name FROM sqlite_master WHERE type='table';"
-        conn = self.connect()
-        if not conn:
-            return []
+        """Lista tabelas do banco (sem as tabelas internas)"""
+        query = "SELECT name FROM sqlite_master WHERE type='table' AND substr(name, 1, ?) != ?;"
 
         try:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            tables = [row[0] for row in cursor.fetchall()]
+            with self.pool.reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, (len(INTERNAL_PREFIX), INTERNAL_PREFIX))
+                tables = [row[0] for row in cursor.fetchall()]
             return tables
         except Exception as e:
             logger.error(f"Erro ao listar tabelas: {e}")
             return []
+
+    def max_rowid(self, table_name):
+        """Maior rowid da tabela (0 se vazia; None em caso de erro)"""
+        try:
+            with self.pool.reader() as conn:
+                return self.catalog.max_rowid(conn, table_name)
+        except Exception as e:
+            logger.error(f"Erro ao ler rowid de {table_name}: {e}")
+            return None
+
+    def get_columns(self, table_name):
+        """Lista as colunas de uma tabela"""
+        try:
+            with self.pool.reader() as conn:
+                rows = conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})").fetchall()
+            return [row[1] for row in rows]
+        except Exception as e:
+            logger.error(f"Erro ao listar colunas de '{table_name}': {e}")
+            return []
+
+    def _memo_columns(self, table_name):
+        """Colunas da tabela lembradas enquanto a versão dos dados não muda (usado pelo advisor)"""
+        version = self.data_version()
+        entry = self._columns_memo.get(table_name)
+        if entry is None or entry[0] != version:
+            entry = self._columns_memo[table_name] = (version, self.get_columns(table_name))
+        return entry[1]
+
+    def fetch_page(self, table_name, columns=None, order_by=None, descending=False,
+                   after=None, page_size=100):
+        """
+        Lê uma página da tabela com paginação keyset (sem OFFSET)
+
+        A página seguinte começa depois do último (valor de ordenação, rowid)
+        lido, então o custo por página não cresce com a posição na tabela.
+        Ordenar por uma coluna é rápido quando ela tem índice.
+
+        Args:
+            table_name: Nome da tabela (precisa ter rowid)
+            columns: Colunas a retornar (padrão: todas)
+            order_by: Coluna de ordenação (padrão: rowid, ordem de inserção)
+            descending: Se True, ordem decrescente
+            after: Cursor retornado pela página anterior (None = primeira página)
+            page_size: Linhas por página
+
+        Returns:
+            tuple: (DataFrame da página, cursor da próxima página ou None se for a última)
+        """
+        table = quote_identifier(table_name)
+        columns = columns or self.get_columns(table_name)
+        select = ", ".join(quote_identifier(c) for c in columns)
+        direction = "DESC" if descending else "ASC"
+        op = "<" if descending else ">"
+
+        where = ""
+        params = []
+        if order_by is None:
+            if after is not None:
+                where = f"WHERE rowid {op} ?"
+                params = [after[-1]]
+            sql = (f'SELECT rowid AS "__rowid__", {select} FROM {table} {where} '
+                   f'ORDER BY rowid {direction} LIMIT ?')
+        else:
+            key = quote_identifier(order_by)
+            if after is not None:
+                value, rowid = after
+                # NULLs vêm primeiro na ordem crescente e por último na decrescente
+                if value is None and not descending:
+                    where = f"WHERE ({key} IS NULL AND rowid > ?) OR {key} IS NOT NULL"
+                    params = [rowid]
+                elif value is None:
+                    where = f"WHERE {key} IS NULL AND rowid < ?"
+                    params = [rowid]
+                elif not descending:
+                    where = f"WHERE ({key}, rowid) > (?, ?)"
+                    params = [value, rowid]
+                else:
+                    where = f"WHERE ({key}, rowid) < (?, ?) OR {key} IS NULL"
+                    params = [value, rowid]
+            sql = (f'SELECT rowid AS "__rowid__", {key} AS "__sort__", {select} FROM {table} {where} '
+                   f'ORDER BY {key} {direction}, rowid {direction} LIMIT ?')
+
+        df = self.sql_to_df(sql, params=params + [int(page_size)])
+        if df.empty:
+            return df, None
+
+        next_cursor = None
+        if len(df) == page_size:
+            last = df.iloc[-1]
+            rowid = _to_python(last['__rowid__'])
+            next_cursor = (_to_python(last['__sort__']), rowid) if order_by is not None else (rowid,)
+
+        df = df.drop(columns=[c for c in ('__rowid__', '__sort__') if c in df.columns])
+        return df, next_cursor
+
+    def aggregate(self, table_name, group_by=None, metrics=None, where=None, params=None,
+                  order_by=None, descending=False, limit=None, dropna=True):
+        """
+        Agrupa e agrega dentro do SQLite, retornando só o resultado
+
+        Equivale a df.groupby(group_by).agg(metrics) sem trazer as linhas
+        para o Python.
+
+        Args:
+            table_name: Nome da tabela
+            group_by: Coluna ou lista de colunas de agrupamento (None = tabela inteira)
+            metrics: Dict {coluna: função ou lista de funções} com funções
+                'count', 'sum', 'mean'/'avg', 'min', 'max'. A coluna resultante
+                mantém o nome da coluna quando há uma função só, senão
+                recebe o sufixo _<função>. Padrão: {'*': 'count'} -> coluna 'count'
+            where: Filtro SQL opcional (sem a palavra WHERE)
+            params: Parâmetros do filtro
+            order_by: Coluna do resultado usada na ordenação
+            descending: Se True, ordem decrescente
+            limit: Número máximo de grupos
+            dropna: Se True, ignora grupos com chave nula (como o pandas)
+
+        Returns:
+            DataFrame com uma linha por grupo
+        """
+        group_cols = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        metrics = metrics or {'*': 'count'}
+
+        select = [quote_identifier(c) for c in group_cols]
+        for column, funcs in metrics.items():
+            funcs = [funcs] if isinstance(funcs, str) else list(funcs)
+            for func in funcs:
+                if func not in _AGG_FUNCTIONS:
+                    logger.error(f"Função de agregação não suportada: {func}")
+                    return pd.DataFrame()
+                target = '*' if column == '*' else quote_identifier(column)
+                if column == '*':
+                    alias = func
+                elif len(funcs) == 1:
+                    alias = column
+                else:
+                    alias = f"{column}_{func}"
+                select.append(f"{_AGG_FUNCTIONS[func]}({target}) AS {quote_identifier(alias)}")
+
+        conditions = [f"({where})"] if where else []
+        if dropna:
+            conditions += [f"{quote_identifier(c)} IS NOT NULL" for c in group_cols]
+
+        sql = f"SELECT {', '.join(select)} FROM {quote_identifier(table_name)}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if group_cols:
+            sql += " GROUP BY " + ", ".join(quote_identifier(c) for c in group_cols)
+        if order_by:
+            sql += f" ORDER BY {quote_identifier(order_by)} {'DESC' if descending else 'ASC'}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        return self.sql_to_df(sql, params=params, cache=True)
+
+    def value_counts(self, table_name, column, limit=None, dropna=True):
+        """
+        Contagem de valores de uma coluna calculada no SQLite
+
+        Returns:
+            DataFrame com as colunas [column, 'count'], da maior para a menor contagem
+        """
+        return self.aggregate(table_name, group_by=column, order_by='count', descending=True,
+                              limit=limit, dropna=dropna)
+
+    def describe(self, table_name, columns=None):
+        """
+        Contagem, média, mínimo e máximo das colunas em uma única varredura
+
+        Returns:
+            DataFrame indexado pelo nome da coluna com count, mean, min e max
+        """
+        columns = columns or self.get_columns(table_name)
+        metrics = {col: ['count', 'mean', 'min', 'max'] for col in columns}
+        result = self.aggregate(table_name, metrics=metrics)
+        if result.empty:
+            return result
+
+        row = result.iloc[0]
+        return pd.DataFrame(
+            {stat: [row[f"{col}_{stat}"] for col in columns] for stat in ('count', 'mean', 'min', 'max')},
+            index=columns
+        )
+
+    def histogram(self, table_name, column, bins=30, where=None, params=None):
+        """
+        Histograma de uma coluna numérica calculado no SQLite
+
+        Os limites vêm do catálogo quando disponíveis, então só uma
+        varredura (a contagem por intervalo) é feita.
+
+        Returns:
+            DataFrame com bin_start, bin_end e count (intervalos vazios incluídos)
+        """
+        col = quote_identifier(column)
+        table = quote_identifier(table_name)
+        filter_sql = f" AND ({where})" if where else ""
+
+        stats = None if where else self.get_table_stats(table_name)
+        col_stats = (stats or {}).get('column_stats', {}).get(column, {})
+        low, high = col_stats.get('min'), col_stats.get('max')
+        if not all(isinstance(v, (int, float)) for v in (low, high)):
+            bounds = self.sql_to_df(
+                f'SELECT MIN({col}) AS low, MAX({col}) AS high FROM {table} WHERE {col} IS NOT NULL{filter_sql}',
+                params=params, cache=True
+            )
+            if bounds.empty or pd.isna(bounds['low'].iloc[0]):
+                return pd.DataFrame(columns=['bin_start', 'bin_end', 'count'])
+            low, high = float(bounds['low'].iloc[0]), float(bounds['high'].iloc[0])
+
+        width = (high - low) / bins or 1.0
+        counts = self.sql_to_df(
+            f'SELECT MIN(CAST(({col} - ?) / ? AS INTEGER), ?) AS bin, COUNT(*) AS count '
+            f'FROM {table} WHERE {col} IS NOT NULL{filter_sql} GROUP BY bin',
+            params=[low, width, bins - 1] + list(params or []), cache=True
+        )
+
+        edges = low + width * np.arange(bins + 1)
+        result = pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': 0})
+        if not counts.empty:
+            result.loc[counts['bin'].astype(int).clip(0, bins - 1), 'count'] = counts['count'].values
+        return result
+
+    def create_rollups(self, table_name, date_column):
+        """
+        Cria rollups por dia, semana, mês, trimestre e ano de uma tabela
+
+        Depois de criados, são mantidos a cada escrita feita por este
+        gerenciador: inserções somam só as linhas novas, outras alterações
+        (inclusive REPLACE, INSERT OR REPLACE/IGNORE e ON CONFLICT) recriam
+        os rollups.
+
+        Args:
+            table_name: Nome da tabela
+            date_column: Coluna de data usada nos períodos
+
+        Returns:
+            bool: True se sucesso, False caso contrário
+        """
+        try:
+            with self.pool.writer() as conn:
+                self.rollups.build(conn, table_name, date_column)
+                conn.commit()
+            logger.info(f"Rollups criados para '{table_name}' por '{date_column}'")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao criar rollups de '{table_name}': {e}")
+            return False
+        finally:
+            self._write_version += 1
+
+    def drop_rollups(self, table_name):
+        """
+        Remove os rollups de uma tabela
+
+        Returns:
+            bool: True se sucesso, False caso contrário
+        """
+        try:
+            with self.pool.writer() as conn:
+                self.rollups.drop(conn, table_name)
+                conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao remover rollups de '{table_name}': {e}")
+            return False
+        finally:
+            self._write_version += 1
+
+    def get_rollup_info(self, table_name):
+        """Registro dos rollups da tabela (date_column, value_columns, last_rowid, row_count) ou None"""
+        try:
+            with self.pool.reader() as conn:
+                return self.rollups.get(conn, table_name)
+        except Exception as e:
+            logger.error(f"Erro ao ler rollups de '{table_name}': {e}")
+            return None
+
+    def get_rollup(self, table_name, grain, column=None, metric='sum'):
+        """
+        Lê um rollup já agregado
+
+        Linhas inseridas por fora deste gerenciador (outro processo) são
+        agregadas antes da leitura: a contagem da tabela é comparada com a
+        dos rollups e, se as linhas novas não estão todas acima do último
+        rowid agregado, os rollups são recriados. Depois de UPDATE/UPSERT
+        feitos por fora (mesma contagem), chame create_rollups.
+
+        Args:
+            table_name: Nome da tabela
+            grain: 'day', 'week', 'month', 'quarter' ou 'year'
+            column: Coluna numérica (None = todas as métricas do rollup)
+            metric: 'sum', 'count', 'min', 'max' ou 'mean' (usado com column)
+
+        Returns:
+            DataFrame ordenado por período (period + métricas, ou period + column)
+        """
+        if grain not in GRAINS or (column is not None and metric not in METRICS + ('mean',)):
+            logger.error(f"Rollup inválido: {grain}/{metric}")
+            return pd.DataFrame()
+
+        try:
+            with self.pool.reader() as conn:
+                registry = self.rollups.get(conn, table_name)
+                row_count = conn.execute(
+                    f"SELECT COUNT(*) FROM {quote_identifier(table_name)}"
+                ).fetchone()[0]
+            if registry is None:
+                logger.error(f"Tabela '{table_name}' sem rollups (use create_rollups)")
+                return pd.DataFrame()
+            if row_count != registry['row_count']:
+                with self.pool.writer() as conn:
+                    self.rollups.sync(conn, table_name)
+                    conn.commit()
+                self._write_version += 1
+        except Exception as e:
+            logger.error(f"Erro ao atualizar rollups de '{table_name}': {e}")
+            return pd.DataFrame()
+
+        rollup = quote_identifier(rollup_table_name(table_name, grain))
+        if column is None:
+            select = "*"
+        elif metric == 'mean':
+            total = quote_identifier(metric_column(column, 'sum'))
+            count = quote_identifier(metric_column(column, 'count'))
+            select = f"period, {total} / NULLIF({count}, 0) AS {quote_identifier(column)}"
+        else:
+            select = f"period, {quote_identifier(metric_column(column, metric))} AS {quote_identifier(column)}"
+
+        return self.sql_to_df(f"SELECT {select} FROM {rollup} ORDER BY period", cache=True)
+
+    def list_indexes(self, table_name=None):
+        """
+        Lista os índices das tabelas
+
+        Args:
+            table_name: Restringe a uma tabela (padrão: todas as tabelas de list_tables)
+
+        Returns:
+            list: dicts com name, table, columns, unique e origin
+                ('c' = CREATE INDEX, 'pk'/'u' = criados pelo SQLite)
+        """
+        tables = [table_name] if table_name else self.list_tables()
+        indexes = []
+        try:
+            with self.pool.reader() as conn:
+                for table in tables:
+                    for row in conn.execute(f"PRAGMA index_list({quote_identifier(table)})").fetchall():
+                        name, unique, origin = row[1], bool(row[2]), row[3]
+                        info = conn.execute(f"PRAGMA index_info({quote_identifier(name)})").fetchall()
+                        indexes.append({
+                            'name': name,
+                            'table': table,
+                            'columns': [col[2] for col in sorted(info)],
+                            'unique': unique,
+                            'origin': origin
+                        })
+            return indexes
+        except Exception as e:
+            logger.error(f"Erro ao listar índices: {e}")
+            return []
+
+    def create_index(self, table_name, columns, unique=False, name=None):
+        """
+        Cria um índice
+
+        Args:
+            table_name: Nome da tabela
+            columns: Coluna ou lista de colunas
+            unique: Se True, cria índice UNIQUE
+            name: Nome do índice (padrão: idx_<tabela>_<colunas>)
+
+        Returns:
+            str: Nome do índice ou None em caso de erro
+        """
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        name = name or f"idx_{table_name}_{'_'.join(columns)}"
+        missing = [c for c in columns if c not in self.get_columns(table_name)]
+        if missing:
+            logger.error(f"Erro ao criar índice '{name}': colunas inexistentes {missing}")
+            return None
+        sql = (f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {quote_identifier(name)} "
+               f"ON {quote_identifier(table_name)} ({', '.join(quote_identifier(c) for c in columns)})")
+        try:
+            with self.pool.writer() as conn:
+                conn.execute(sql)
+                # Estatísticas do planejador para o novo índice
+                conn.execute(f"ANALYZE {quote_identifier(name)}")
+                conn.commit()
+            logger.info(f"Índice criado: {name}")
+            return name
+        except Exception as e:
+            logger.error(f"Erro ao criar índice '{name}': {e}")
+            return None
         finally:
-            self.disconnect()
+            self._write_version += 1
+
+    def drop_index(self, name):
+        """
+        Remove um índice
+
+        Returns:
+            bool: True se sucesso, False caso contrário
+        """
+        try:
+            with self.pool.writer() as conn:
+                conn.execute(f"DROP INDEX IF EXISTS {quote_identifier(name)}")
+                conn.commit()
+            logger.info(f"Índice removido: {name}")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao remover índice '{name}': {e}")
+            return False
+        finally:
+            self._write_version += 1
+
+    def suggest_indexes(self, table_name=None, min_uses=None):
+        """
+        Sugere índices para colunas usadas com frequência em filtros,
+        agrupamentos e ordenações das queries executadas por este gerenciador
+
+        Colunas que já são a primeira coluna de um índice (ou o INTEGER
+        PRIMARY KEY) não são sugeridas.
+
+        Args:
+            table_name: Restringe a uma tabela
+            min_uses: Usos mínimos (padrão: Settings.INDEX_ADVISOR_MIN_USES)
+
+        Returns:
+            list: dicts com table, column, uses e reason
+        """
+        indexed = {}
+        for index in self.list_indexes(table_name):
+            indexed.setdefault(index['table'], set()).add(index['columns'][0] if index['columns'] else None)
+        try:
+            with self.pool.reader() as conn:
+                for table in [table_name] if table_name else self.list_tables():
+                    for row in conn.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall():
+                        if row[5] == 1 and (row[2] or "").upper() == "INTEGER":
+                            indexed.setdefault(table, set()).add(row[1])
+        except Exception as e:
+            logger.error(f"Erro ao ler chaves primárias: {e}")
+
+        suggestions = self.index_advisor.suggest(indexed, table_name)
+        if min_uses is not None:
+            suggestions = [s for s in suggestions if s['uses'] >= min_uses]
+        return suggestions
+
+    def apply_index_suggestions(self, table_name=None, min_uses=None):
+        """
+        Cria os índices sugeridos por suggest_indexes
+
+        Returns:
+            list: Nomes dos índices criados
+        """
+        created = []
+        for suggestion in self.suggest_indexes(table_name, min_uses):
+            name = self.create_index(suggestion['table'], suggestion['column'])
+            if name:
+                created.append(name)
+        return created
 
     def execute_query(self, query, params=None):
         """
@@ -121,45 +886,210 @@ class SQLiteManager:
         Returns:
             int: Número de linhas afetadas ou None
         """
-        conn = self.connect()
-        if not conn:
-            return None
-
+        match = _WRITE_STATEMENT.match(query)
         try:
-            cursor = conn.cursor()
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+            with self.pool.writer() as conn:
+                since_rowid = None
+                if match and _is_append_only(query, match):
+                    since_rowid = self.catalog.max_rowid(conn, _statement_table(match))
 
-            conn.commit()
-            return cursor.rowcount
+                changes = conn.total_changes
+                cursor = conn.cursor()
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                conn.commit()
+                if match:
+                    self._after_write(conn, _statement_table(match), since_rowid,
+                                      dropped=match.group('verb').upper().startswith('DROP'),
+                                      inserted=conn.total_changes - changes)
+                return cursor.rowcount
         except Exception as e:
             logger.error(f"Erro na query: {e}")
             return None
         finally:
-            self.disconnect()
+            self._write_version += 1
 
-    def backup_database(self):
+    def backup_database(self, incremental=False, pages_per_step=None, sleep=None):
         """
-        Cria backup do banco SQLite
+        Cria backup do banco SQLite sem parar leitores e escritores
+
+        O backup completo usa a API de backup (online), em lotes de páginas
+        com pausas entre eles; se o banco mudar no meio, o SQLite recomeça
+        a cópia e o resultado é sempre consistente. O incremental lê as
+        páginas direto do arquivo do banco dentro de uma transação de
+        leitura (ver _snapshot_pages), sem cópia intermediária.
+
+        Args:
+            incremental: Se True, grava só as páginas novas (deduplicadas e
+                comprimidas) no repositório de src.data.backup_store
+            pages_per_step: Páginas copiadas por passo (padrão: Settings.BACKUP_PAGES_PER_STEP)
+            sleep: Pausa em segundos entre passos (padrão: Settings.BACKUP_SLEEP_SECONDS)
 
         Returns:
-            Path: Caminho do backup ou None
+            Path do backup completo, dict do snapshot (modo incremental) ou None
         """
-        import shutil
         from datetime import datetime
 
-        backup_dir = Settings.DATA_DIR / "backups"
-        backup_dir.mkdir(exist_ok=True)
+        pages_per_step = pages_per_step or Settings.BACKUP_PAGES_PER_STEP
+        sleep = Settings.BACKUP_SLEEP_SECONDS if sleep is None else sleep
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = backup_dir / f"analytics_backup_{timestamp}.db"
+        if incremental:
+            try:
+                snapshot = self._snapshot_pages(pages_per_step, sleep)
+                logger.info(f"Backup incremental criado: snapshot {snapshot['id']}")
+                return snapshot
+            except Exception as e:
+                logger.error(f"Erro no backup: {e}")
+                return None
 
+        backup_dir = Settings.BACKUP_DIR
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        backup_path = backup_dir / f"analytics_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
         try:
-            shutil.copy2(self.db_path, backup_path)
+            self._online_backup(backup_path, pages_per_step, sleep)
             logger.info(f"Backup criado: {backup_path}")
             return backup_path
         except Exception as e:
             logger.error(f"Erro no backup: {e}")
-            return None
\ No newline at end of file
+            backup_path.unlink(missing_ok=True)
+            return None
+
+    def _snapshot_pages(self, pages_per_step, sleep):
+        """
+        Grava no repositório de páginas o banco visto por uma leitura consistente
+
+        Um leitor abre uma transação (fixando o snapshot) e o escritor faz
+        um checkpoint PASSIVE: se todo o WAL foi aplicado, o arquivo do banco
+        é exatamente esse snapshot, e continua sendo enquanto a transação
+        estiver aberta, porque o SQLite não aplica ao arquivo quadros mais
+        novos que os de um leitor ativo. Escritas seguem normalmente no WAL.
+        Se outro leitor mais antigo impedir o checkpoint, tenta de novo.
+
+        Returns:
+            dict do snapshot (ver PageBackupStore.add_snapshot)
+        """
+        import time
+        from src.data.backup_store import PageBackupStore
+
+        store = PageBackupStore()
+        for attempt in range(Settings.BACKUP_SNAPSHOT_ATTEMPTS):
+            with self.pool.reader() as conn:
+                conn.execute("BEGIN")
+                conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+                page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+                with self.pool.writer() as writer:
+                    _, wal_frames, applied = writer.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+                # Fora do modo WAL o retorno é (0, -1, -1) e a transação já bloqueia escritas
+                if wal_frames == applied:
+                    return store.add_snapshot(self.db_path, source=str(self.db_path), page_size=page_size,
+                                              page_count=page_count, pages_per_step=pages_per_step,
+                                              sleep=sleep)
+            logger.debug(f"Backup: WAL ainda não aplicado ({applied}/{wal_frames} quadros), tentativa {attempt + 1}")
+            time.sleep(max(sleep, 0.1))
+        raise RuntimeError("WAL não pôde ser aplicado ao arquivo do banco (leitores antigos ativos)")
+
+    def _online_backup(self, target_path, pages_per_step, sleep):
+        """Copia o banco para target_path com sqlite3.Connection.backup"""
+        def progress(status, remaining, total):
+            logger.debug(f"Backup: {total - remaining}/{total} páginas")
+
+        target = sqlite3.connect(str(target_path))
+        try:
+            with self.pool.reader() as conn:
+                conn.backup(target, pages=pages_per_step, progress=progress, sleep=sleep)
+        finally:
+            target.close()
+
+
+def _table_indexes(conn, table_name):
+    """Índices criados explicitamente na tabela: lista de (nome, sql, colunas)"""
+    rows = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+        (table_name,)
+    ).fetchall()
+    return [
+        (name, sql, [col[2] for col in conn.execute(f"PRAGMA index_info({quote_identifier(name)})")])
+        for name, sql in rows
+    ]
+
+
+def _create_indexes(conn, table_name, indexes, index_columns=None):
+    """
+    Recria índices salvos por _table_indexes e indexa index_columns
+
+    Um índice que não cabe mais no novo esquema (coluna removida) é
+    descartado com aviso, sem desfazer a carga. A checagem é explícita
+    porque o SQLite aceita "coluna" inexistente como texto literal.
+    """
+    table_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})")}
+    for name, sql, columns in indexes:
+        missing = [c for c in columns if c is not None and c not in table_columns]
+        if missing:
+            logger.warning(f"Índice '{name}' não recriado: colunas ausentes {missing}")
+            continue
+        conn.execute(sql)
+    for column in index_columns or []:
+        if column not in table_columns:
+            raise ValueError(f"Coluna '{column}' não existe em '{table_name}'")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote_identifier(f'idx_{table_name}_{column}')} "
+            f"ON {quote_identifier(table_name)} ({quote_identifier(column)})"
+        )
+
+
+def _statement_table(match):
+    """Nome da tabela capturado por _WRITE_STATEMENT"""
+    name = (match.group('quoted') or match.group('bracketed')
+            or match.group('backticked') or match.group('plain'))
+    return name.replace('""', '"')
+
+
+def _is_append_only(query, match):
+    """
+    Indica se o comando só acrescenta linhas novas
+
+    REPLACE, INSERT OR REPLACE/IGNORE e UPSERT (ON CONFLICT) podem apagar
+    ou alterar linhas existentes, inclusive mantendo o rowid, então não
+    podem ser tratados como delta por rowid.
+    """
+    conflict = (match.group('conflict') or '').upper()
+    return (match.group('verb').upper() == 'INSERT' and conflict not in ('REPLACE', 'IGNORE')
+            and not _ON_CONFLICT.search(query))
+
+
+def _to_python(value):
+    """Converte escalares NumPy/pandas em tipos nativos aceitos pelo sqlite3"""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _iter_row_batches(df, batch_size):
+    """
+    Converte um DataFrame em lotes de tuplas prontas para executemany
+
+    A conversão é feita por coluna sobre os arrays NumPy: datas viram texto
+    no mesmo formato do DataFrame.to_sql e nulos viram None.
+    """
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series) and series.dt.tz is None:
+            unit = 'us' if (series.dt.microsecond != 0).any() else 's'
+            text = np.datetime_as_string(series.to_numpy(), unit=unit)
+            values = np.char.replace(text, 'T', ' ').astype(object)
+        else:
+            values = series.to_numpy(dtype=object)
+        values[series.isna().to_numpy()] = None
+        columns.append(values)
+
+    rows = zip(*columns)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        yield batch
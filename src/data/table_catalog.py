@@ -0,0 +1,209 @@
+# src/data/table_catalog.py
+"""
+Catálogo de metadados das tabelas SQLite (contagens e estatísticas por coluna)
+"""
+
+import json
+import logging
+from datetime import datetime
+from src.utils.sql import quote_identifier
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Tabelas internas usam este prefixo e ficam fora de list_tables
+INTERNAL_PREFIX = "__"
+CATALOG_TABLE = "__catalog"
+
+# Afinidades declaradas tratadas como numéricas (TIMESTAMP/DATE ficam de fora)
+NUMERIC_TYPES = ("INT", "REAL", "FLOA", "DOUB")
+
+# Colunas por query de agregação (o SQLite limita o número de colunas do resultado)
+COLUMNS_PER_QUERY = 400
+
+
+def _order_key(value):
+    """Ordem do SQLite entre tipos: números < texto"""
+    return (0, value) if isinstance(value, (int, float)) else (1, str(value))
+
+
+def _merge_min(a, b):
+    if a is None or b is None:
+        return b if a is None else a
+    return min(a, b, key=_order_key)
+
+
+def _merge_max(a, b):
+    if a is None or b is None:
+        return b if a is None else a
+    return max(a, b, key=_order_key)
+
+
+def _json_value(value):
+    """Valores BLOB não são guardados no catálogo"""
+    return None if isinstance(value, bytes) else value
+
+
+class TableCatalog:
+    """
+    Mantém a tabela __catalog com uma linha por tabela do banco
+
+    Cada linha guarda contagem de linhas, lista de colunas, min/max/nulos
+    (e soma das colunas numéricas) por coluna e a data da última alteração.
+    As atualizações agregam só as linhas novas (rowid acima do maior rowid
+    anterior à escrita), conferidas com o número de linhas gravadas; alterações que não são só inserções recalculam a
+    tabela inteira uma vez, na escrita, e não a cada leitura.
+    """
+
+    def ensure(self, conn):
+        """Cria a tabela do catálogo se não existir"""
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote_identifier(CATALOG_TABLE)} ("
+            "table_name TEXT PRIMARY KEY, "
+            "row_count INTEGER NOT NULL, "
+            "columns TEXT NOT NULL, "
+            "column_stats TEXT NOT NULL, "
+            "last_modified TEXT NOT NULL)"
+        )
+
+    def get(self, conn, table_name):
+        """
+        Lê as estatísticas de uma tabela
+
+        Returns:
+            dict ou None se a tabela não está no catálogo
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (CATALOG_TABLE,)
+        ).fetchone()
+        if not exists:
+            return None
+
+        row = conn.execute(
+            f"SELECT row_count, columns, column_stats, last_modified FROM {quote_identifier(CATALOG_TABLE)} "
+            "WHERE table_name=?", (table_name,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        return {
+            'table': table_name,
+            'row_count': row[0],
+            'columns': json.loads(row[1]),
+            'column_stats': json.loads(row[2]),
+            'last_modified': row[3]
+        }
+
+    def max_rowid(self, conn, table_name):
+        """Maior rowid atual da tabela (0 se vazia ou inexistente)"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+        ).fetchone()
+        if not exists:
+            return 0
+        return conn.execute(f"SELECT MAX(rowid) FROM {quote_identifier(table_name)}").fetchone()[0] or 0
+
+    def update(self, conn, table_name, since_rowid=0, replace=False, inserted=None):
+        """
+        Atualiza o catálogo após inserções na tabela
+
+        Args:
+            conn: Conexão de escrita
+            table_name: Tabela alterada
+            since_rowid: Maior rowid antes da escrita; só linhas acima dele são lidas
+            replace: Se True, descarta as estatísticas anteriores
+            inserted: Linhas gravadas pela escrita (conn.total_changes); se as
+                linhas acima de since_rowid não somarem isso (ex: INTEGER
+                PRIMARY KEY explícita abaixo de since_rowid), a tabela
+                inteira é recalculada
+        """
+        self.ensure(conn)
+        previous = None if replace else self.get(conn, table_name)
+        if previous is None and since_rowid:
+            # Sem base para somar: recalcula a tabela inteira
+            since_rowid = 0
+
+        delta = self._aggregate(conn, table_name, since_rowid)
+        if since_rowid and inserted is not None and delta['row_count'] != inserted:
+            logger.debug(f"Catálogo de '{table_name}': {delta['row_count']} linhas acima do rowid "
+                         f"{since_rowid}, {inserted} gravadas; recalculando a tabela")
+            previous = None
+            delta = self._aggregate(conn, table_name, 0)
+        if previous is not None and previous['columns'] == delta['columns']:
+            delta = self._merge(previous, delta)
+
+        conn.execute(
+            f"INSERT OR REPLACE INTO {quote_identifier(CATALOG_TABLE)} VALUES (?, ?, ?, ?, ?)",
+            (table_name, delta['row_count'], json.dumps(delta['columns']),
+             json.dumps(delta['column_stats']), datetime.now().isoformat(timespec='seconds'))
+        )
+        conn.commit()
+
+    def refresh(self, conn, table_name):
+        """Recalcula as estatísticas lendo a tabela inteira"""
+        self.update(conn, table_name, replace=True)
+
+    def remove(self, conn, table_name):
+        """Remove a tabela do catálogo"""
+        self.ensure(conn)
+        conn.execute(f"DELETE FROM {quote_identifier(CATALOG_TABLE)} WHERE table_name=?", (table_name,))
+        conn.commit()
+
+    def _aggregate(self, conn, table_name, since_rowid):
+        """Calcula contagem e min/max/nulos/soma das linhas com rowid > since_rowid"""
+        info = conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})").fetchall()
+        columns = [(row[1], (row[2] or "").upper()) for row in info]
+        table = quote_identifier(table_name)
+
+        row_count = None
+        column_stats = {}
+        # Sempre uma consulta, mesmo sem colunas, para obter a contagem
+        groups = [columns[i:i + COLUMNS_PER_QUERY] for i in range(0, len(columns), COLUMNS_PER_QUERY)] or [[]]
+        for group in groups:
+            exprs = ["COUNT(*)"]
+            for name, declared in group:
+                col = quote_identifier(name)
+                exprs += [f"MIN({col})", f"MAX({col})", f"SUM({col} IS NULL)"]
+                if any(t in declared for t in NUMERIC_TYPES):
+                    exprs.append(f"TOTAL({col})")
+
+            values = list(conn.execute(
+                f"SELECT {', '.join(exprs)} FROM {table} WHERE rowid > ?", (since_rowid,)
+            ).fetchone())
+            row_count = values.pop(0)
+
+            for name, declared in group:
+                stats = {
+                    'min': _json_value(values.pop(0)),
+                    'max': _json_value(values.pop(0)),
+                    'nulls': values.pop(0) or 0
+                }
+                if any(t in declared for t in NUMERIC_TYPES):
+                    stats['sum'] = values.pop(0)
+                column_stats[name] = stats
+
+        return {
+            'row_count': row_count or 0,
+            'columns': [name for name, _ in columns],
+            'column_stats': column_stats
+        }
+
+    def _merge(self, previous, delta):
+        """Combina as estatísticas anteriores com as das linhas novas"""
+        merged = {}
+        for col, new in delta['column_stats'].items():
+            old = previous['column_stats'].get(col, {})
+            stats = {
+                'min': _merge_min(old.get('min'), new['min']),
+                'max': _merge_max(old.get('max'), new['max']),
+                'nulls': old.get('nulls', 0) + new['nulls']
+            }
+            if 'sum' in new:
+                stats['sum'] = (old.get('sum') or 0) + (new['sum'] or 0)
+            merged[col] = stats
+
+        return {
+            'row_count': previous['row_count'] + delta['row_count'],
+            'columns': delta['columns'],
+            'column_stats': merged
+        }
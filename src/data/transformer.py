@@ -7,7 +7,327 @@ import pandas as pd
 import numpy as np
 from loguru import logger
 from typing import List, Optional, Dict
+import os
 import re
+import time
+import threading
+import tracemalloc
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import Settings
+from src.data.dtype_optimizer import infer_datetime_format
+from src.data.duplicates import HashIndex, get_detector
+from src.utils.sketches import KLLSketch, HeavyHitters
+
+# Valores não nulos amostrados por coluna para inferir o tipo em convert_dtypes
+TYPE_SAMPLE_SIZE = 1000
+
+# Estratégias aceitas por handle_missing_values
+MISSING_STRATEGIES = ('auto', 'drop', 'fill_mean', 'fill_median', 'fill_mode')
+
+
+def _rss_bytes():
+    """Memória residente do processo (Linux, /proc/self/statm) ou None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class _PeakMemory:
+    """
+    Pico de memória acima do início de um bloco
+
+    Por padrão amostra o RSS numa thread (custo desprezível); com
+    trace=True, ou fora do Linux, usa tracemalloc, que mede as alocações
+    exatas mas deixa o código Python bem mais lento.
+    """
+
+    def __init__(self, trace=False, interval=0.005):
+        self.source = 'tracemalloc' if trace or _rss_bytes() is None else 'rss'
+        self.interval = interval
+        self.peak_mb = None
+
+    def __enter__(self):
+        if self.source == 'rss':
+            self._base = self._peak = _rss_bytes()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        else:
+            self._started = not tracemalloc.is_tracing()
+            if self._started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, _rss_bytes() or 0)
+
+    def __exit__(self, *exc):
+        if self.source == 'rss':
+            self._stop.set()
+            self._thread.join()
+            self._peak = max(self._peak, _rss_bytes() or 0)
+            peak = self._peak
+        else:
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._started:
+                tracemalloc.stop()
+        self.peak_mb = (peak - self._base) / 1024 ** 2
+        return False
+
+
+def _clean_name(name):
+    """Nome de coluna minúsculo, sem pontuação e com '_' no lugar de espaços"""
+    name = str(name).lower().strip()
+    name = re.sub(r'[^\w\s]', '', name)
+    name = re.sub(r'\s+', '_', name)
+    return name
+
+
+def _is_numeric(dtype):
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _fillna(series, value):
+    """fillna que aceita mediana/média fracionária em inteiros anuláveis (Int64 vira Float64)"""
+    if pd.api.types.is_extension_array_dtype(series.dtype) and pd.api.types.is_integer_dtype(series.dtype) \
+            and not float(value).is_integer():
+        series = series.astype('Float64')
+    return series.fillna(value)
+
+
+def _fill_missing(series, strategy):
+    """
+    Preenche os nulos de uma coluna segundo a estratégia de handle_missing_values
+
+    Returns:
+        Series preenchida, ou a própria série se nada muda
+    """
+    if not series.hasnans:
+        return series
+
+    if strategy in ('fill_mean', 'fill_median'):
+        if not _is_numeric(series.dtype):
+            return series
+        value = series.mean() if strategy == 'fill_mean' else series.median()
+    elif strategy == 'fill_mode':
+        if series.dtype != 'object':
+            return series
+        mode = series.mode()
+        value = mode[0] if not mode.empty else 'Unknown'
+    elif _is_numeric(series.dtype):
+        # 'auto': qualquer tipo numérico (inclusive float32/int32 de optimize_dtypes)
+        value = series.median()
+    else:
+        mode = series.mode()
+        value = mode[0] if not mode.empty else 'Unknown'
+
+    return _fillna(series, value)
+
+
+def _fill_from_values(df, strategy, values):
+    """
+    Preenche nulos de um chunk com valores globais (ver _StreamStats)
+
+    Segue as mesmas regras de _fill_missing, aplicadas ao tipo da coluna no chunk.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if not series.hasnans or col not in values:
+            continue
+        numeric, mode = values[col]
+        if strategy in ('fill_mean', 'fill_median'):
+            if not _is_numeric(series.dtype):
+                continue
+            value = numeric
+        elif strategy == 'fill_mode':
+            if series.dtype != 'object':
+                continue
+            value = mode
+        elif _is_numeric(series.dtype):
+            value = numeric
+        else:
+            value = mode
+        df[col] = _fillna(series, value)
+    return df
+
+
+class _StreamStats:
+    """
+    Resumos mergeáveis por coluna para handle_missing_values em streaming
+
+    Colunas numéricas acumulam soma, contagem e um sketch de quantis;
+    as demais, um resumo de valores mais frequentes.
+    """
+
+    def __init__(self):
+        self.numeric = {}
+        self.frequent = {}
+
+    def update(self, df):
+        for col in df.columns:
+            series = df[col]
+            if _is_numeric(series.dtype):
+                total, count, sketch = self.numeric.get(col) or (0.0, 0, KLLSketch(Settings.STREAM_QUANTILE_K))
+                values = series.to_numpy(dtype='float64', na_value=np.nan)
+                sketch.update(values)
+                self.numeric[col] = (total + np.nansum(values), count + int(series.count()), sketch)
+            else:
+                self.frequent.setdefault(col, HeavyHitters(Settings.STREAM_MODE_CAPACITY)).update(series)
+
+    def fill_values(self, strategy):
+        """
+        Returns:
+            dict: coluna -> (valor numérico, moda) conforme a estratégia
+        """
+        values = {}
+        for col in set(self.numeric) | set(self.frequent):
+            numeric = np.nan
+            if col in self.numeric:
+                total, count, sketch = self.numeric[col]
+                numeric = (total / count if count else np.nan) if strategy == 'fill_mean' else sketch.median()
+            mode = self.frequent[col].mode() if col in self.frequent else None
+            values[col] = (numeric, 'Unknown' if mode is None else mode)
+        return values
+
+
+def _type_sample(non_null, size=TYPE_SAMPLE_SIZE):
+    """Até size valores espalhados pela coluna (não só o início do arquivo)"""
+    if len(non_null) <= size:
+        return non_null
+    return non_null.iloc[::len(non_null) // size][:size]
+
+
+def _convert_series(series):
+    """
+    Converte uma coluna object para datetime ou numérico, se todos os valores permitirem
+
+    O tipo alvo é decidido numa amostra; a coluna inteira só é convertida
+    quando a amostra inteira converte. Datas com formato detectável são
+    lidas com format explícito (parse vetorizado); só quando alguma linha
+    fora da amostra não casa com o formato é feito o parse genérico.
+
+    Returns:
+        tuple: (Series, método usado: 'datetime_format', 'datetime',
+            'numeric' ou None se a coluna não mudou)
+    """
+    if series.dtype != 'object':
+        return series, None
+
+    non_null = series.dropna()
+    if len(non_null) == 0:
+        return series, None
+
+    sample = _type_sample(non_null)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+
+        if sample.map(lambda v: isinstance(v, str)).all():
+            fmt = infer_datetime_format(sample)
+            if fmt:
+                parsed = pd.to_datetime(series, format=fmt, errors='coerce')
+                if parsed.notna().sum() == len(non_null):
+                    return parsed, 'datetime_format'
+                # Formatos misturados: candidata real, tenta o parse genérico
+                try:
+                    return pd.to_datetime(series), 'datetime'
+                except (ValueError, TypeError, OverflowError):
+                    return series, None
+
+            is_number = sample.str.strip().str.fullmatch(r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?')
+            if not is_number.all():
+                # Texto sem formato de data fixo: só tenta o parse genérico se a amostra
+                # inteira for data (primeiro alguns valores, para descartar texto comum rápido)
+                if (not is_number.any()
+                        and pd.to_datetime(sample.head(20), errors='coerce', format='mixed').notna().all()
+                        and pd.to_datetime(sample, errors='coerce', format='mixed').notna().all()):
+                    try:
+                        return pd.to_datetime(series, format='mixed'), 'datetime'
+                    except (ValueError, TypeError, OverflowError):
+                        pass
+                return series, None
+
+        elif sample.map(lambda v: isinstance(v, (pd.Timestamp, np.datetime64)) or hasattr(v, 'isoformat')).all():
+            try:
+                return pd.to_datetime(series), 'datetime'
+            except (ValueError, TypeError, OverflowError):
+                return series, None
+
+        try:
+            return pd.to_numeric(series), 'numeric'
+        except (ValueError, TypeError):
+            return series, None
+
+
+def _stream_dtypes(chunk):
+    """
+    Tipo alvo de cada coluna de um fluxo, decidido uma vez (no primeiro chunk)
+
+    Colunas object seguem _convert_series; as demais guardam a família do
+    tipo que já têm, para que chunks seguintes lidos com outro tipo (ex:
+    um texto no meio de uma coluna numérica) voltem a ela.
+
+    Returns:
+        dict: {coluna: (tipo, formato)} com tipo 'datetime', 'numeric' ou 'text'
+    """
+    targets = {}
+    for col in chunk.columns:
+        series = chunk[col]
+        if series.dtype == 'object':
+            _, method = _convert_series(series)
+            if method == 'datetime_format':
+                targets[col] = ('datetime', infer_datetime_format(_type_sample(series.dropna())))
+            elif method == 'datetime':
+                targets[col] = ('datetime', 'mixed')
+            elif method == 'numeric':
+                targets[col] = ('numeric', None)
+            else:
+                targets[col] = ('text', None)
+        elif pd.api.types.is_datetime64_any_dtype(series.dtype):
+            targets[col] = ('datetime', 'mixed')
+        elif _is_numeric(series.dtype):
+            targets[col] = ('numeric', None)
+    return targets
+
+
+def _apply_dtypes(chunk, targets, report):
+    """Converte o chunk para os tipos de _stream_dtypes; valores que não convertem viram nulos"""
+    chunk = chunk.copy()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for col, (kind, fmt) in targets.items():
+            if col not in chunk.columns:
+                continue
+            series = chunk[col]
+            if kind == 'datetime' and not pd.api.types.is_datetime64_any_dtype(series.dtype):
+                converted = pd.to_datetime(series, format=fmt, errors='coerce')
+            elif kind == 'numeric' and not _is_numeric(series.dtype):
+                converted = pd.to_numeric(series, errors='coerce')
+            elif kind == 'text' and series.dtype != 'object':
+                converted = series.astype(object)
+            else:
+                continue
+            report['values_coerced'] = (report.get('values_coerced', 0)
+                                        + int(converted.isna().sum() - series.isna().sum()))
+            chunk[col] = converted
+    return chunk
+
+
+def _date_features(series, name):
+    """Features de data derivadas de uma coluna (ano, mês, dia, dia da semana, trimestre)"""
+    return {
+        f'{name}_year': series.dt.year,
+        f'{name}_month': series.dt.month,
+        f'{name}_day': series.dt.day,
+        f'{name}_dayofweek': series.dt.dayofweek,
+        f'{name}_quarter': series.dt.quarter
+    }
 
 
 class DataTransformer:
@@ -17,6 +337,7 @@ class DataTransformer:
 
     def __init__(self):
         self.transformations_log = []
+        self.duplicates = get_detector()
         logger.info("DataTransformer inicializado")
 
     def clean_column_names(self, df):
@@ -25,14 +346,8 @@ class DataTransformer:
         """
         df = df.copy()
 
-        def clean_name(name):
-            name = str(name).lower().strip()
-            name = re.sub(r'[^\w\s]', '', name)
-            name = re.sub(r'\s+', '_', name)
-            return name
-
         original_columns = df.columns.tolist()
-        df.columns = [clean_name(col) for col in df.columns]
+        df.columns = [_clean_name(col) for col in df.columns]
 
         self._log_transformation('clean_column_names', {
             'original': original_columns,
@@ -61,30 +376,15 @@ class DataTransformer:
             df = df.dropna()
             logger.info(f"Linhas removidas: {missing_before}")
 
-        elif strategy == 'fill_mean':
-            for col in df.select_dtypes(include=[np.number]).columns:
-                df[col].fillna(df[col].mean(), inplace=True)
-            logger.info("Valores faltantes preenchidos com média")
-
-        elif strategy == 'fill_median':
-            for col in df.select_dtypes(include=[np.number]).columns:
-                df[col].fillna(df[col].median(), inplace=True)
-            logger.info("Valores faltantes preenchidos com mediana")
-
-        elif strategy == 'fill_mode':
+        elif strategy in ('fill_mean', 'fill_median', 'fill_mode', 'auto'):
             for col in df.columns:
-                if df[col].dtype == 'object':
-                    df[col].fillna(df[col].mode()[0] if not df[col].mode().empty else 'Unknown', inplace=True)
-            logger.info("Valores faltantes preenchidos com moda")
-
-        elif strategy == 'auto':
-            for col in df.columns:
-                if df[col].isnull().sum() > 0:
-                    if df[col].dtype in ['int64', 'float64']:
-                        df[col].fillna(df[col].median(), inplace=True)
-                    else:
-                        df[col].fillna(df[col].mode()[0] if not df[col].mode().empty else 'Unknown', inplace=True)
-            logger.info("Valores faltantes tratados automaticamente")
+                df[col] = _fill_missing(df[col], strategy)
+            logger.info({
+                'fill_mean': "Valores faltantes preenchidos com média",
+                'fill_median': "Valores faltantes preenchidos com mediana",
+                'fill_mode': "Valores faltantes preenchidos com moda",
+                'auto': "Valores faltantes tratados automaticamente"
+            }[strategy])
 
         missing_after = df.isnull().sum().sum()
         self._log_transformation('handle_missing_values', {
@@ -97,10 +397,12 @@ class DataTransformer:
     def remove_duplicates(self, df, subset=None):
         """
         Remove linhas duplicadas
+
+        Usa os hashes de linha do detector compartilhado (calculados uma
+        vez por DataFrame e subset).
         """
-        df = df.copy()
         before = len(df)
-        df = df.drop_duplicates(subset=subset)
+        df = self.duplicates.drop(df, subset=subset).copy()
         after = len(df)
 
         removed = before - after
@@ -115,31 +417,43 @@ class DataTransformer:
 
         return df
 
-    def convert_dtypes(self, df):
+    def convert_dtypes(self, df, parallel=True, max_workers=None):
         """
         Converte tipos de dados automaticamente
-        """
-        df = df.copy()
 
-        for col in df.columns:
-            # Tenta converter para datetime
-            if df[col].dtype == 'object':
-                try:
-                    df[col] = pd.to_datetime(df[col])
-                    logger.debug(f"Coluna {col} convertida para datetime")
-                    continue
-                except:
-                    pass
+        O tipo de cada coluna de texto é inferido numa amostra; só colunas
+        candidatas passam pelo parse completo (ver _convert_series).
 
-                # Tenta converter para numérico
-                try:
-                    df[col] = pd.to_numeric(df[col])
-                    logger.debug(f"Coluna {col} convertida para numérico")
-                except:
-                    pass
+        Args:
+            df: DataFrame
+            parallel: Se True, converte as colunas de texto em threads
+            max_workers: Threads (padrão: Settings.TRANSFORM_WORKERS)
+        """
+        df = df.copy()
+        columns = [col for col in df.columns if df[col].dtype == 'object']
+
+        def convert(col):
+            start = time.perf_counter()
+            converted, method = _convert_series(df[col])
+            return col, converted, method, time.perf_counter() - start
+
+        workers = min(max_workers or Settings.TRANSFORM_WORKERS, len(columns)) if parallel else 1
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(convert, columns))
+        else:
+            results = [convert(col) for col in columns]
+
+        timings = {}
+        for col, converted, method, seconds in results:
+            if method:
+                df[col] = converted
+                logger.debug(f"Coluna {col} convertida para {converted.dtype} ({method}, {seconds:.3f}s)")
+            timings[col] = {'dtype': str(df[col].dtype), 'method': method, 'seconds': round(seconds, 4)}
 
         self._log_transformation('convert_dtypes', {
-            'dtypes': df.dtypes.to_dict()
+            'dtypes': df.dtypes.to_dict(),
+            'columns': timings
         })
 
         return df
@@ -156,11 +470,8 @@ class DataTransformer:
                 df[date_column] = pd.to_datetime(df[date_column])
 
             # Cria features de data
-            df[f'{date_column}_year'] = df[date_column].dt.year
-            df[f'{date_column}_month'] = df[date_column].dt.month
-            df[f'{date_column}_day'] = df[date_column].dt.day
-            df[f'{date_column}_dayofweek'] = df[date_column].dt.dayofweek
-            df[f'{date_column}_quarter'] = df[date_column].dt.quarter
+            for name, values in _date_features(df[date_column], date_column).items():
+                df[name] = values
 
             logger.info(f"Features de data criadas a partir de {date_column}")
 
@@ -170,6 +481,144 @@ class DataTransformer:
 
         return df
 
+    def transform_chunks(self, chunks, steps):
+        """
+        Aplica transformações a um iterável de chunks, um chunk por vez
+
+        Args:
+            chunks: Iterável de DataFrames (ex: FileExtractor.iter_csv_chunks)
+            steps: Lista de nomes de métodos ou tuplas (nome, kwargs),
+                ex: ['clean_column_names', ('handle_missing_values', {'strategy': 'drop'})]
+
+        Yields:
+            DataFrame transformado para cada chunk
+
+        Note:
+            Cada chunk é tratado de forma independente: estatísticas como
+            mediana e moda, e a detecção de duplicatas, valem por chunk.
+            Para estatísticas e duplicatas globais, use transform_stream.
+        """
+        operations = []
+        for step in steps:
+            name, kwargs = (step, {}) if isinstance(step, str) else step
+            operations.append((getattr(self, name), kwargs))
+
+        for chunk in chunks:
+            for operation, kwargs in operations:
+                chunk = operation(chunk, **kwargs)
+            yield chunk
+
+    def transform_stream(self, source, steps):
+        """
+        Aplica transformações a um fluxo de chunks com resultado global
+
+        Diferente de transform_chunks, a mediana/média/moda usadas por
+        handle_missing_values são do conjunto inteiro (resumos mergeáveis
+        acumulados numa passada de leitura antes da passada final) e
+        remove_duplicates remove duplicatas entre chunks, mantendo a
+        primeira ocorrência (hashes de linha num HashIndex). Só um chunk
+        fica em memória por vez.
+
+        Args:
+            source: Função sem argumentos que devolve um novo iterável de
+                chunks, ex: lambda: extractor.iter_csv_chunks(path). Um
+                iterável reutilizável (lista) também serve; um iterador
+                simples só é aceito se nenhum passo precisar de estatísticas.
+            steps: Como em transform_chunks
+
+        Returns:
+            Gerador com cada DataFrame transformado (chunks vazios são
+            omitidos); os argumentos são validados já na chamada
+
+        Raises:
+            ValueError: Passo ou estratégia desconhecidos, ou source que não
+                pode ser relido quando há estatísticas globais
+
+        Note:
+            A mediana vem de um sketch KLL (exata até alguns milhares de
+            valores, erro de rank ~1% acima disso) e a moda é exata enquanto
+            a coluna tiver até Settings.STREAM_MODE_CAPACITY valores distintos.
+            convert_dtypes decide o tipo de cada coluna uma vez, no primeiro
+            chunk, e converte todos os chunks para ele (valores que não
+            convertem viram nulos e são contados em values_coerced no log).
+        """
+        operations = [(step, {}) if isinstance(step, str) else step for step in steps]
+        for name, kwargs in operations:
+            if not callable(getattr(self, name, None)):
+                raise ValueError(f"Passo desconhecido: {name}")
+            if name == 'handle_missing_values' and kwargs.get('strategy', 'auto') not in MISSING_STRATEGIES:
+                raise ValueError(f"Estratégia desconhecida: {kwargs['strategy']} "
+                                 f"(use {', '.join(MISSING_STRATEGIES)})")
+
+        stat_steps = [i for i, (name, kwargs) in enumerate(operations)
+                      if name == 'handle_missing_values' and kwargs.get('strategy', 'auto') != 'drop']
+
+        if callable(source):
+            open_source = source
+        elif stat_steps and iter(source) is source:
+            raise ValueError("transform_stream precisa de uma função que reabra os chunks "
+                             "para calcular estatísticas globais")
+        else:
+            open_source = lambda: source
+
+        return self._iter_stream(open_source, operations, stat_steps)
+
+    def _iter_stream(self, open_source, operations, stat_steps):
+        """Gerador de transform_stream, depois da validação dos argumentos"""
+        # Uma passada de leitura por passo que precisa de estatísticas globais
+        fill_values = {}
+        # Tipos de convert_dtypes, fixados no primeiro chunk e reaproveitados em todas as passadas
+        dtype_targets = {}
+        for index in stat_steps:
+            stats = _StreamStats()
+            for chunk in self._stream_pass(open_source(), operations[:index], fill_values, {}, dtype_targets):
+                stats.update(chunk)
+            fill_values[index] = stats.fill_values(operations[index][1].get('strategy', 'auto'))
+
+        report = {'rows_in': 0, 'rows_out': 0, 'chunks': 0, 'duplicates_removed': 0, 'values_coerced': 0}
+        for chunk in self._stream_pass(open_source(), operations, fill_values, report, dtype_targets):
+            report['chunks'] += 1
+            report['rows_out'] += len(chunk)
+            yield chunk
+
+        self._log_transformation('transform_stream', {
+            'steps': [name for name, _ in operations],
+            'passes': len(stat_steps) + 1,
+            'fill_values': {operations[i][0] + f'[{i}]': values for i, values in fill_values.items()},
+            'dtypes': {operations[i][0] + f'[{i}]': targets for i, targets in dtype_targets.items()},
+            **report
+        })
+        logger.info(f"Stream transformado: {report['rows_in']} → {report['rows_out']} linhas "
+                    f"em {report['chunks']} chunks ({len(stat_steps) + 1} passadas)")
+
+    def _stream_pass(self, chunks, operations, fill_values, report, dtype_targets):
+        """Aplica operations a cada chunk com preenchimento, tipos e deduplicação globais"""
+        indexes = {i: HashIndex() for i, (name, _) in enumerate(operations) if name == 'remove_duplicates'}
+        try:
+            for chunk in chunks:
+                report['rows_in'] = report.get('rows_in', 0) + len(chunk)
+                for i, (name, kwargs) in enumerate(operations):
+                    if i in fill_values:
+                        chunk = _fill_from_values(chunk, kwargs.get('strategy', 'auto'), fill_values[i])
+                    elif i in indexes:
+                        keep = indexes[i].new_rows(chunk, kwargs.get('subset'))
+                        report['duplicates_removed'] = report.get('duplicates_removed', 0) + int((~keep).sum())
+                        chunk = chunk[keep]
+                    elif name == 'handle_missing_values':
+                        chunk = chunk.dropna()
+                    elif name == 'convert_dtypes':
+                        if i not in dtype_targets:
+                            dtype_targets[i] = _stream_dtypes(chunk)
+                        chunk = _apply_dtypes(chunk, dtype_targets[i], report)
+                    else:
+                        chunk = getattr(self, name)(chunk, **kwargs)
+                if len(chunk):
+                    yield chunk
+        finally:
+            # Remove arquivos de índices que foram para disco
+            for index in indexes.values():
+                index.close()
+
     def _log_transformation(self, operation, details):
         """Registra transformação no log interno"""
         self.transformations_log.append({
@@ -179,4 +628,194 @@ class DataTransformer:
 
     def get_transformation_log(self):
         """Retorna log de transformações"""
-        return self.transformations_log
\ No newline at end of file
+        return self.transformations_log
+
+    def pipeline(self):
+        """Cria um TransformationPipeline que registra no log deste transformer"""
+        return TransformationPipeline(self)
+
+
+class TransformationPipeline:
+    """
+    Pipeline preguiçoso de transformações do DataTransformer
+
+    Os passos são só registrados; run() executa o plano sobre uma única
+    cópia de trabalho. Passos por coluna consecutivos (handle_missing_values
+    com preenchimento, convert_dtypes, create_features) são fundidos numa
+    única passada pelas colunas; clean_column_names só troca os rótulos e
+    remove_duplicates / handle_missing_values('drop') são passos por linha.
+
+    Exemplo:
+        pipeline = DataTransformer().pipeline()
+        df = (pipeline.clean_column_names()
+                      .convert_dtypes()
+                      .handle_missing_values('auto')
+                      .remove_duplicates()
+                      .run(df))
+        pipeline.last_report['peak_mb']
+    """
+
+    COLUMN_STEPS = ('handle_missing_values', 'convert_dtypes', 'create_features')
+
+    def __init__(self, transformer=None):
+        self.transformer = transformer or DataTransformer()
+        self.steps = []
+        self.last_report = None
+
+    def clean_column_names(self):
+        return self._add('clean_column_names')
+
+    def handle_missing_values(self, strategy='auto'):
+        return self._add('handle_missing_values', strategy=strategy)
+
+    def remove_duplicates(self, subset=None):
+        return self._add('remove_duplicates', subset=subset)
+
+    def convert_dtypes(self):
+        return self._add('convert_dtypes')
+
+    def create_features(self, date_column=None):
+        return self._add('create_features', date_column=date_column)
+
+    def _add(self, name, **kwargs):
+        self.steps.append((name, kwargs))
+        return self
+
+    def plan(self):
+        """
+        Agrupa os passos em estágios de execução
+
+        Returns:
+            list: tuplas (tipo, passos) com tipo 'labels', 'columns' (passos
+                fundidos numa única passada) ou 'rows'
+        """
+        stages = []
+        for name, kwargs in self.steps:
+            if name == 'clean_column_names':
+                kind = 'labels'
+            elif name in self.COLUMN_STEPS and kwargs.get('strategy') != 'drop':
+                kind = 'columns'
+            else:
+                kind = 'rows'
+
+            if kind == 'columns' and stages and stages[-1][0] == 'columns':
+                stages[-1][1].append((name, kwargs))
+            else:
+                stages.append((kind, [(name, kwargs)]))
+        return stages
+
+    def run(self, df, inplace=False, trace_memory=False):
+        """
+        Executa o plano
+
+        Args:
+            df: DataFrame de entrada
+            inplace: Se True, trabalha direto sobre df (sem nenhuma cópia)
+            trace_memory: Se True, mede o pico com tracemalloc (exato, porém
+                bem mais lento) em vez de amostrar o RSS do processo
+
+        Returns:
+            DataFrame transformado. O relatório da execução fica em
+            last_report: passos, estágios, segundos, linhas de entrada e
+            saída e pico de memória acima do início da execução.
+        """
+        start = time.perf_counter()
+        rows_in = len(df)
+
+        with _PeakMemory(trace=trace_memory) as memory:
+            # Única cópia da execução; com copy-on-write ativo nem ela é física
+            cow = pd.options.mode.copy_on_write is True
+            work = df if inplace else df.copy(deep=not cow)
+
+            stages = self.plan()
+            for kind, steps in stages:
+                if kind == 'labels':
+                    original = work.columns.tolist()
+                    work.columns = [_clean_name(col) for col in work.columns]
+                    self.transformer._log_transformation('clean_column_names', {
+                        'original': original,
+                        'new': work.columns.tolist()
+                    })
+                elif kind == 'columns':
+                    work = self._run_column_stage(work, steps)
+                else:
+                    work = self._run_row_stage(work, *steps[0])
+
+        self.last_report = {
+            'steps': [name for name, _ in self.steps],
+            'stages': [(kind, [name for name, _ in steps]) for kind, steps in stages],
+            'seconds': time.perf_counter() - start,
+            'rows_in': rows_in,
+            'rows_out': len(work),
+            'peak_mb': memory.peak_mb,
+            'memory_source': memory.source
+        }
+        logger.info(f"Pipeline executado: {len(self.steps)} passos em {len(stages)} estágios, "
+                    f"pico de {self.last_report['peak_mb']:.1f} MB")
+        return work
+
+    def _run_column_stage(self, work, steps):
+        """Aplica os passos por coluna numa única passada, coluna a coluna"""
+        missing = {i: [0, 0] for i, (name, _) in enumerate(steps) if name == 'handle_missing_values'}
+        converted = {}
+
+        def apply(series, col, first_step):
+            features = []
+            for i in range(first_step, len(steps)):
+                name, kwargs = steps[i]
+                if name == 'handle_missing_values':
+                    missing[i][0] += int(series.isna().sum())
+                    series = _fill_missing(series, kwargs.get('strategy', 'auto'))
+                    missing[i][1] += int(series.isna().sum())
+                elif name == 'convert_dtypes':
+                    start = time.perf_counter()
+                    series, method = _convert_series(series)
+                    converted[col] = {'dtype': str(series.dtype), 'method': method,
+                                      'seconds': round(time.perf_counter() - start, 4)}
+                elif name == 'create_features' and col == kwargs.get('date_column'):
+                    if not pd.api.types.is_datetime64_any_dtype(series):
+                        series = pd.to_datetime(series)
+                    # Features passam pelos passos seguintes do mesmo estágio
+                    features.extend((feature, values, i + 1)
+                                    for feature, values in _date_features(series, col).items())
+            return series, features
+
+        pending = []
+        for col in list(work.columns):
+            series = work[col]
+            result, features = apply(series, col, 0)
+            if result is not series:
+                work[col] = result
+            pending.extend(features)
+
+        while pending:
+            feature, values, first_step = pending.pop(0)
+            values, features = apply(values, feature, first_step)
+            work[feature] = values
+            pending.extend(features)
+
+        for i, (name, kwargs) in enumerate(steps):
+            if name == 'handle_missing_values':
+                details = {'missing_before': missing[i][0], 'missing_after': missing[i][1]}
+            elif name == 'convert_dtypes':
+                details = {'dtypes': work.dtypes.to_dict(), 'columns': converted}
+            else:
+                details = {'new_columns': list(work.columns)}
+            self.transformer._log_transformation(name, details)
+        return work
+
+    def _run_row_stage(self, work, name, kwargs):
+        """Passos que removem linhas (geram um novo frame no lugar do anterior)"""
+        before = len(work)
+        if name == 'remove_duplicates':
+            work = self.transformer.duplicates.drop(work, subset=kwargs.get('subset'))
+            details = {'before': before, 'after': len(work), 'removed': before - len(work)}
+        else:
+            missing_before = int(work.isna().sum().sum())
+            work = work.dropna()
+            details = {'missing_before': missing_before, 'missing_after': 0}
+
+        self.transformer._log_transformation(name, details)
+        if before != len(work):
+            logger.info(f"{name}: {before - len(work)} linhas removidas")
+        return work
\ No newline at end of file
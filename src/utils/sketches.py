@@ -0,0 +1,341 @@
+# src/utils/sketches.py
+"""
+Resumos mergeáveis para estatísticas em streaming (chunk a chunk)
+
+Cada resumo tem update() para um chunk de valores e merge() para somar
+outro resumo do mesmo tipo, então chunks podem ser resumidos em qualquer
+ordem (ou em paralelo) e combinados no fim.
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+
+
+class KLLSketch:
+    """
+    Quantis aproximados com memória limitada (sketch KLL)
+
+    Até exact_size valores, guarda todos e os quantis são exatos (mesma
+    interpolação do pandas). Acima disso compacta: guarda no máximo ~3k
+    valores e o erro de rank é da ordem de 1.7/k (~1% com k=200).
+    """
+
+    def __init__(self, k=200, exact_size=100_000, seed=0):
+        self.k = k
+        self.exact_size = exact_size
+        self.n = 0
+        self.compactors = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Adiciona valores (NaN são ignorados)"""
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Soma outro sketch a este"""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        if len(self.compactors) == 1 and self.n <= self.exact_size:
+            return
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                items = np.sort(items)
+                # Número ímpar: o último item fica neste nível
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.compactors[level] = keep
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            level += 1
+
+    def quantile(self, q):
+        """Valor no quantil q (0 a 1); NaN se o sketch estiver vazio"""
+        if self.n == 0:
+            return np.nan
+        if len(self.compactors) == 1:
+            return float(np.quantile(self.compactors[0], q))
+
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(c), 2.0 ** level) for level, c in enumerate(self.compactors)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(items[order][min(index, len(items) - 1)])
+
+    def median(self):
+        return self.quantile(0.5)
+
+
+class HeavyHitters:
+    """
+    Valores mais frequentes com memória limitada (resumo Misra-Gries)
+
+    Guarda até capacity contadores. Enquanto o número de valores
+    distintos não passa disso, as contagens são exatas; depois, cada
+    contagem é subestimada em no máximo n / (capacity + 1).
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.n = 0
+        self.exact = True
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, values):
+        """Adiciona valores (Series ou array; nulos são ignorados)"""
+        counts = pd.Series(values).value_counts(dropna=True)
+        self.n += int(counts.sum())
+        return self._add(counts)
+
+    def merge(self, other):
+        """Soma outro resumo a este"""
+        self.n += other.n
+        self.exact = self.exact and other.exact
+        return self._add(other.counts)
+
+    def _add(self, counts):
+        if len(counts) == 0:
+            return self
+        merged = counts.astype('int64') if len(self.counts) == 0 else self.counts.add(counts, fill_value=0)
+        if len(merged) > self.capacity:
+            # Desconta a (capacity+1)-ésima maior contagem de todos e descarta os que zeram
+            threshold = merged.nlargest(self.capacity + 1).iloc[-1]
+            merged = merged - threshold
+            merged = merged[merged > 0]
+            self.exact = False
+        self.counts = merged.astype('int64')
+        return self
+
+    def top(self, n=10):
+        """Valores mais frequentes e contagens estimadas, em ordem decrescente"""
+        return self.counts.sort_values(ascending=False, kind='stable').head(n)
+
+    def mode(self):
+        """
+        Valor mais frequente (empates: o menor, como Series.mode()[0]) ou None
+        """
+        if len(self.counts) == 0:
+            return None
+        best = self.counts[self.counts == self.counts.max()]
+        try:
+            return best.index.sort_values()[0]
+        except TypeError:
+            return best.index[0]
+
+
+class Moments:
+    """
+    Contagem, média, momentos centrais (até o 4º), mínimo e máximo
+
+    Trabalha com vetores (uma posição por coluna). Cada chunk é resumido
+    com desvios centrados na média do chunk e combinado pelas fórmulas de
+    Chan/Pébay, numericamente estáveis mesmo com médias grandes.
+    """
+
+    def __init__(self, size):
+        self.n = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.m3 = np.zeros(size)
+        self.m4 = np.zeros(size)
+        self.min = np.full(size, np.nan)
+        self.max = np.full(size, np.nan)
+
+    def update(self, block):
+        """Adiciona um bloco 2-D (linhas x colunas) float64; NaN são ignorados"""
+        block = np.asarray(block, dtype='float64').reshape(len(block), -1)
+        missing = np.isnan(block)
+        other = Moments(block.shape[1])
+        other.n = (~missing).sum(axis=0).astype('float64')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            other.mean = np.where(other.n > 0, np.where(missing, 0, block).sum(axis=0) / other.n, 0)
+        centered = np.where(missing, 0, block - other.mean)
+        squared = centered * centered
+        other.m2 = squared.sum(axis=0)
+        other.m3 = (squared * centered).sum(axis=0)
+        other.m4 = (squared * squared).sum(axis=0)
+        if len(block):
+            with np.errstate(invalid='ignore'), warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                other.min = np.nanmin(block, axis=0)
+                other.max = np.nanmax(block, axis=0)
+        return self.merge(other)
+
+    def merge(self, other):
+        """Soma outro Moments (mesmas colunas) a este"""
+        na, nb = self.n, other.n
+        n = na + nb
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            ratio = np.where(n > 0, nb / n, 0)
+            mean = self.mean + delta * ratio
+            m2 = self.m2 + other.m2 + delta ** 2 * na * ratio
+            m3 = (self.m3 + other.m3 + delta ** 3 * na * nb * (na - nb) / n ** 2
+                  + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+            m4 = (self.m4 + other.m4 + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+                  + 6 * delta ** 2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2
+                  + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        empty = n == 0
+        self.mean = np.where(empty, 0, mean)
+        self.m2 = np.where(empty, 0, m2)
+        self.m3 = np.where(empty, 0, m3)
+        self.m4 = np.where(empty, 0, m4)
+        self.n = n
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self
+
+
+class HyperLogLog:
+    """
+    Contagem aproximada de valores distintos (HyperLogLog)
+
+    Até exact_size hashes distintos guarda os próprios hashes e a contagem
+    é exata (salvo colisões de 64 bits); acima disso usa 2^p registradores
+    (16 KB com p=14) e o erro típico é 1.04 / sqrt(2^p) (~0.8%).
+    """
+
+    def __init__(self, p=14, exact_size=100_000):
+        self.p = p
+        self.exact_size = exact_size
+        self.hashes = np.empty(0, dtype='uint64')
+        self.registers = None
+
+    def update(self, values):
+        """Adiciona valores (nulos são ignorados)"""
+        values = pd.Series(values).dropna()
+        if len(values):
+            self.add_hashes(pd.util.hash_array(values.to_numpy()))
+        return self
+
+    def add_hashes(self, hashes):
+        """Adiciona hashes uint64 já calculados"""
+        hashes = np.asarray(hashes, dtype='uint64')
+        if self.registers is None:
+            self.hashes = np.union1d(self.hashes, hashes)
+            if len(self.hashes) > self.exact_size:
+                self.registers = np.zeros(2 ** self.p, dtype='uint8')
+                self._add_registers(self.hashes)
+                self.hashes = None
+        else:
+            self._add_registers(hashes)
+        return self
+
+    def _add_registers(self, hashes):
+        bits = 64 - self.p
+        index = (hashes >> np.uint64(bits)).astype('int64')
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # Posição do primeiro bit 1 nos bits restantes (frexp dá o expoente)
+        exponent = np.frexp(rest.astype('float64'))[1]
+        rank = np.where(rest == 0, bits + 1, bits - exponent + 1).astype('uint8')
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """Soma outro HyperLogLog (mesmo p) a este"""
+        if other.registers is None:
+            return self.add_hashes(other.hashes)
+        if self.registers is None:
+            hashes, self.hashes = self.hashes, None
+            self.registers = other.registers.copy()
+            self._add_registers(hashes)
+        else:
+            np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """Número estimado de valores distintos"""
+        if self.registers is None:
+            return len(self.hashes)
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(2.0 ** -self.registers.astype('float64'))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class CoMoments:
+    """
+    Correlações de Pearson por pares de colunas com observações completas
+
+    Guarda, para cada par (i, j), o número de linhas com i e j não nulos
+    e as somas de x_i, x_i² e x_i·x_j nessas linhas (como DataFrame.corr).
+    Os valores são deslocados pela média do primeiro bloco para evitar
+    cancelamento numérico; merge converte o deslocamento do outro resumo.
+    """
+
+    def __init__(self, size):
+        self.shift = None
+        self.n = np.zeros((size, size))
+        self.sx = np.zeros((size, size))
+        self.sxx = np.zeros((size, size))
+        self.sxy = np.zeros((size, size))
+
+    def update(self, block):
+        """Adiciona um bloco 2-D (linhas x colunas) float64; NaN são ignorados"""
+        block = np.asarray(block, dtype='float64')
+        valid = ~np.isnan(block)
+        if self.shift is None:
+            counts = valid.sum(axis=0)
+            self.shift = np.where(counts > 0, np.where(valid, block, 0).sum(axis=0) / np.maximum(counts, 1), 0)
+        values = np.where(valid, block - self.shift, 0)
+        valid = valid.astype('float64')
+        self.n += valid.T @ valid
+        self.sx += values.T @ valid
+        self.sxx += (values * values).T @ valid
+        self.sxy += values.T @ values
+        return self
+
+    def merge(self, other):
+        """Soma outro CoMoments (mesmas colunas) a este"""
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        d = (other.shift - self.shift)[:, None]
+        n, sx = other.n, other.sx
+        self.sxy += other.sxy + d.T * sx + d * sx.T + n * d * d.T
+        self.sxx += other.sxx + 2 * d * sx + n * d * d
+        self.sx += sx + n * d
+        self.n += n
+        return self
+
+    def select(self, indices):
+        """Mantém só as colunas das posições indices"""
+        grid = np.ix_(indices, indices)
+        self.n, self.sx, self.sxx, self.sxy = self.n[grid], self.sx[grid], self.sxx[grid], self.sxy[grid]
+        if self.shift is not None:
+            self.shift = self.shift[indices]
+        return self
+
+    def corr(self):
+        """Matriz de correlação (NaN onde há menos de 2 pares ou variância zero)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self.n * self.sxy - self.sx * self.sx.T
+            var = self.n * self.sxx - self.sx * self.sx
+            result = cov / np.sqrt(var * var.T)
+        result[self.n < 2] = np.nan
+        return np.clip(result, -1, 1)
@@ -0,0 +1,9 @@
+# src/utils/sql.py
+"""
+Utilitários para montar SQL do SQLite
+"""
+
+
+def quote_identifier(name):
+    """Coloca um nome de tabela/coluna entre aspas duplas para uso em SQL"""
+    return '"' + str(name).replace('"', '""') + '"'
@@ -0,0 +1,55 @@
+# tests/test_analysis_cache.py
+"""
+Testes do cache de análises por impressão digital do conteúdo
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.analysis_cache import AnalysisCache, dataframe_fingerprint
+from src.analysis.exploratory import ExploratoryAnalyzer
+
+
+@pytest.fixture
+def df():
+    rows = 5000
+    return pd.DataFrame({
+        'n': np.arange(rows, dtype='float64'),
+        't': [f"texto {i}" for i in range(rows)],
+        'c': pd.Categorical(['a', 'b'] * (rows // 2)),
+        'i': pd.array(range(rows), dtype='Int64'),
+    })
+
+
+def test_fingerprint_stable_for_equal_content(df):
+    assert dataframe_fingerprint(df) == dataframe_fingerprint(df.copy())
+
+
+@pytest.mark.parametrize("column, value", [('n', -1.0), ('t', 'editado'), ('c', 'a'), ('i', -1)])
+def test_fingerprint_sees_every_cell(df, column, value):
+    before = dataframe_fingerprint(df)
+    # Uma linha qualquer, fora de qualquer amostra espaçada
+    df.loc[2347, column] = value
+    assert dataframe_fingerprint(df) != before
+
+
+def test_fingerprint_sees_row_order(df):
+    swapped = df.iloc[[1, 0] + list(range(2, len(df)))].reset_index(drop=True)
+    assert dataframe_fingerprint(swapped) != dataframe_fingerprint(df)
+
+
+def test_analyze_dataframe_cache(df, tmp_path):
+    analyzer = ExploratoryAnalyzer()
+    analyzer.cache = AnalysisCache(cache_dir=tmp_path)
+
+    first = analyzer.analyze_dataframe(df, "df", use_cache=True)
+    assert analyzer.analyze_dataframe(df, "df", use_cache=True) == first
+    assert analyzer.cache.hits == 1
+
+    df.loc[10, 't'] = 'editado'
+    analyzer.analyze_dataframe(df, "df", use_cache=True)
+    assert analyzer.cache.misses == 2
+
+    # Outro processo: só o disco
+    other = AnalysisCache(cache_dir=tmp_path)
+    assert other.get(dataframe_fingerprint(df)) is not None
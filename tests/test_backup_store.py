@@ -0,0 +1,68 @@
+# tests/test_backup_store.py
+"""
+Testes do backup incremental por páginas (PageBackupStore)
+"""
+
+import sqlite3
+import pytest
+from config.settings import Settings
+from src.data.backup_store import PageBackupStore
+from src.data.sqlite_manager import SQLiteManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, 'BACKUP_DIR', tmp_path / "backups")
+    manager = SQLiteManager(tmp_path / "test.db")
+    yield manager
+    manager.close()
+
+
+def _rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        return conn.execute("SELECT id, v FROM t ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_snapshot_round_trip(manager, tmp_path):
+    manager.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    manager.execute_query("INSERT INTO t (v) VALUES " + ", ".join(f"('{'x' * 200}{i}')" for i in range(2000)))
+    first_rows = manager.sql_to_df("SELECT id, v FROM t ORDER BY id").values.tolist()
+
+    first = manager.backup_database(incremental=True, sleep=0)
+    assert first['new_pages'] == first['page_count']
+
+    # Escrita pequena: fica no WAL até o próximo checkpoint
+    manager.execute_query("UPDATE t SET v = 'changed' WHERE id = 7")
+    second_rows = manager.sql_to_df("SELECT id, v FROM t ORDER BY id").values.tolist()
+
+    second = manager.backup_database(incremental=True, sleep=0)
+    assert 0 < second['new_pages'] < second['page_count'] / 2
+
+    store = PageBackupStore()
+    assert [s['id'] for s in store.list_snapshots()] == [first['id'], second['id']]
+    assert _rows(store.restore(first['id'], tmp_path / "first.db")) == [tuple(r) for r in first_rows]
+    assert _rows(store.restore(second['id'], tmp_path / "second.db")) == [tuple(r) for r in second_rows]
+
+
+def test_snapshot_without_temporary_copy(manager):
+    manager.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    manager.execute_query("INSERT INTO t (v) VALUES ('a'), ('b')")
+    assert manager.backup_database(incremental=True, sleep=0)
+    assert sorted(p.name for p in Settings.BACKUP_DIR.iterdir()) == ["page_store.db"]
+
+
+def test_prune_keeps_pages_in_use(manager, tmp_path):
+    manager.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    manager.execute_query("INSERT INTO t (v) VALUES ('a')")
+    manager.backup_database(incremental=True, sleep=0)
+    manager.execute_query("INSERT INTO t (v) VALUES ('b')")
+    last = manager.backup_database(incremental=True, sleep=0)
+
+    store = PageBackupStore()
+    assert store.prune(keep_days=-1, keep_last=1) == 1
+    assert _rows(store.restore(target_path=tmp_path / "last.db")) == [(1, 'a'), (2, 'b')]
+    assert [s['id'] for s in store.list_snapshots()] == [last['id']]
@@ -0,0 +1,84 @@
+# tests/test_column_stats.py
+"""
+Testes de compute_column_stats contra as estatísticas do pandas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.column_stats import compute_column_stats
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    rows = 500
+    values = rng.gamma(2.0, size=rows)
+    values[::17] = np.nan
+    return pd.DataFrame({
+        'gamma': values,
+        'ints': rng.integers(0, 20, size=rows),
+        'nullable': pd.array(np.where(np.arange(rows) % 3, np.arange(rows), -1), dtype='Int64'),
+        'constant': 7.5,
+        'few': [1.0, 2.0, 4.0] + [np.nan] * (rows - 3),
+        'empty': np.nan,
+        'flag': rng.integers(0, 2, size=rows).astype(bool),
+        'text': [f"t{i % 11}" if i % 5 else None for i in range(rows)],
+    }).assign(nullable=lambda d: d['nullable'].mask(d['nullable'] < 0))
+
+
+def test_matches_pandas(df):
+    stats = compute_column_stats(df)
+    numeric = df.select_dtypes(include=[np.number]).astype('float64')
+    assert stats.numeric_columns == list(numeric.columns)
+
+    describe = numeric.describe()
+    pd.testing.assert_frame_equal(stats.numeric.loc[describe.index], describe, check_dtype=False)
+    pd.testing.assert_series_equal(stats.numeric.loc['skewness'], numeric.skew(),
+                                   check_names=False, check_dtype=False)
+    pd.testing.assert_series_equal(stats.numeric.loc['kurtosis'], numeric.kurtosis(),
+                                   check_names=False, check_dtype=False)
+    pd.testing.assert_frame_equal(stats.corr, numeric.corr(), check_dtype=False)
+
+    assert stats.rows == len(df)
+    assert stats.nulls.to_dict() == df.isna().sum().to_dict()
+    assert stats.n_unique.to_dict() == df.nunique().to_dict()
+    assert stats.total_nulls == int(df.isna().sum().sum())
+
+
+def test_percentiles_and_no_numeric_columns(df):
+    stats = compute_column_stats(df[['gamma']], percentiles=(.1, .5, .9), correlation=False)
+    expected = df[['gamma']].describe(percentiles=[.1, .5, .9])
+    pd.testing.assert_frame_equal(stats.numeric.loc[expected.index], expected)
+    assert stats.corr is None
+
+    text_only = compute_column_stats(df[['text', 'flag']])
+    assert text_only.numeric.empty and text_only.corr is None
+    assert text_only.nulls['text'] == df['text'].isna().sum()
+
+
+def test_empty_frame(df):
+    stats = compute_column_stats(df.iloc[:0])
+    expected = df.iloc[:0].select_dtypes(include=[np.number]).astype('float64').describe()
+    pd.testing.assert_frame_equal(stats.numeric.loc[expected.index], expected, check_dtype=False)
+    assert stats.rows == 0 and stats.total_nulls == 0
+    assert stats.corr.isna().all().all()
+
+
+@pytest.mark.parametrize("n_jobs", [2, 3, -1])
+def test_sharded_matches_sequential(df, n_jobs):
+    expected = compute_column_stats(df)
+    actual = compute_column_stats(df, n_jobs=n_jobs)
+    pd.testing.assert_frame_equal(actual.numeric, expected.numeric)
+    pd.testing.assert_frame_equal(actual.corr, expected.corr)
+    pd.testing.assert_series_equal(actual.nulls, expected.nulls)
+    pd.testing.assert_series_equal(actual.n_unique, expected.n_unique)
+
+
+def test_sharded_edge_cases(df):
+    # Mais processos que colunas numéricas, DataFrame vazio e sem correlação
+    one = compute_column_stats(df[['gamma', 'text']], n_jobs=4)
+    pd.testing.assert_frame_equal(one.numeric, compute_column_stats(df[['gamma', 'text']]).numeric)
+    empty = compute_column_stats(df.iloc[:0], n_jobs=2)
+    assert empty.rows == 0 and empty.numeric.loc['count'].eq(0).all()
+    assert compute_column_stats(df, correlation=False, n_jobs=2).corr is None
@@ -0,0 +1,82 @@
+# tests/test_connection_pool.py
+"""
+Testes do pool de conexões SQLite (WAL, leitores somente leitura)
+"""
+
+import sqlite3
+import threading
+import pytest
+from src.data.connection_pool import SQLiteConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLiteConnectionPool(tmp_path / "test.db", readers=2)
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(100)])
+        conn.commit()
+    yield pool
+    pool.close()
+
+
+def test_wal_mode(pool):
+    with pool.reader() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+
+def test_readers_are_read_only(pool):
+    with pool.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO t VALUES (1)")
+
+
+def test_readers_reused(pool):
+    with pool.reader() as first:
+        pass
+    with pool.reader() as second:
+        assert second is first
+
+
+def test_read_during_open_write(pool):
+    with pool.writer() as conn:
+        conn.execute("INSERT INTO t VALUES (1000)")
+        # Escrita ainda não confirmada: leitores veem o último commit sem esperar
+        with pool.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 100
+        conn.commit()
+    with pool.reader() as reader:
+        assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 101
+
+
+def test_concurrent_readers(pool):
+    results = []
+
+    def read():
+        with pool.reader() as conn:
+            results.append(conn.execute("SELECT SUM(v) FROM t").fetchone()[0])
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [4950] * 8
+
+
+def test_writer_rolls_back_on_error(pool):
+    with pytest.raises(ValueError):
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO t VALUES (-1)")
+            raise ValueError()
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t WHERE v = -1").fetchone()[0] == 0
+
+
+def test_in_memory_uses_writer():
+    pool = SQLiteConnectionPool(':memory:')
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.close()
@@ -0,0 +1,62 @@
+# tests/test_csv_sniffer.py
+"""
+Testes da detecção de encoding e separador de CSV
+"""
+
+import codecs
+import io
+import pandas as pd
+import pytest
+from src.data.csv_sniffer import (detect_encoding, detect_separator, read_csv_auto,
+                                  resolve_csv_options, sniff_csv_format)
+
+ROWS = "nome;cidade;valor\nJoão;São Paulo;1,5\nAna;Brasília;2\n"
+
+
+@pytest.mark.parametrize("encoding, expected", [
+    ('utf-8', 'utf-8'),
+    ('cp1252', 'cp1252'),
+    ('utf-16', 'utf-16'),
+])
+def test_detect_encoding(encoding, expected):
+    assert detect_encoding(ROWS.encode(encoding), complete=True) == expected
+
+
+def test_detect_encoding_bom_and_cut_multibyte():
+    assert detect_encoding(codecs.BOM_UTF8 + ROWS.encode()) == 'utf-8-sig'
+    # Amostra cortada no meio de "ã": continua sendo UTF-8
+    data = "São".encode()
+    assert detect_encoding(data[:2], complete=False) == 'utf-8'
+
+
+@pytest.mark.parametrize("sep", [',', ';', '\t', '|'])
+def test_detect_separator(sep):
+    text = "\n".join(sep.join(f"c{i}{j}" for j in range(4)) for i in range(10))
+    assert detect_separator(text + "\nc10" + sep + "cortad") == sep
+
+
+def test_sniff_reads_one_sample(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(ROWS.encode('cp1252'))
+    assert sniff_csv_format(path) == {'encoding': 'cp1252', 'sep': ';'}
+    assert resolve_csv_options(path, encoding='auto', sep=',') == {'encoding': 'cp1252', 'sep': ','}
+    assert resolve_csv_options(path, sep=';') == {'sep': ';'}
+
+
+def test_read_csv_auto_falls_back_after_sample(tmp_path):
+    # Amostra toda ASCII (detectada como UTF-8); o byte cp1252 só aparece no fim
+    path = tmp_path / "data.csv"
+    body = "a;b\n" + "".join(f"{i};x\n" for i in range(20_000))
+    path.write_bytes(body.encode() + "1;ção\n".encode('cp1252'))
+
+    df, options = read_csv_auto(path, encoding='auto', sep='auto')
+    assert options == {'encoding': 'cp1252', 'sep': ';'}
+    assert len(df) == 20_001 and df['b'].iloc[-1] == 'ção'
+
+
+def test_read_csv_auto_file_object():
+    source = io.BytesIO(ROWS.encode('utf-8'))
+    df, options = read_csv_auto(source, encoding='auto', sep='auto', decimal=',')
+    assert options == {'encoding': 'utf-8', 'sep': ';'}
+    assert df['valor'].tolist() == [1.5, 2.0]
+    pd.testing.assert_frame_equal(df, pd.read_csv(io.BytesIO(ROWS.encode()), sep=';', decimal=','))
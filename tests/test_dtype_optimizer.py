@@ -0,0 +1,58 @@
+# tests/test_dtype_optimizer.py
+"""
+Testes da redução de tipos logo após o parse
+"""
+
+import numpy as np
+import pandas as pd
+from src.data.dtype_optimizer import infer_datetime_format, optimize_dtypes
+
+
+def test_values_preserved():
+    df = pd.DataFrame({
+        'small': np.arange(100, dtype='int64'),
+        'big': np.arange(100, dtype='int64') * 10 ** 10,
+        'exact': np.arange(100, dtype='float64') / 4,
+        'inexact': np.arange(100, dtype='float64') / 3,
+        'flag': [True, False] * 50,
+    })
+    optimized, report = optimize_dtypes(df)
+
+    assert optimized['small'].dtype == 'int8'
+    assert optimized['big'].dtype == 'int64'
+    assert optimized['exact'].dtype == 'float32'
+    assert optimized['inexact'].dtype == 'float64'
+    assert optimized['flag'].dtype == 'bool'
+    pd.testing.assert_frame_equal(optimized.astype(df.dtypes.to_dict()), df)
+    assert report['after_mb'] <= report['before_mb']
+    assert set(report['changes']) == {'small', 'exact'}
+
+
+def test_integers_stay_signed():
+    optimized, _ = optimize_dtypes(pd.DataFrame({'a': [1, 2, 3]}))
+    assert (optimized['a'] - 5).tolist() == [-4, -3, -2]
+
+
+def test_text_columns():
+    df = pd.DataFrame({
+        'day': [f"2024-01-{d:02d}" for d in range(1, 31)] * 2,
+        'city': ['SP', 'RJ', 'BH'] * 20,
+        'free': [f"texto {i}" for i in range(60)],
+        'ids': [str(i) for i in range(60)],
+    })
+    optimized, _ = optimize_dtypes(df)
+    assert pd.api.types.is_datetime64_any_dtype(optimized['day'])
+    assert optimized['day'].iloc[0] == pd.Timestamp("2024-01-01")
+    assert optimized['city'].dtype == 'category'
+    assert optimized['free'].dtype == 'object'
+    assert optimized['ids'].dtype == 'object'
+
+    untouched, _ = optimize_dtypes(df, parse_dates=False)
+    assert not pd.api.types.is_datetime64_any_dtype(untouched['day'])
+
+
+def test_infer_datetime_format():
+    assert infer_datetime_format(pd.Series(["31/12/2024", "01/02/2024"])) == "%d/%m/%Y"
+    assert infer_datetime_format(pd.Series(["2024", "2025"])) is None
+    assert infer_datetime_format(pd.Series(["abc", "def"])) is None
+    assert infer_datetime_format(pd.Series([], dtype=object)) is None
@@ -0,0 +1,109 @@
+# tests/test_duplicates.py
+"""
+Testes de DuplicateDetector e HashIndex
+"""
+
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.duplicates import DuplicateDetector, HashIndex, row_hashes
+
+
+@pytest.fixture
+def detector():
+    return DuplicateDetector()
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'a': [1, 2, 3, 1, 2],
+        'b': ['x', 'y', 'z', 'x', 'w'],
+    })
+
+
+def test_matches_pandas(detector, df):
+    for subset in [None, 'a', ['a', 'b']]:
+        for keep in ['first', 'last', False]:
+            expected = df.duplicated(subset=subset, keep=keep).to_numpy()
+            assert (detector.duplicated(df, subset, keep) == expected).all()
+    pd.testing.assert_frame_equal(detector.drop(df), df.drop_duplicates())
+
+
+def test_in_place_mutation(detector, df):
+    assert detector.count(df) == 1
+    df.iloc[2, 0] = 5
+    df.iloc[2, 1] = 'w'
+    assert detector.count(df) == df.duplicated().sum() == 1
+    df.iloc[4, 0] = 9
+    assert detector.count(df) == df.duplicated().sum() == 1
+    pd.testing.assert_frame_equal(detector.drop(df), df.drop_duplicates())
+
+
+def test_negative_zero(detector):
+    df = pd.DataFrame({'v': [0.0, -0.0, 1.5], 'c': [1j * 0.0, -0.0 + 0j, 1j]})
+    assert detector.count(df, 'v') == df.duplicated('v').sum() == 1
+    assert detector.count(df) == df.duplicated().sum()
+    assert row_hashes(df, 'v')[0] == row_hashes(df, 'v')[1]
+
+
+def test_hash_collision_is_confirmed(detector, df, monkeypatch):
+    # Todas as linhas com o mesmo hash: só o pandas decide o que é duplicata
+    monkeypatch.setattr('src.data.duplicates.row_hashes',
+                        lambda frame, subset=None: np.zeros(len(frame), dtype='uint64'))
+    assert (detector.duplicated(df) == df.duplicated().to_numpy()).all()
+
+
+def test_cache_needs_version(detector, df):
+    detector.count(df)
+    detector.count(df)
+    assert detector.hits == 0
+
+    detector.count(df, version=1)
+    detector.count(df, version=1)
+    assert detector.hits == 1
+
+
+def test_unhashable_columns(detector):
+    df = pd.DataFrame({'a': [[1], [1], [2]]})
+    assert detector.hashes(df) is None
+    assert (detector.duplicated(df) == df.duplicated().to_numpy()).all()
+
+
+def test_hash_index_survives_spill(tmp_path):
+    hashes = np.arange(10_000, dtype='uint64') * 7919
+    with HashIndex(memory_mb=0.01, spill_dir=tmp_path) as index:
+        for chunk in np.array_split(hashes, 20):
+            index.update(chunk)
+        assert index.disk_runs
+        assert len(index) == len(hashes)
+        assert index.contains(hashes).all()
+        assert not index.contains(hashes + 1).any()
+
+
+def test_hash_index_new_rows_across_chunks(tmp_path):
+    df = pd.DataFrame({'a': [1, 2, 1, 3, 2, 4, 1, 5]})
+    with HashIndex(memory_mb=0.0001, spill_dir=tmp_path) as index:
+        kept = np.concatenate([index.new_rows(chunk) for chunk in (df[:3], df[3:6], df[6:])])
+    assert (kept == ~df.duplicated().to_numpy()).all()
+
+
+def test_hash_index_persist_and_compact(tmp_path):
+    hashes = np.arange(5_000, dtype='uint64')
+    index = HashIndex(memory_mb=0.001, spill_dir=tmp_path)
+    for chunk in np.array_split(hashes, 10):
+        index.update(chunk)
+    runs_before = len(index.disk_runs)
+
+    index.max_bytes = hashes.nbytes
+    index.persist(tmp_path / "index")
+    assert len(index.disk_runs) < runs_before
+    assert len(list((tmp_path / "index").glob("run_*.npy"))) == len(index.disk_runs)
+
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored.contains(hashes).all()
+    assert len(restored) == len(hashes)
+    index.close()
+    restored.close()
+    assert (tmp_path / "index").exists()
@@ -0,0 +1,78 @@
+# tests/test_file_extractor.py
+"""
+Testes do FileExtractor: streaming em chunks e extração paralela
+"""
+
+import time
+import pandas as pd
+import pytest
+from src.data.file_extractor import FileExtractor
+
+
+class SlowExtractor(FileExtractor):
+    """Extrator cujo arquivo 'slow' nunca termina (simula um arquivo preso)"""
+
+    def _read_csv(self, path, **kwargs):
+        if path.stem == 'slow':
+            time.sleep(600)
+        return super()._read_csv(path, **kwargs)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for i in range(4):
+        pd.DataFrame({'a': range(i * 10, i * 10 + 10), 'b': list('xy') * 5}).to_csv(
+            tmp_path / f"part_{i}.csv", index=False)
+    return tmp_path
+
+
+def test_chunks_match_full_read(data_dir):
+    extractor = FileExtractor(data_dir)
+    full = extractor.extract_csv("part_1.csv")
+    chunks = list(extractor.extract_csv("part_1.csv", chunksize=3))
+    assert [len(c) for c in chunks] == [3, 3, 3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+
+
+def test_chunks_from_memory_budget(data_dir):
+    extractor = FileExtractor(data_dir)
+    chunks = list(extractor.extract_csv("part_0.csv", memory_budget_mb=0.0005))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), extractor.extract_csv("part_0.csv"))
+
+
+def test_chunk_error_is_raised(data_dir):
+    # Byte inválido no meio do arquivo: o erro não pode parecer fim de arquivo
+    head = "a,b\n" + "".join(f"{i},x\n" for i in range(50_000))
+    tail = "".join(f"{i},y\n" for i in range(50_000))
+    (data_dir / "broken.csv").write_bytes(head.encode() + b"1,\xff\xfe\n" + tail.encode())
+
+    rows = 0
+    with pytest.raises(UnicodeDecodeError):
+        for chunk in FileExtractor(data_dir).iter_csv_chunks("broken.csv", chunksize=1000, encoding='utf-8'):
+            rows += len(chunk)
+    assert rows <= 50_000
+
+
+def test_parallel_matches_sequential(data_dir):
+    extractor = FileExtractor(data_dir)
+    sequential = extractor.extract_all_csv()
+    parallel = extractor.extract_all_csv(parallel=True, max_workers=2)
+    assert sequential.keys() == parallel.keys()
+    for name in sequential:
+        pd.testing.assert_frame_equal(sequential[name], parallel[name])
+
+
+def test_parallel_timeout_per_file(data_dir):
+    (data_dir / "slow.csv").write_text("a\n1\n")
+    extractor = SlowExtractor(data_dir)
+
+    start = time.monotonic()
+    dataframes = extractor.extract_all_csv(parallel=True, max_workers=2, timeout=2)
+    assert time.monotonic() - start < 30
+
+    assert dataframes['slow'].empty
+    assert all(len(dataframes[f"part_{i}"]) == 10 for i in range(4))
+    report = {r['file']: r for r in extractor.last_extraction_report}
+    errors = [r['error'] for r in report.values() if r['error']]
+    assert len(errors) == 1 and 'timeout' in errors[0]
@@ -0,0 +1,106 @@
+# tests/test_incremental_profile.py
+"""
+Testes da análise incremental: perfil atualizado igual ao perfil completo
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from config.settings import Settings
+from src.analysis.exploratory import ExploratoryAnalyzer
+from src.analysis.streaming_profile import StreamingProfile
+from src.data.sqlite_manager import SQLiteManager
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, 'PROFILE_DIR', tmp_path / "profiles")
+    monkeypatch.setattr(Settings, 'SQLITE_FETCH_CHUNK_SIZE', 400)
+    return tmp_path / "profiles"
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    rows = 2000
+    frame = pd.DataFrame({
+        'x': rng.normal(size=rows),
+        'n': rng.integers(0, 50, size=rows),
+        'cat': rng.choice(['a', 'b', 'c'], size=rows),
+    })
+    frame.loc[::9, 'x'] = np.nan
+    return pd.concat([frame, frame.iloc[:30]], ignore_index=True)
+
+
+def _full(df):
+    analyzer = ExploratoryAnalyzer()
+    report = analyzer.analyze_dataframe(df, "full", incremental=True)
+    return report, analyzer.profiles["full"]
+
+
+def _assert_same_profile(actual, expected):
+    pd.testing.assert_frame_equal(actual.numeric, expected.numeric, rtol=1e-9)
+    pd.testing.assert_frame_equal(actual.corr, expected.corr, rtol=1e-9)
+    pd.testing.assert_series_equal(actual.nulls, expected.nulls)
+    pd.testing.assert_series_equal(actual.n_unique, expected.n_unique)
+    assert (actual.rows, actual.duplicates) == (expected.rows, expected.duplicates)
+
+
+def test_appended_rows_match_full_profile(df, profile_dir, monkeypatch):
+    ExploratoryAnalyzer().analyze_dataframe(df.iloc[:1200], "data", incremental=True)
+    assert (profile_dir / "data.pkl").exists()
+
+    # Novo analisador: o perfil vem do disco e só as linhas novas são lidas
+    profiled = []
+    update = StreamingProfile.update
+    monkeypatch.setattr(StreamingProfile, 'update',
+                        lambda self, chunk: profiled.append(len(chunk)) or update(self, chunk))
+    analyzer = ExploratoryAnalyzer()
+    report = analyzer.analyze_dataframe(df, "data", incremental=True)
+    assert sum(profiled) == len(df) - 1200
+    monkeypatch.setattr(StreamingProfile, 'update', update)
+    profile = analyzer.profiles["data"]
+    expected_report, expected = _full(df)
+
+    _assert_same_profile(profile.column_stats(), expected.column_stats())
+    assert report['descriptive_stats'].keys() == expected_report['descriptive_stats'].keys()
+    assert profile.column_stats().duplicates == df.duplicated().sum()
+
+
+def test_changed_prefix_is_profiled_again(df):
+    analyzer = ExploratoryAnalyzer()
+    analyzer.analyze_dataframe(df.iloc[:1000], "data", incremental=True)
+
+    changed = df.copy()
+    changed.loc[999, 'x'] = 1e9  # última linha perfilada faz parte da amostra
+    analyzer.analyze_dataframe(changed, "data", incremental=True)
+    _assert_same_profile(analyzer.profiles["data"].column_stats(), _full(changed)[1].column_stats())
+
+    analyzer.forget_profile("data")
+    assert analyzer.load_profile("data") is None
+
+
+def test_sql_table_incremental(df, tmp_path):
+    db = SQLiteManager(tmp_path / "test.db")
+    try:
+        db.df_to_sql(df.iloc[:1500], "t")
+        ExploratoryAnalyzer().analyze_sql(db, "t", incremental=True)
+        db.df_to_sql(df.iloc[1500:], "t", if_exists='append')
+
+        analyzer = ExploratoryAnalyzer()
+        analyzer.analyze_sql(db, "t", incremental=True)
+        expected = ExploratoryAnalyzer()
+        expected.analyze_sql(db, "t", df_name="full")
+        _assert_same_profile(analyzer.profiles["t"].column_stats(), expected.profiles["full"].column_stats())
+
+        # Linhas removidas: o total não bate e a tabela é perfilada de novo
+        db.execute_query("DELETE FROM t WHERE rowid <= 100")
+        db.df_to_sql(df.iloc[:5], "t", if_exists='append')
+        analyzer = ExploratoryAnalyzer()
+        analyzer.analyze_sql(db, "t", incremental=True)
+        expected = ExploratoryAnalyzer()
+        expected.analyze_sql(db, "t", df_name="full")
+        _assert_same_profile(analyzer.profiles["t"].column_stats(), expected.profiles["full"].column_stats())
+        assert analyzer.profiles["t"].rows == len(df) - 100 + 5
+    finally:
+        db.close()
@@ -0,0 +1,90 @@
+# tests/test_index_advisor.py
+"""
+Testes do IndexAdvisor e da gestão de índices do SQLiteManager
+"""
+
+import pandas as pd
+import pytest
+from src.data.index_advisor import IndexAdvisor, parse_query_columns
+from src.data.sqlite_manager import SQLiteManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteManager(tmp_path / "test.db")
+    manager.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, city TEXT, v REAL, day TEXT)")
+    manager.df_to_sql(pd.DataFrame({
+        'id': range(200),
+        'city': [f"c{i % 5}" for i in range(200)],
+        'v': [float(i) for i in range(200)],
+        'day': [f"2024-01-{i % 28 + 1:02d}" for i in range(200)],
+    }), "t", if_exists='append')
+    yield manager
+    manager.close()
+
+
+def test_parse_query_columns():
+    tables, usages = parse_query_columns(
+        "SELECT city, SUM(v) FROM t JOIN \"other table\" o ON t.id = o.id "
+        "WHERE day = 'city' AND [v] > 1 GROUP BY city ORDER BY `v` DESC LIMIT 5"
+    )
+    assert tables == ['t', 'other table']
+    assert ('city', 'filter') not in usages  # só aparece dentro do literal
+    assert {('day', 'filter'), ('v', 'filter'), ('id', 'filter'),
+            ('city', 'group'), ('v', 'sort')} <= set(usages)
+
+    tables, _ = parse_query_columns("SELECT * FROM (SELECT * FROM t) WHERE v > 1")
+    assert tables == ['t']
+
+
+def test_advisor_counts_and_suggests():
+    advisor = IndexAdvisor(min_uses=2)
+    columns = {'t': ['city', 'v'], 'u': ['city']}.get
+    advisor.record_query("SELECT * FROM t WHERE city = 'a'", columns)
+    advisor.record_query("SELECT city FROM t GROUP BY city ORDER BY v", columns)
+    advisor.record_query("SELECT * FROM missing WHERE", columns)
+
+    usage = {e['column']: e for e in advisor.usage('t')}
+    assert (usage['city']['filter'], usage['city']['group'], usage['city']['total']) == (1, 1, 2)
+    assert usage['v']['sort'] == 1
+
+    assert [s['column'] for s in advisor.suggest({})] == ['city']
+    assert advisor.suggest({'t': {'city'}}) == []
+    advisor.forget_table('t')
+    assert advisor.usage() == []
+
+
+def test_manager_suggests_and_creates_indexes(manager):
+    for _ in range(3):
+        manager.sql_to_df("SELECT * FROM t WHERE city = ? AND id > 10", params=('c1',))
+        manager.sql_to_df("SELECT day, COUNT(*) FROM t GROUP BY day")
+
+    # O INTEGER PRIMARY KEY já é um índice
+    suggested = {s['column'] for s in manager.suggest_indexes('t', min_uses=3)}
+    assert suggested == {'city', 'day'}
+
+    created = manager.apply_index_suggestions('t', min_uses=3)
+    assert sorted(created) == ['idx_t_city', 'idx_t_day']
+    assert {tuple(i['columns']) for i in manager.list_indexes('t')} >= {('city',), ('day',)}
+    assert manager.suggest_indexes('t', min_uses=3) == []
+
+    plan = manager.sql_to_df("EXPLAIN QUERY PLAN SELECT * FROM t WHERE city = 'c1'")
+    assert plan['detail'].str.contains('idx_t_city').any()
+
+    assert manager.drop_index('idx_t_city')
+    assert ('city',) not in {tuple(i['columns']) for i in manager.list_indexes('t')}
+
+
+def test_cache_hits_are_not_recorded(manager):
+    query = "SELECT * FROM t WHERE v > 100"
+    for _ in range(3):
+        manager.sql_to_df(query, cache=True)
+    usage = {e['column']: e['total'] for e in manager.index_advisor.usage('t')}
+    assert usage['v'] == 1
+
+
+def test_create_index_errors(manager):
+    assert manager.create_index('t', ['missing']) is None
+    assert manager.create_index('t', 'city', unique=True) is None  # valores repetidos
+    assert manager.create_index('t', ['city', 'day'], name='idx_pair') == 'idx_pair'
+    assert ['city', 'day'] in [i['columns'] for i in manager.list_indexes('t')]
@@ -0,0 +1,72 @@
+# tests/test_ingest_cache.py
+"""
+Testes do cache colunar de ingestão (IngestCache)
+"""
+
+import os
+import pandas as pd
+import pytest
+from src.data.ingest_cache import IngestCache
+from src.data.file_extractor import FileExtractor
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({'a': range(100), 'b': ['x', 'y'] * 50}).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return IngestCache(cache_dir=tmp_path / "cache")
+
+
+def test_round_trip(cache, csv_file):
+    df = pd.read_csv(csv_file)
+    assert cache.get(csv_file, {'sep': ','}) is None
+    assert cache.put(csv_file, {'sep': ','}, df)
+    pd.testing.assert_frame_equal(cache.get(csv_file, {'sep': ','}), df)
+    # Outros parâmetros de leitura são outra entrada
+    assert cache.get(csv_file, {'sep': ';'}) is None
+
+
+def test_source_change_invalidates(cache, csv_file):
+    cache.put(csv_file, None, pd.read_csv(csv_file))
+    with open(csv_file, 'a') as f:
+        f.write("100,x\n")
+    assert cache.get(csv_file) is None
+
+
+def test_lru_eviction(tmp_path):
+    cache = IngestCache(cache_dir=tmp_path / "cache", max_size_mb=0.005)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"f{i}.csv"
+        pd.DataFrame({'a': range(i, i + 100)}).to_csv(path, index=False)
+        paths.append(path)
+
+    cache.put(paths[0], None, pd.read_csv(paths[0]))
+    cache.put(paths[1], None, pd.read_csv(paths[1]))
+    # f0 passa a ser o mais recente; f1 sai primeiro
+    entry = cache._cache_file(paths[0], None)
+    os.utime(entry, (entry.stat().st_atime, entry.stat().st_mtime + 10))
+    cache.put(paths[2], None, pd.read_csv(paths[2]))
+
+    assert cache.size_mb() <= 0.005
+    assert cache.get(paths[2]) is not None
+    assert cache.get(paths[1]) is None
+
+
+def test_extractor_reads_from_cache(tmp_path, csv_file, monkeypatch):
+    monkeypatch.setattr('config.settings.Settings.INGEST_CACHE_DIR', tmp_path / "cache")
+    extractor = FileExtractor(tmp_path, use_cache=True)
+    first = extractor.extract_csv(csv_file)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("arquivo relido em vez do cache")
+
+    monkeypatch.setattr('src.data.file_extractor.read_csv_auto', fail)
+    pd.testing.assert_frame_equal(extractor.extract_csv(csv_file), first)
@@ -0,0 +1,70 @@
+# tests/test_query_cache.py
+"""
+Testes do cache de resultados de queries (QueryCache e sql_to_df(cache=True))
+"""
+
+import sqlite3
+import pandas as pd
+import pytest
+from src.data.query_cache import QueryCache, normalize_sql
+from src.data.sqlite_manager import SQLiteManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteManager(tmp_path / "test.db")
+    manager.df_to_sql(pd.DataFrame({'v': range(10)}), "t")
+    yield manager
+    manager.close()
+
+
+def test_normalize_sql_keeps_literals():
+    assert normalize_sql("  SELECT *\n  FROM t ;") == "SELECT * FROM t"
+    assert normalize_sql("SELECT 'a  b' FROM t") == "SELECT 'a  b' FROM t"
+    assert QueryCache.make_key("SELECT ?", [1]) == QueryCache.make_key("SELECT  ?;", (1,))
+
+
+def test_version_mismatch_discards_entry():
+    cache = QueryCache()
+    key = QueryCache.make_key("SELECT 1")
+    cache.put(key, 1, pd.DataFrame({'a': [1]}))
+    assert cache.get(key, 1) is not None
+    assert cache.get(key, 2) is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_memory_limit_evicts_oldest():
+    df = pd.DataFrame({'a': range(10_000)})
+    size_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+    cache = QueryCache(max_size_mb=size_mb * 2.5)
+    keys = [QueryCache.make_key(f"SELECT {i}") for i in range(3)]
+    for key in keys:
+        cache.put(key, 0, df)
+    assert cache.get(keys[0], 0) is None
+    assert cache.get(keys[2], 0) is not None
+    assert cache.stats()['size_mb'] <= size_mb * 2.5
+
+
+def test_cached_query_until_write(manager):
+    query = "SELECT SUM(v) AS s FROM t"
+    assert manager.sql_to_df(query, cache=True).iloc[0]['s'] == 45
+    result = manager.sql_to_df(query, cache=True)
+    assert manager.query_cache.stats()['hits'] == 1
+
+    # A cópia entregue pode ser alterada sem afetar o cache
+    result.loc[0, 's'] = -1
+    assert manager.sql_to_df(query, cache=True).iloc[0]['s'] == 45
+
+    manager.execute_query("INSERT INTO t (v) VALUES (100)")
+    assert manager.sql_to_df(query, cache=True).iloc[0]['s'] == 145
+
+
+def test_external_write_invalidates(manager, tmp_path):
+    query = "SELECT COUNT(*) AS n FROM t"
+    assert manager.sql_to_df(query, cache=True).iloc[0]['n'] == 10
+
+    other = sqlite3.connect(tmp_path / "test.db")
+    other.execute("INSERT INTO t (v) VALUES (1)")
+    other.commit()
+    other.close()
+    assert manager.sql_to_df(query, cache=True).iloc[0]['n'] == 11
@@ -0,0 +1,72 @@
+# tests/test_query_executor.py
+"""
+Testes do QueryExecutor e do cancelamento de leituras do pool
+"""
+
+import time
+import pandas as pd
+import pytest
+from src.data.connection_pool import CancelToken, cancel_scope
+from src.data.query_executor import QueryExecutor
+from src.data.sqlite_manager import SQLiteManager
+
+ENDLESS = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT COUNT(*) FROM c"
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteManager(tmp_path / "test.db")
+    manager.df_to_sql(pd.DataFrame({'v': range(1, 5001)}), "t")
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def executor():
+    executor = QueryExecutor(max_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+def test_batch_results(manager, executor):
+    results = (executor.batch()
+               .submit('count', manager.sql_to_df, "SELECT COUNT(*) AS n FROM t")
+               .submit('stats', manager.get_table_stats, 't')
+               .results())
+    assert results['count'].iloc[0]['n'] == 5000
+    assert results['stats']['row_count'] == 5000
+
+
+def test_batch_timeout_interrupts_query(manager, executor):
+    start = time.monotonic()
+    results = executor.batch(timeout=0.5).submit('endless', manager.sql_to_df, ENDLESS).results()
+    assert results['endless'] is None
+    assert time.monotonic() - start < 5
+
+    # O leitor interrompido volta ao pool em condições de uso
+    assert manager.sql_to_df("SELECT COUNT(*) AS n FROM t").iloc[0]['n'] == 5000
+
+
+def test_cancel_scope_interrupts_reader(manager):
+    token = CancelToken()
+    token.cancel()
+    with cancel_scope(token):
+        assert manager.sql_to_df("SELECT SUM(v) AS s FROM t").empty
+    assert manager.sql_to_df("SELECT SUM(v) AS s FROM t").iloc[0]['s'] == 5000 * 5001 // 2
+
+
+def test_cancel_scope_interrupts_stats_refresh(manager):
+    token = CancelToken()
+    token.cancel()
+    with cancel_scope(token):
+        assert manager.refresh_table_stats('t') is None
+        # Escritas não são canceláveis e o handler não fica no escritor
+        assert manager.execute_query("INSERT INTO t (v) VALUES (1)") == 1
+    assert manager.refresh_table_stats('t')['row_count'] == 5001
+
+
+def test_expired_token():
+    token = CancelToken(timeout=0.01)
+    assert not token.cancelled()
+    time.sleep(0.02)
+    assert token.cancelled()
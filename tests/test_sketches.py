@@ -0,0 +1,102 @@
+# tests/test_sketches.py
+"""
+Testes dos resumos mergeáveis: merge de chunks equivale a uma passada única
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.column_stats import finalize_moments
+from src.utils.sketches import CoMoments, HeavyHitters, HyperLogLog, KLLSketch, Moments
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).normal(1e6, 5.0, size=20_000)
+
+
+def _chunks(array, parts=7):
+    return np.array_split(array, parts)
+
+
+def _merged(factory, chunks):
+    summaries = [factory().update(chunk) for chunk in chunks]
+    result = summaries[0]
+    for summary in summaries[1:]:
+        result.merge(summary)
+    return result
+
+
+def test_kll_exact_below_limit(values):
+    single = KLLSketch().update(values)
+    merged = _merged(KLLSketch, _chunks(values))
+    for q in (0, .1, .5, .99, 1):
+        assert single.quantile(q) == merged.quantile(q) == np.quantile(values, q)
+
+
+def test_kll_rank_error_after_compaction(values):
+    merged = _merged(lambda: KLLSketch(k=200, exact_size=1000), _chunks(values, 20))
+    assert merged.n == len(values)
+    ordered = np.sort(values)
+    for q in (.1, .25, .5, .75, .9):
+        rank = np.searchsorted(ordered, merged.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.03
+    assert sum(len(c) for c in merged.compactors) < 2000
+
+
+def test_heavy_hitters_merge():
+    data = pd.Series(np.random.default_rng(1).zipf(1.5, size=5000) % 50)
+    merged = _merged(lambda: HeavyHitters(100), np.array_split(data.to_numpy(), 5))
+    assert merged.exact
+    assert merged.counts.sort_index().to_dict() == data.value_counts().sort_index().to_dict()
+    assert merged.mode() == data.mode()[0]
+
+    # Acima da capacidade as contagens são subestimadas em no máximo n / (capacity + 1)
+    small = _merged(lambda: HeavyHitters(10), np.array_split(data.to_numpy(), 5))
+    assert not small.exact
+    expected = data.value_counts()
+    for value, count in small.top(3).items():
+        assert expected[value] - len(data) / 11 <= count <= expected[value]
+
+
+def test_moments_merge_matches_pandas(values):
+    block = np.column_stack([values, np.where(np.arange(len(values)) % 4, values * 0.5, np.nan)])
+    single = Moments(2).update(block)
+    merged = _merged(lambda: Moments(2), _chunks(block))
+    for field in ('n', 'mean', 'm2', 'min', 'max'):
+        np.testing.assert_allclose(getattr(merged, field), getattr(single, field), rtol=1e-9)
+    # m3 fica perto de zero (distribuição simétrica): compara na escala de m2
+    for field, power in (('m3', 1.5), ('m4', 2)):
+        np.testing.assert_allclose(getattr(merged, field) / single.m2 ** power,
+                                   getattr(single, field) / single.m2 ** power, atol=1e-9)
+
+    frame = pd.DataFrame(block)
+    var, skew, kurt = finalize_moments(merged.n, merged.mean, merged.m2, merged.m3, merged.m4)
+    np.testing.assert_allclose(merged.mean, frame.mean(), rtol=1e-12)
+    np.testing.assert_allclose(var, frame.var(), rtol=1e-7)
+    np.testing.assert_allclose(skew, frame.skew(), rtol=1e-5)
+    np.testing.assert_allclose(kurt, frame.kurtosis(), rtol=1e-5)
+
+
+def test_hyperloglog_merge():
+    data = np.arange(50_000) % 30_000
+    exact = _merged(HyperLogLog, np.array_split(data, 5))
+    assert exact.count() == 30_000
+
+    parts = np.array_split(np.arange(300_000), 6)
+    approx = _merged(lambda: HyperLogLog(exact_size=10_000), parts)
+    single = HyperLogLog(exact_size=10_000).update(np.concatenate(parts))
+    assert approx.registers is not None
+    np.testing.assert_array_equal(approx.registers, single.registers)
+    assert abs(approx.count() - 300_000) / 300_000 < 0.03
+
+
+def test_comoments_merge_matches_corr(values):
+    rng = np.random.default_rng(2)
+    block = np.column_stack([values, values * 2 + rng.normal(size=len(values)), rng.normal(size=len(values))])
+    block[::5, 1] = np.nan
+    block[::7, 2] = np.nan
+    merged = _merged(lambda: CoMoments(3), _chunks(block))
+    expected = pd.DataFrame(block).corr().to_numpy()
+    np.testing.assert_allclose(merged.corr(), expected, atol=1e-9)
+    np.testing.assert_allclose(merged.select([0, 2]).corr(), expected[np.ix_([0, 2], [0, 2])], atol=1e-9)
@@ -0,0 +1,222 @@
+# tests/test_sqlite_manager.py
+"""
+Testes do SQLiteManager: catálogo mantido após escritas
+"""
+
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.sqlite_manager import SQLiteManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteManager(tmp_path / "test.db")
+    yield manager
+    manager.close()
+
+
+def _catalog_matches(manager, table):
+    stats = manager.get_table_stats(table)
+    actual = manager.sql_to_df(
+        f"SELECT COUNT(*) AS n, MIN(v) AS lo, MAX(v) AS hi, SUM(v) AS total FROM {table}"
+    ).iloc[0]
+    v = stats['column_stats']['v']
+    assert stats['row_count'] == actual['n']
+    assert (v['min'], v['max'], v['sum']) == (actual['lo'], actual['hi'], actual['total'])
+
+
+@pytest.mark.parametrize("statement", [
+    "INSERT OR REPLACE INTO {t} (id, v) VALUES (2, 99)",
+    "REPLACE INTO {t} (id, v) VALUES (2, 99)",
+    "INSERT INTO {t} (id, v) VALUES (2, 99) ON CONFLICT(id) DO UPDATE SET v = excluded.v",
+    "INSERT OR IGNORE INTO {t} (id, v) VALUES (2, 99)",
+])
+@pytest.mark.parametrize("key", ["INTEGER PRIMARY KEY", "INTEGER UNIQUE"])
+def test_catalog_after_upsert(manager, statement, key):
+    manager.execute_query(f"CREATE TABLE t (id {key}, v INTEGER)")
+    manager.execute_query("INSERT INTO t (id, v) VALUES (1, 10), (2, 20), (3, 30)")
+    _catalog_matches(manager, "t")
+
+    manager.execute_query(statement.format(t="t"))
+    _catalog_matches(manager, "t")
+
+
+def test_catalog_after_append(manager):
+    manager.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v INTEGER)")
+    manager.execute_query("INSERT INTO t (v) VALUES (10), (20)")
+    manager.execute_query("INSERT INTO t (v) VALUES (5)")
+    _catalog_matches(manager, "t")
+
+
+def _rollup_matches(manager, table):
+    rollup = manager.get_rollup(table, 'day', 'v', 'sum').set_index('period')['v']
+    actual = manager.sql_to_df(
+        f"SELECT date(d) AS period, TOTAL(v) AS v FROM {table} GROUP BY period ORDER BY period"
+    ).set_index('period')['v']
+    assert rollup.to_dict() == actual.to_dict()
+
+
+@pytest.mark.parametrize("statement", [
+    "INSERT OR REPLACE INTO {t} (id, d, v) VALUES (2, '2024-01-01', 99)",
+    "REPLACE INTO {t} (id, d, v) VALUES (2, '2024-01-01', 99)",
+    "INSERT INTO {t} (id, d, v) VALUES (2, '2024-01-01', 99) "
+    "ON CONFLICT(id) DO UPDATE SET v = excluded.v",
+])
+@pytest.mark.parametrize("key", ["INTEGER PRIMARY KEY", "INTEGER UNIQUE"])
+def test_rollups_after_upsert(manager, statement, key):
+    manager.execute_query(f"CREATE TABLE t (id {key}, d TEXT, v INTEGER)")
+    manager.execute_query("INSERT INTO t (id, d, v) VALUES "
+                          "(1, '2024-01-01', 3), (2, '2024-01-01', 4), (3, '2024-01-02', 5)")
+    assert manager.create_rollups("t", "d")
+
+    manager.execute_query(statement.format(t="t"))
+    _rollup_matches(manager, "t")
+
+    manager.execute_query("INSERT INTO t (id, d, v) VALUES (4, '2024-01-02', 1)")
+    _rollup_matches(manager, "t")
+
+
+def test_catalog_after_lower_explicit_ids(manager):
+    manager.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, v INTEGER)")
+    manager.execute_query("INSERT INTO t (id, v) VALUES (5, 10), (6, 20)")
+    manager.execute_query("INSERT INTO t (id, v) VALUES (1, 30)")
+    _catalog_matches(manager, "t")
+
+    manager.df_to_sql(pd.DataFrame({'id': [2, 9], 'v': [40, 50]}), "t", if_exists='append')
+    _catalog_matches(manager, "t")
+
+
+def test_rollups_after_lower_explicit_ids(manager):
+    manager.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, d TEXT, v INTEGER)")
+    manager.execute_query("INSERT INTO t (id, d, v) VALUES (5, '2024-01-01', 3), (6, '2024-01-02', 4)")
+    assert manager.create_rollups("t", "d")
+
+    manager.execute_query("INSERT INTO t (id, d, v) VALUES (1, '2023-12-31', 7)")
+    _rollup_matches(manager, "t")
+
+    manager.df_to_sql(pd.DataFrame({'id': [2], 'd': ['2024-01-01'], 'v': [1]}), "t", if_exists='append')
+    _rollup_matches(manager, "t")
+
+
+def test_rollups_after_external_insert(manager, tmp_path):
+    manager.execute_query("CREATE TABLE t (id INTEGER PRIMARY KEY, d TEXT, v INTEGER)")
+    manager.execute_query("INSERT INTO t (id, d, v) VALUES (5, '2024-01-01', 3), (6, '2024-01-02', 4)")
+    assert manager.create_rollups("t", "d")
+    _rollup_matches(manager, "t")
+
+    # Outra conexão, sem passar pelo gerenciador: id abaixo do último rowid agregado
+    other = sqlite3.connect(tmp_path / "test.db")
+    other.execute("INSERT INTO t (id, d, v) VALUES (1, '2024-01-02', 10)")
+    other.commit()
+    other.close()
+    _rollup_matches(manager, "t")
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'id': range(1000),
+        'v': [float(i) if i % 7 else None for i in range(1000)],
+        'name': [f"n{i % 13}" for i in range(1000)],
+        'day': pd.date_range("2024-01-01", periods=1000, freq="h"),
+    })
+
+
+def test_bulk_load_matches_to_sql(manager, frame):
+    assert manager.df_to_sql(frame, "plain")
+    assert manager.df_to_sql(frame, "bulk", bulk=True, batch_size=64)
+    plain = manager.sql_to_df("SELECT * FROM plain ORDER BY id")
+    bulk = manager.sql_to_df("SELECT * FROM bulk ORDER BY id")
+    pd.testing.assert_frame_equal(bulk, plain)
+    assert bulk['v'].isna().sum() == (frame['v'].isna()).sum()
+
+
+def test_bulk_load_chunks_and_indexes(manager, frame):
+    chunks = (frame.iloc[i:i + 300] for i in range(0, len(frame), 300))
+    assert manager.df_to_sql(chunks, "t", bulk=True, index_columns=['name'])
+    assert manager.get_row_count("t") == len(frame)
+    indexes = {tuple(index['columns']) for index in manager.list_indexes("t")}
+    assert ('name',) in indexes
+
+    # Substituir a tabela mantém os índices criados antes
+    assert manager.df_to_sql(frame.head(10), "t", bulk=True)
+    assert manager.get_row_count("t") == 10
+    assert ('name',) in {tuple(index['columns']) for index in manager.list_indexes("t")}
+
+    assert not manager.df_to_sql(frame, "t", if_exists='fail', bulk=True)
+    assert manager.get_row_count("t") == 10
+
+
+@pytest.mark.parametrize("engine", ["sqlite3", "arrow"])
+def test_sql_chunks_match_full_query(manager, frame, engine):
+    manager.df_to_sql(frame, "t")
+    query = "SELECT id, v, name FROM t WHERE id >= ? ORDER BY id"
+    chunks = list(manager.iter_sql_chunks(query, params=(100,), chunksize=250, engine=engine))
+    assert sum(len(chunk) for chunk in chunks) == 900
+    assert all(len(chunk) <= 250 for chunk in chunks)
+    full = manager.sql_to_df(query, params=(100,))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full, check_dtype=False)
+
+
+def test_sql_chunks_raise_errors(manager):
+    with pytest.raises(Exception):
+        list(manager.iter_sql_chunks("SELECT * FROM missing_table"))
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("order_by", [None, "v", "name"])
+def test_fetch_page_covers_table_once(manager, frame, order_by, descending):
+    # 'v' tem NULLs e 'name' tem valores repetidos
+    manager.df_to_sql(frame, "t")
+    ids, cursor = [], None
+    while True:
+        page, cursor = manager.fetch_page("t", columns=['id'], order_by=order_by,
+                                          descending=descending, after=cursor, page_size=64)
+        ids.extend(page['id'])
+        if cursor is None:
+            break
+
+    direction = "DESC" if descending else "ASC"
+    key = f"{order_by} {direction}, " if order_by else ""
+    expected = manager.sql_to_df(f"SELECT id FROM t ORDER BY {key}rowid {direction}")['id']
+    assert ids == expected.tolist()
+
+
+def test_aggregate_matches_pandas(manager, frame):
+    manager.df_to_sql(frame, "t")
+    result = manager.aggregate("t", group_by="name", metrics={'v': ['sum', 'mean', 'count'], 'id': 'max'},
+                               order_by="name").set_index("name")
+    expected = frame.groupby("name").agg(v_sum=('v', 'sum'), v_mean=('v', 'mean'),
+                                         v_count=('v', 'count'), id=('id', 'max'))
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    filtered = manager.aggregate("t", where="id < ?", params=(100,))
+    assert filtered['count'].iloc[0] == 100
+    assert manager.aggregate("t", metrics={'v': 'median'}).empty
+
+
+def test_value_counts_matches_pandas(manager, frame):
+    frame.loc[::5, 'name'] = None
+    manager.df_to_sql(frame, "t")
+    result = manager.value_counts("t", "name").set_index("name")['count']
+    expected = frame['name'].value_counts()
+    assert result.to_dict() == expected.to_dict()
+    assert result.is_monotonic_decreasing
+    assert len(manager.value_counts("t", "name", limit=3)) == 3
+    assert manager.value_counts("t", "name", dropna=False)['count'].sum() == len(frame)
+
+
+def test_histogram_matches_numpy(manager):
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=2000)
+    manager.df_to_sql(pd.DataFrame({'x': values, 'id': range(2000)}), "t")
+
+    result = manager.histogram("t", "x", bins=20)
+    counts, edges = np.histogram(values, bins=20)
+    assert result['count'].tolist() == counts.tolist()
+    np.testing.assert_allclose(result['bin_start'], edges[:-1])
+
+    filtered = manager.histogram("t", "x", bins=10, where="id < ?", params=(500,))
+    assert filtered['count'].tolist() == np.histogram(values[:500], bins=10)[0].tolist()
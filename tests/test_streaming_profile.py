@@ -0,0 +1,117 @@
+# tests/test_streaming_profile.py
+"""
+Testes do StreamingProfile: perfil em chunks contra o cálculo em memória
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.column_stats import compute_column_stats
+from src.analysis.exploratory import ExploratoryAnalyzer
+from src.analysis.streaming_profile import StreamingProfile
+from src.data.sqlite_manager import SQLiteManager
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    rows = 3000
+    frame = pd.DataFrame({
+        'x': rng.normal(50, 10, size=rows),
+        'y': rng.integers(0, 100, size=rows),
+        'city': rng.choice(['a', 'b', 'c', None], size=rows, p=[.5, .3, .15, .05]),
+    })
+    frame['z'] = frame['x'] * 3 + rng.normal(size=rows)
+    frame.loc[::11, 'x'] = np.nan
+    # Linhas repetidas para a contagem de duplicatas
+    return pd.concat([frame, frame.iloc[:40]], ignore_index=True)
+
+
+def _profile(chunks):
+    profile = StreamingProfile()
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
+
+
+def _chunks(df, size=700):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def _assert_stats_equal(actual, expected):
+    pd.testing.assert_frame_equal(actual.numeric, expected.numeric, rtol=1e-9)
+    pd.testing.assert_frame_equal(actual.corr, expected.corr, rtol=1e-9)
+    pd.testing.assert_series_equal(actual.nulls, expected.nulls)
+    pd.testing.assert_series_equal(actual.n_unique, expected.n_unique)
+    assert actual.rows == expected.rows
+
+
+def test_profile_matches_in_memory_stats(df):
+    profile = _profile(_chunks(df))
+    stats = profile.column_stats()
+    _assert_stats_equal(stats, compute_column_stats(df))
+    assert stats.duplicates == df.duplicated().sum()
+    assert stats.dtypes['y'] == df['y'].dtype
+    assert profile.top_values('city').index[0] == 'a'
+    profile.close()
+
+
+def test_merged_profiles_match_sequential(df):
+    chunks = _chunks(df)
+    sequential = _profile(chunks)
+    parts = [_profile(chunks[:2]), _profile(chunks[2:4]), _profile(chunks[4:])]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    expected = sequential.column_stats()
+    actual = merged.column_stats()
+    _assert_stats_equal(actual, expected)
+    assert actual.duplicates == expected.duplicates
+    assert actual.samples == expected.samples
+    sequential.close()
+    merged.close()
+
+
+def test_chunk_dtypes_are_consolidated():
+    chunks = [pd.DataFrame({'v': [1, 2], 'w': [None, None]}),
+              pd.DataFrame({'v': [3.5, None], 'w': ['a', 'b']})]
+    stats = _profile(chunks).column_stats()
+    assert stats.dtypes['v'] == np.dtype('float64')
+    assert stats.numeric.loc['mean', 'v'] == pytest.approx(6.5 / 3)
+    assert stats.nulls.to_dict() == {'v': 1, 'w': 2}
+    assert stats.dtypes['w'] == np.dtype('object')
+
+
+def _assert_reports_match(actual, expected):
+    for section in ('descriptive_stats', 'missing_values', 'unique_values'):
+        assert actual[section].keys() == expected[section].keys()
+    for col, values in expected['descriptive_stats'].items():
+        assert actual['descriptive_stats'][col] == pytest.approx(values, rel=1e-9, nan_ok=True)
+    assert actual['missing_values'] == expected['missing_values']
+    assert {col: info['n_unique'] for col, info in actual['unique_values'].items()} == \
+        {col: info['n_unique'] for col, info in expected['unique_values'].items()}
+    assert actual['basic_info']['shape'] == expected['basic_info']['shape']
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_analyze_chunks_matches_analyze_dataframe(df, workers):
+    analyzer = ExploratoryAnalyzer()
+    expected = analyzer.analyze_dataframe(df, "full")
+    actual = analyzer.analyze_chunks(_chunks(df), "chunks", workers=workers)
+    _assert_reports_match(actual, expected)
+    analyzer.profiles["chunks"].close()
+
+
+def test_analyze_sql_table(df, tmp_path):
+    db = SQLiteManager(tmp_path / "test.db")
+    try:
+        db.df_to_sql(df, "t")
+        analyzer = ExploratoryAnalyzer()
+        expected = analyzer.analyze_dataframe(db.sql_to_df("SELECT * FROM t"), "full")
+        actual = analyzer.analyze_sql(db, "t", chunksize=500)
+        _assert_reports_match(actual, expected)
+        assert analyzer.profiles["t"].max_rowid == len(df)
+        analyzer.profiles["t"].close()
+    finally:
+        db.close()
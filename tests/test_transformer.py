@@ -0,0 +1,156 @@
+# tests/test_transformer.py
+"""
+Testes do DataTransformer: transform_stream e TransformationPipeline
+"""
+
+import io
+import pandas as pd
+import pytest
+from src.data.transformer import DataTransformer
+
+
+@pytest.fixture
+def transformer():
+    return DataTransformer()
+
+
+def test_stream_dtypes_fixed_by_first_chunk(transformer):
+    csv = ("d,n,t\n"
+           "2024-01-01,1,a\n2024-01-02,2,b\n"
+           "2024-01-03,x,10\n2024-01-04,4,20\n"
+           "bad,5,30\n2024-01-06,6,40\n")
+    source = lambda: pd.read_csv(io.StringIO(csv), chunksize=2)
+
+    chunks = list(transformer.transform_stream(source, ['convert_dtypes']))
+    assert len(chunks) == 3
+    for chunk in chunks:
+        assert pd.api.types.is_datetime64_any_dtype(chunk['d'])
+        assert pd.api.types.is_numeric_dtype(chunk['n'])
+        assert chunk['t'].dtype == 'object'
+
+    result = pd.concat(chunks)
+    assert result['n'].isna().sum() == 1 and result['d'].isna().sum() == 1
+    assert transformer.get_transformation_log()[-1]['details']['values_coerced'] == 2
+
+
+@pytest.fixture
+def messy():
+    return pd.DataFrame({
+        'Order Date': ['2024-01-01', '2024-01-02', None, '2024-01-04', '2024-01-01', '2024-01-06'] * 50,
+        'Amount ($)': ['1.5', '2', None, '4', '1.5', '6'] * 50,
+        'Region': ['n', None, 's', 's', 'n', 'e'] * 50,
+        'Units': [1, 2, None, 4, 1, 6] * 50,
+    })
+
+
+STEPS = [('clean_column_names', {}), ('convert_dtypes', {}), ('handle_missing_values', {'strategy': 'auto'}),
+         ('create_features', {'date_column': 'order_date'}), ('remove_duplicates', {})]
+
+
+def test_pipeline_matches_eager_steps(transformer, messy):
+    original = messy.copy()
+    expected = messy
+    for name, kwargs in STEPS:
+        expected = getattr(transformer, name)(expected, **kwargs)
+
+    pipeline = DataTransformer().pipeline()
+    for name, kwargs in STEPS:
+        getattr(pipeline, name)(**kwargs)
+    result = pipeline.run(messy)
+
+    pd.testing.assert_frame_equal(result, expected)
+    pd.testing.assert_frame_equal(messy, original)
+    assert [kind for kind, _ in pipeline.plan()] == ['labels', 'columns', 'rows']
+    assert [entry['operation'] for entry in pipeline.transformer.get_transformation_log()] == \
+        [name for name, _ in STEPS]
+
+
+def test_pipeline_drop_is_a_row_step(transformer, messy):
+    pipeline = transformer.pipeline().convert_dtypes().handle_missing_values('drop')
+    assert [kind for kind, _ in pipeline.plan()] == ['columns', 'rows']
+    expected = transformer.handle_missing_values(transformer.convert_dtypes(messy), 'drop')
+    pd.testing.assert_frame_equal(pipeline.run(messy), expected)
+
+
+@pytest.mark.parametrize("trace", [False, True])
+def test_pipeline_memory_report(transformer, messy, trace):
+    pipeline = transformer.pipeline().clean_column_names().convert_dtypes().remove_duplicates()
+    result = pipeline.run(messy, trace_memory=trace)
+    report = pipeline.last_report
+    assert report['steps'] == ['clean_column_names', 'convert_dtypes', 'remove_duplicates']
+    assert (report['rows_in'], report['rows_out']) == (len(messy), len(result))
+    assert report['peak_mb'] >= 0
+    if trace:
+        assert report['memory_source'] == 'tracemalloc'
+        assert report['peak_mb'] > 0
+    assert report['memory_source'] in ('rss', 'tracemalloc')
+
+
+def test_convert_dtypes_checks_rows_outside_sample(transformer):
+    n = 5000
+    df = pd.DataFrame({
+        'date': pd.date_range("2020-01-01", periods=n, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+        'late_text_date': ['2024-01-01'] * (n - 1) + ['n/a'],
+        'number': [str(i) for i in range(n)],
+        'late_text_number': [str(i) for i in range(n - 1)] + ['abc'],
+        'mixed_dates': ['2024-01-02', '03/01/2024 10:00'] * (n // 2),
+        'text': [f"item {i}" for i in range(n)],
+    })
+    result = transformer.convert_dtypes(df)
+
+    assert pd.api.types.is_datetime64_any_dtype(result['date'])
+    assert result['date'].iloc[-1] == pd.Timestamp(df['date'].iloc[-1])
+    assert pd.api.types.is_integer_dtype(result['number'])
+    assert pd.api.types.is_datetime64_any_dtype(result['mixed_dates'])
+    for col in ('late_text_date', 'late_text_number', 'text'):
+        assert result[col].dtype == 'object'
+        assert result[col].equals(df[col])
+
+    methods = {col: info['method'] for col, info in
+               transformer.get_transformation_log()[-1]['details']['columns'].items()}
+    assert methods['date'] == 'datetime_format'
+    assert methods['mixed_dates'] == 'datetime'
+    assert methods['text'] is None
+
+    pd.testing.assert_frame_equal(transformer.convert_dtypes(df, parallel=False), result)
+
+
+@pytest.fixture
+def stream_frame():
+    # 7 valores numéricos não nulos (mediana exata) e moda única no texto
+    return pd.DataFrame({
+        'v': [1.0, None, 9.0, 4.0, 2.0, None, 8.0, 7.0, 3.0, None],
+        'c': ['a', 'b', None, 'b', 'c', 'b', None, 'a', 'd', 'e'],
+        'k': [1, 2, 3, 1, 4, 2, 5, 1, 6, 7],
+    })
+
+
+@pytest.mark.parametrize("strategy", ['auto', 'fill_mean', 'fill_mode'])
+def test_stream_fill_values_are_global(transformer, stream_frame, strategy):
+    chunks = [stream_frame.iloc[i:i + 3] for i in range(0, len(stream_frame), 3)]
+    steps = [('handle_missing_values', {'strategy': strategy})]
+    result = pd.concat(transformer.transform_stream(chunks, steps))
+    expected = transformer.handle_missing_values(stream_frame, strategy)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_stream_dedup_across_chunks(transformer, stream_frame):
+    source = lambda: (stream_frame.iloc[i:i + 2] for i in range(0, len(stream_frame), 2))
+    result = pd.concat(transformer.transform_stream(source, [('remove_duplicates', {'subset': ['k']})]))
+    pd.testing.assert_frame_equal(result, stream_frame.drop_duplicates(subset=['k']))
+
+    details = transformer.get_transformation_log()[-1]['details']
+    assert details['duplicates_removed'] == 3
+    assert (details['rows_in'], details['rows_out']) == (10, 7)
+
+
+def test_stream_validates_arguments(transformer, stream_frame):
+    with pytest.raises(ValueError):
+        transformer.transform_stream([stream_frame], ['missing_step'])
+    with pytest.raises(ValueError):
+        transformer.transform_stream([stream_frame], [('handle_missing_values', {'strategy': 'zero'})])
+    with pytest.raises(ValueError):
+        transformer.transform_stream(iter([stream_frame]), ['handle_missing_values'])
+    # Sem estatísticas globais um iterador simples basta
+    result = list(transformer.transform_stream(iter([stream_frame]), ['remove_duplicates']))
+    assert len(result) == 1